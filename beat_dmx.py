@@ -7,6 +7,7 @@ import aubio
 from ola.ClientWrapper import ClientWrapper
 
 import parameters
+from src.audio.tempo import TempoTracker
 
 
 class BeatTrigger:
@@ -25,7 +26,7 @@ class BeatTrigger:
         self.wrapper = ClientWrapper()
         self.client = self.wrapper.Client()
         self.tempo = aubio.tempo("default", 1024, 512, samplerate)
-        self.beat_times: list[float] = []
+        self.beats = TempoTracker(window=60.0)
         self.print_interval = print_interval
         self.last_print = 0.0
         self.on_beat = None
@@ -43,12 +44,7 @@ class BeatTrigger:
 
     def _compute_bpm(self) -> float:
         """Return the average BPM from recorded beat times."""
-        if len(self.beat_times) < 2:
-            return 0.0
-        intervals = np.diff(self.beat_times)
-        if len(intervals) == 0:
-            return 0.0
-        return 60.0 / np.mean(intervals)
+        return self.beats.mean_bpm
 
     def get_bpm(self) -> float:
         """Return the most recent BPM estimate."""
@@ -61,7 +57,7 @@ class BeatTrigger:
         now = time.time()
         if self.tempo(samples):
             self._blink()
-            self.beat_times.append(now)
+            self.beats.add_beat(now)
             bpm = self._compute_bpm()
             if bpm and now - self.last_print >= self.print_interval:
                 print(f"Estimated BPM: {bpm:.2f}", flush=True)
@@ -71,7 +67,7 @@ class BeatTrigger:
                     self.on_beat(bpm)
                 except Exception as exc:  # pragma: no cover - user callback
                     print(f"Callback error: {exc}", flush=True)
-        self.beat_times = [t for t in self.beat_times if now - t <= 60]
+        self.beats.expire(now)
 
     def run(self):
         with sd.InputStream(channels=1, callback=self.audio_callback,
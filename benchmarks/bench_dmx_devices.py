@@ -0,0 +1,195 @@
+"""Compare ``DmxDevice`` setter and frame cost with the former dict-based state.
+
+Run from the project root::
+
+    python benchmarks/bench_dmx_devices.py --fixtures 500
+
+A rig cycling through five fixture classes from ``src/dmx`` is driven once per
+pass: ``set_color`` and ``set_dimmer`` on each device, then ``frame()``.  The
+same passes run against ``LegacyDevice``, a copy of the per-instance dict
+implementation the layout-compiled devices replaced, and the script reports
+time per pass plus the memory each device instance holds.  Finally a
+universe full of fixtures times ``DMX.update()`` when a few of them changed
+against when all of them did.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from dmx.dmx import DMX
+from dmx.Fuzzix_PartyParUV_7ch import Fuzzix_PartyParUV_7ch
+from dmx.Prolights_LumiPar12UAW5_7ch import Prolights_LumiPar12UAW5_7ch
+from dmx.Prolights_LumiPar12UQPro_9ch import Prolights_LumiPar12UQPro_9ch
+from dmx.Prolights_LumiPar7UTRI_8ch import Prolights_LumiPar7UTRI_8ch
+from dmx.Prolights_PixieWash_13ch import Prolights_PixieWash_13ch
+
+FIXTURES = (
+    Prolights_LumiPar12UAW5_7ch,
+    Prolights_LumiPar7UTRI_8ch,
+    Prolights_LumiPar12UQPro_9ch,
+    Prolights_PixieWash_13ch,
+    Fuzzix_PartyParUV_7ch,
+)
+
+
+class LegacyDevice:
+    """Dict-per-instance device state as it was before the compiled layout."""
+
+    def __init__(self, offsets: Dict[str, int], start_address: int) -> None:
+        self.channels: Dict[str, int] = {
+            name: start_address + off for name, off in offsets.items()
+        }
+        self._values: Dict[str, int] = {name: 0 for name in self.channels}
+
+    def _approximate_channel(self, name: str, value: int) -> bool:
+        if name in {"white", "warm_white", "cold_white"}:
+            if "white" in self.channels:
+                self._values["white"] = max(0, min(255, int(value)))
+                return True
+            if {"red", "green", "blue"}.issubset(self.channels):
+                val = max(0, min(255, int(value)))
+                self._values["red"] = val
+                self._values["green"] = val
+                self._values["blue"] = val
+                return True
+        if name == "amber":
+            if "amber" in self.channels:
+                self._values["amber"] = max(0, min(255, int(value)))
+                return True
+            if {"red", "green"}.issubset(self.channels):
+                val = max(0, min(255, int(value)))
+                self._values["red"] = val
+                self._values["green"] = int(val * 0.5)
+                return True
+        return False
+
+    def set_channel(self, name: str, value: int) -> None:
+        if name in self.channels:
+            self._values[name] = max(0, min(255, int(value)))
+        elif not self._approximate_channel(name, value):
+            raise KeyError(name)
+
+    def set_color(self, red, green, blue, white=0, amber=0, uv=0) -> None:
+        for name, val in (
+            ("red", red),
+            ("green", green),
+            ("blue", blue),
+            ("white", white),
+            ("amber", amber),
+            ("uv", uv),
+        ):
+            try:
+                self.set_channel(name, val)
+            except KeyError:
+                pass
+
+    def set_dimmer(self, value: int) -> None:
+        if "dimmer" not in self.channels:
+            raise KeyError("No 'dimmer' channel defined")
+        self._values["dimmer"] = max(0, min(255, int(value)))
+
+    def frame(self) -> Dict[int, int]:
+        return {
+            offset: max(0, min(255, self._values[name]))
+            for name, offset in self.channels.items()
+        }
+
+
+def build_rig(count: int, legacy: bool) -> List:
+    rig = []
+    for i in range(count):
+        cls = FIXTURES[i % len(FIXTURES)]
+        address = 1 + (i * 16) % 496
+        rig.append(LegacyDevice(cls.CHANNEL_OFFSETS, address) if legacy else cls(address))
+    return rig
+
+
+def drive(rig: List, step: int) -> None:
+    level = step % 256
+    for device in rig:
+        device.set_color(level, 255 - level, level // 2, level, 0, 0)
+        try:
+            device.set_dimmer(level)
+        except KeyError:
+            pass
+        device.frame()
+
+
+def time_passes(rig: List, passes: int) -> np.ndarray:
+    drive(rig, 0)
+    times = np.empty(passes)
+    for i in range(passes):
+        start = time.perf_counter()
+        drive(rig, i)
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def bytes_per_device(count: int, legacy: bool) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rig = build_rig(count, legacy)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rig
+    return (after - before) / count
+
+
+def time_updates(touched: int, passes: int) -> tuple[float, int]:
+    """Mean ``DMX.update()`` microseconds and rig size after ``touched`` changes."""
+    devices = []
+    address = 1
+    while address + 13 <= 512:
+        cls = FIXTURES[len(devices) % len(FIXTURES)]
+        devices.append((cls, address))
+        address += cls._WIDTH
+    ctrl = DMX(devices, port="none")
+    ctrl.update()
+    touched = min(touched, len(ctrl.devices))
+    times = np.empty(passes)
+    for i in range(passes):
+        for device in ctrl.devices[:touched]:
+            device.set_color(i % 256, 0, 0)
+        start = time.perf_counter()
+        ctrl.update()
+        times[i] = time.perf_counter() - start
+    return times.mean() * 1e6, len(ctrl.devices)
+
+
+def report(name: str, times: np.ndarray, memory: float) -> None:
+    ms = times * 1e3
+    print(
+        f"{name:<8} mean {ms.mean():7.2f} ms  p50 {np.percentile(ms, 50):7.2f} ms"
+        f"  p99 {np.percentile(ms, 99):7.2f} ms  {memory:7.0f} B/device"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=int, default=500, help="Devices in the rig")
+    parser.add_argument("--passes", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.fixtures} fixtures, {args.passes} passes of set_color + frame()")
+    before = time_passes(build_rig(args.fixtures, legacy=True), args.passes)
+    after = time_passes(build_rig(args.fixtures, legacy=False), args.passes)
+    report("dict", before, bytes_per_device(args.fixtures, legacy=True))
+    report("layout", after, bytes_per_device(args.fixtures, legacy=False))
+    print(f"speedup  {before.mean() / after.mean():.1f}x")
+    for touched in (3, 1000):
+        us, total = time_updates(touched, args.passes)
+        print(f"update() with {min(touched, total):3d} of {total} fixtures changed: {us:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
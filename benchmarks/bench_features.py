@@ -0,0 +1,104 @@
+"""Compare per-block CPU time of librosa features and ``SpectralFrame``.
+
+Run from the project root::
+
+    python benchmarks/bench_features.py --seconds 600
+
+A synthetic track with kicks, snares and a chord pad is split into 512-sample
+blocks.  Each block is analysed with the former per-feature librosa calls
+(RMS, flatness, STFT + HPSS and centroid) and with the shared-spectrum engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.audio.features import SpectralFrame
+
+BLOCK = 512
+
+
+def synthetic_track(seconds: float, samplerate: int = 44100) -> np.ndarray:
+    """Return a mono float32 test track with drums over a sustained chord."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    pad = sum(0.1 * np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6))
+    beat = samplerate // 2  # 120 BPM
+    env = np.exp(-np.arange(beat) / (0.05 * samplerate))
+    kick = np.sin(2 * np.pi * 60.0 * np.arange(beat) / samplerate) * env
+    snare = rng.standard_normal(beat) * env * 0.5
+    drums = np.zeros_like(t)
+    for i, start in enumerate(range(0, len(t) - beat, beat)):
+        drums[start : start + beat] += snare if i % 2 else kick
+    track = pad + 0.5 * drums + 0.01 * rng.standard_normal(len(t))
+    return track.astype(np.float32)
+
+
+def legacy_features(samples: np.ndarray, samplerate: int) -> None:
+    import librosa
+
+    n_fft = min(1024, len(samples))
+    librosa.feature.rms(y=samples, frame_length=n_fft, hop_length=n_fft // 2)
+    librosa.feature.spectral_flatness(y=samples, n_fft=n_fft)
+    S = librosa.stft(samples, n_fft=n_fft, hop_length=n_fft // 2)
+    librosa.decompose.hpss(S)
+    librosa.feature.spectral_centroid(y=samples, sr=samplerate, n_fft=n_fft)
+
+
+def shared_features(frame: SpectralFrame, samples: np.ndarray) -> None:
+    frame.analyze(samples)
+    frame.centroid()
+
+
+def time_blocks(func, blocks: np.ndarray) -> np.ndarray:
+    # one untimed call so JIT compilation and caches do not skew the numbers
+    func(blocks[0])
+    times = np.empty(len(blocks))
+    for i, block in enumerate(blocks):
+        start = time.perf_counter()
+        func(block)
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def report(name: str, times: np.ndarray, budget: float) -> None:
+    us = times * 1e6
+    print(
+        f"{name:<10} mean {us.mean():8.1f} us  p50 {np.percentile(us, 50):8.1f} us"
+        f"  p99 {np.percentile(us, 99):8.1f} us  ({times.mean() / budget:6.1%} of block)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=300.0, help="Track length")
+    parser.add_argument("--samplerate", type=int, default=44100)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Only time SpectralFrame"
+    )
+    args = parser.parse_args()
+
+    track = synthetic_track(args.seconds, args.samplerate)
+    blocks = track[: len(track) // BLOCK * BLOCK].reshape(-1, BLOCK)
+    budget = BLOCK / args.samplerate
+    print(f"{len(blocks)} blocks of {BLOCK} samples, budget {budget * 1e3:.1f} ms")
+
+    frame = SpectralFrame(BLOCK, args.samplerate)
+    after = time_blocks(lambda b: shared_features(frame, b), blocks)
+    if not args.skip_legacy:
+        before = time_blocks(lambda b: legacy_features(b, args.samplerate), blocks)
+        report("librosa", before, budget)
+    report("shared", after, budget)
+    if not args.skip_legacy:
+        print(f"speedup    {before.mean() / after.mean():.1f}x")
+
+
+if __name__ == "__main__":
+    main()
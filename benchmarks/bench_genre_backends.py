@@ -0,0 +1,113 @@
+"""Compare genre classifier inference backends on a local clip set.
+
+Run from the project root after exporting the ONNX graph::
+
+    python -m src.audio.genre_backends export
+    python benchmarks/bench_genre_backends.py clips/ --seconds 10
+
+Every WAV/FLAC file in the clip directory is downmixed, resampled to 16 kHz
+and cut to ``--seconds``.  For each backend the script reports model load
+time, per-clip latency and how often its top-1 label agrees with the
+``pipeline`` backend, which is the reference.  For the direct torch backend
+the forward pass and the per-call overhead around it are reported separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.audio.genre_backends import (
+    SAMPLERATE,
+    OnnxBackend,
+    PipelineBackend,
+    TorchBackend,
+)
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "models" / "music_genres_classification"
+
+
+def load_clips(folder: Path, seconds: float) -> dict[str, np.ndarray]:
+    """Return ``{name: 16 kHz mono float32}`` for audio files in ``folder``."""
+    import librosa
+    import soundfile as sf
+
+    clips = {}
+    for path in sorted(folder.iterdir()):
+        if path.suffix.lower() not in {".wav", ".flac", ".ogg"}:
+            continue
+        data, sr = sf.read(str(path), dtype="float32", always_2d=True)
+        mono = data.mean(axis=1)
+        if sr != SAMPLERATE:
+            mono = librosa.resample(mono, orig_sr=sr, target_sr=SAMPLERATE)
+        clips[path.name] = np.ascontiguousarray(
+            mono[: int(seconds * SAMPLERATE)], dtype=np.float32
+        )
+    return clips
+
+
+def run_backend(backend, clips: dict[str, np.ndarray]) -> dict:
+    start = time.perf_counter()
+    backend.load()
+    load_s = time.perf_counter() - start
+    backend.predict(np.zeros(SAMPLERATE, dtype=np.float32))  # warm-up
+    labels = {}
+    times = []
+    for name, clip in clips.items():
+        t0 = time.perf_counter()
+        result = backend.predict(clip)
+        times.append(time.perf_counter() - t0)
+        labels[name] = result[0]["label"] if result else ""
+    return {"load": load_s, "times": np.array(times), "labels": labels}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("clips", type=Path, help="Directory of WAV/FLAC clips")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--model", type=Path, default=MODEL_DIR)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument(
+        "--onnx-file", action="append", default=None,
+        help="ONNX graph(s) in the model directory (default: int8 and float)",
+    )
+    args = parser.parse_args()
+
+    clips = load_clips(args.clips, args.seconds)
+    if not clips:
+        parser.error(f"no audio files in {args.clips}")
+    backends = [PipelineBackend(args.model), TorchBackend(args.model, args.threads)]
+    for onnx_file in args.onnx_file or ["model.int8.onnx", "model.onnx"]:
+        if (args.model / onnx_file).exists():
+            backend = OnnxBackend(args.model, onnx_file)
+            backend.name = f"onnx:{onnx_file}"
+            backends.append(backend)
+
+    results = {backend.name: run_backend(backend, clips) for backend in backends}
+    reference = results["pipeline"]["labels"]
+    print(f"{len(clips)} clips of up to {args.seconds:.0f}s")
+    print(f"{'backend':<24}{'load s':>8}{'mean ms':>10}{'p95 ms':>10}{'top-1 agree':>13}")
+    for name, res in results.items():
+        agree = np.mean([res["labels"][clip] == reference[clip] for clip in clips])
+        times = res["times"] * 1e3
+        print(
+            f"{name:<24}{res['load']:>8.2f}{times.mean():>10.1f}"
+            f"{np.percentile(times, 95):>10.1f}{agree:>12.0%}"
+        )
+    torch_backend = backends[1]
+    print(
+        f"torch: forward p50 {torch_backend.forward_time.percentile(50) * 1e3:.1f} ms,"
+        f" overhead p50 {torch_backend.overhead.percentile(50) * 1e3:.2f} ms"
+        f" p99 {torch_backend.overhead.percentile(99) * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Accuracy and latency of ``GenreClassifier`` on a labelled clip corpus.
+
+Run from the project root with one sub-folder of clips per genre::
+
+    python benchmarks/bench_genre_classifier.py clips/ --backend auto --out run.json
+
+Folder names and model labels are both mapped through
+``parameters.GENRE_ID_MAP``.  The script reports the cold first call (model
+load plus one inference), warm per-clip latency percentiles, peak RSS,
+top-1/top-3 accuracy and a confusion matrix, and writes them as JSON so runs
+with different backends or settings can be diffed.  ``--tiny`` swaps in a
+randomly initialised two-layer model (needs torch and transformers, no
+downloaded weights) so the harness itself can run in CI; its accuracy is
+meaningless.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import parameters
+from src.audio.quick_genre import labelled_clips
+
+SAMPLERATE = 16000
+MODEL_DIR = Path(__file__).resolve().parents[1] / "models" / "music_genres_classification"
+
+
+def canonical(label: str) -> str:
+    """Map a model label or folder name to a ``GENRE_ID_MAP`` genre."""
+    name = label.lower().strip()
+    return parameters.GENRE_ID_MAP.get(name, name)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process, ``None`` where unsupported."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_tiny_model(path: Path, seed: int = 0) -> Path:
+    """Save a random-weight wav2vec2 classifier with the real label set."""
+    import torch
+    from transformers import (
+        Wav2Vec2Config,
+        Wav2Vec2FeatureExtractor,
+        Wav2Vec2ForSequenceClassification,
+    )
+
+    torch.manual_seed(seed)
+    id2label = dict(parameters.GENRE_ID_MAP)
+    config = Wav2Vec2Config(
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        conv_dim=(32, 32, 32),
+        conv_kernel=(10, 3, 3),
+        conv_stride=(5, 2, 2),
+        num_conv_pos_embeddings=16,
+        num_conv_pos_embedding_groups=2,
+        classifier_proj_size=16,
+        num_labels=len(id2label),
+        id2label=id2label,
+        label2id={v: k for k, v in id2label.items()},
+    )
+    Wav2Vec2ForSequenceClassification(config).save_pretrained(str(path))
+    Wav2Vec2FeatureExtractor(
+        feature_size=1, sampling_rate=SAMPLERATE, do_normalize=True
+    ).save_pretrained(str(path))
+    return path
+
+
+def load_corpus(folder: Path, seconds: float) -> List[tuple[str, str, np.ndarray]]:
+    """Return ``(name, genre, 16 kHz audio)`` for each labelled clip."""
+    import librosa
+
+    clips = []
+    for path, genre in labelled_clips(folder):
+        audio, _ = librosa.load(str(path), sr=SAMPLERATE, mono=True, duration=seconds)
+        clips.append((f"{genre}/{path.name}", canonical(genre), audio.astype(np.float32)))
+    return clips
+
+
+def summarize(
+    truth: Sequence[str], ranked: Sequence[Sequence[str]], times: Sequence[float]
+) -> Dict:
+    """Return accuracy, confusion matrix and latency for ranked predictions."""
+    labels = sorted(set(truth) | {r[0] for r in ranked if r})
+    confusion = {t: {p: 0 for p in labels} for t in labels}
+    for t, r in zip(truth, ranked):
+        if r:
+            confusion[t][r[0]] += 1
+    top1 = [bool(r) and r[0] == t for t, r in zip(truth, ranked)]
+    top3 = [t in r[:3] for t, r in zip(truth, ranked)]
+    ms = np.asarray(times) * 1e3
+    return {
+        "clips": len(truth),
+        "top1": float(np.mean(top1)) if top1 else 0.0,
+        "top3": float(np.mean(top3)) if top3 else 0.0,
+        "latency_ms": {
+            "mean": float(ms.mean()) if len(ms) else 0.0,
+            **{
+                f"p{q}": float(np.percentile(ms, q)) if len(ms) else 0.0
+                for q in (50, 95, 99)
+            },
+        },
+        "labels": labels,
+        "confusion": confusion,
+    }
+
+
+def run(
+    clips: Sequence[tuple[str, str, np.ndarray]],
+    model_path: Path,
+    backend: str,
+    threads: int = 0,
+) -> Dict:
+    from src.audio.genre_classifier import GenreClassifier
+
+    classifier = GenreClassifier(model_path, backend=backend, threads=threads)
+    start = time.perf_counter()
+    classifier.score_windows(np.zeros((1, SAMPLERATE), dtype=np.float32), SAMPLERATE)
+    cold = time.perf_counter() - start
+    truth, ranked, times = [], [], []
+    for _, genre, audio in clips:
+        t0 = time.perf_counter()
+        probs = classifier.score_windows(audio[None, :], SAMPLERATE)[0]
+        times.append(time.perf_counter() - t0)
+        order = sorted(probs, key=probs.get, reverse=True)
+        truth.append(genre)
+        ranked.append([canonical(label) for label in order])
+    report = summarize(truth, ranked, times)
+    report.update(
+        backend=classifier._backend().name,
+        model=str(model_path),
+        cold_first_call_s=cold,
+        peak_rss_mb=peak_rss_mb(),
+    )
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("clips", type=Path, help="Folder of <genre>/<clip> files")
+    parser.add_argument("--model", type=Path, default=MODEL_DIR)
+    parser.add_argument("--backend", default="auto")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tiny", action="store_true", help="random-weight stand-in model")
+    parser.add_argument("--out", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    clips = load_corpus(args.clips, args.seconds)
+    if not clips:
+        parser.error(f"no labelled clips under {args.clips}")
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_tiny_model(Path(tmp)) if args.tiny else args.model
+        report = run(clips, model, args.backend, args.threads)
+    report["seconds"] = args.seconds
+    print(
+        f"{report['clips']} clips, backend {report['backend']}: "
+        f"cold {report['cold_first_call_s']:.2f}s, "
+        f"p50 {report['latency_ms']['p50']:.1f} ms, "
+        f"p99 {report['latency_ms']['p99']:.1f} ms, "
+        f"top-1 {report['top1']:.0%}, top-3 {report['top3']:.0%}, "
+        f"peak RSS {report['peak_rss_mb'] or 0:.0f} MB"
+    )
+    labels = report["labels"]
+    print("true \\ predicted".ljust(18) + "".join(f"{p[:7]:>8}" for p in labels))
+    for t in labels:
+        row = report["confusion"][t]
+        print(f"{t:<18}" + "".join(f"{row[p]:>8}" for p in labels))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,27 @@ import datetime
 import sys
 
 LOG_DIR = pathlib.Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
-log_file = LOG_DIR / f"ai_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+log_file: pathlib.Path | None = None
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(log_file, encoding="utf-8"),
-        logging.StreamHandler(sys.stdout),
-    ],
-    force=True,
-)
+
+def configure() -> pathlib.Path:
+    """Send log records to a timestamped file in ``LOG_DIR`` and stdout.
+
+    Runs once, on first use rather than at import, so importing modules that
+    log does not create files; returns the log file path.
+    """
+    global log_file
+    if log_file is not None:
+        return log_file
+    LOG_DIR.mkdir(exist_ok=True)
+    log_file = LOG_DIR / f"ai_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        handlers=[
+            logging.FileHandler(log_file, encoding="utf-8"),
+            logging.StreamHandler(sys.stdout),
+        ],
+        force=True,
+    )
+    return log_file
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import sys
 import time
+
+# startup profiling measures from here, before the heavier imports below
+_IMPORT_START = time.perf_counter()
 import os
 import json
 import logging
@@ -9,21 +12,24 @@ import log as log_config
 
 logger = logging.getLogger("AI")
 import traceback
-from collections import deque
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict
 import threading
-import queue
+from concurrent.futures import Future
+from contextlib import ExitStack
 
 import numpy as np
 import math
 
-try:
-    import sounddevice as sd
-except Exception:  # pragma: no cover - optional dependency for tests
-    sd = None
-
-from src.audio.beat_detection import SongState
+from src.audio import SongState
+from src.audio.blockring import BlockRing
+from src.audio.fingerprint import FingerprintCache, fingerprint
+from src.audio.genre_vote import GenreVote
+from src.audio.jobs import LatestJobExecutor
+from src.audio.metrics import LatencyHistogram, StartupProfile
+from src.audio.quick_genre import MODEL_FILE as QUICK_GENRE_FILE, QuickGenreModel
+from src.audio.resample import StreamingResampler
+from src.audio.ringbuffer import AudioRingBuffer
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -31,6 +37,9 @@ if TYPE_CHECKING:
 
 _GENRE_SENTINEL = object()
 
+# Sample rate expected by the genre model
+CLASSIFIER_RATE = 16000
+
 import parameters
 from parameters import Scenario
 
@@ -59,6 +68,13 @@ class Dashboard:
         self.crescendo = False
         self.snare = False
         self.kick = False
+        self.latency: Dict[str, Dict[str, float]] = {}
+        self.block_budget = 0.0
+        self.queue_stats: Dict[str, int] = {}
+        self.job_stats: Dict[str, float] = {}
+        self.dmx_stats: Dict[str, float] = {}
+        self.cpu_level = 0
+        self.decimated: Dict[str, int] = {}
         self.groups: Dict[str, Dict[str, int]] = {}
         self._last_out = ""
 
@@ -114,6 +130,30 @@ class Dashboard:
         self.kick = value
         self._render()
 
+    def set_latency(
+        self,
+        report: Dict[str, Dict[str, float]],
+        budget: float,
+        queue_stats: Dict[str, int] | None = None,
+    ) -> None:
+        self.latency = report
+        self.block_budget = budget
+        self.queue_stats = queue_stats or {}
+        self._render()
+
+    def set_jobs(self, stats: Dict[str, float]) -> None:
+        self.job_stats = stats
+        self._render()
+
+    def set_dmx(self, stats: Dict[str, float]) -> None:
+        self.dmx_stats = stats
+        self._render()
+
+    def set_degradation(self, level: int, decimated: Dict[str, int]) -> None:
+        self.cpu_level = level
+        self.decimated = decimated
+        self._render()
+
     def _render(self) -> None:
         lines = [
             f"Genre: {self.genre}",
@@ -127,9 +167,39 @@ class Dashboard:
             f"Snare: {'Hit' if self.snare else 'No'}",
             f"Kick: {'Hit' if self.kick else 'No'}",
             f"Status: {self.status}",
-            "",
-            "Groups:",
         ]
+        if self.latency:
+            lines.append(
+                f"Latency p50/p99 ms (budget {self.block_budget * 1e3:.1f} ms):"
+            )
+            for stage, stats in self.latency.items():
+                if stats["count"]:
+                    lines.append(
+                        f"  {stage}: {stats['p50_ms']:.2f} / {stats['p99_ms']:.2f}"
+                    )
+        if self.queue_stats:
+            q = self.queue_stats
+            lines.append(
+                f"Audio queue: depth {q['depth']} (max {q['max_depth']}),"
+                f" dropped {q['drops']}, batched {q['coalesced']}/{q['batches']}"
+            )
+        if self.job_stats.get("completed") or self.job_stats.get("cancelled"):
+            j = self.job_stats
+            lines.append(
+                f"Genre jobs: wait p99 {j['wait_p99_ms']:.1f} ms,"
+                f" run p50 {j['run_p50_ms']:.0f} ms, cancelled {j['cancelled']}"
+            )
+        if self.dmx_stats.get("frames"):
+            d = self.dmx_stats
+            lines.append(
+                f"DMX: {d['fps']:.1f}/{d['target_fps']:.0f} fps,"
+                f" jitter p50/p99 {d['jitter_p50_ms']:.2f} / {d['jitter_p99_ms']:.2f} ms,"
+                f" overruns {d['overruns']}, skipped {d['skipped']}"
+            )
+        if self.cpu_level:
+            shed = ", ".join(f"{name} 1/{every}" for name, every in self.decimated.items())
+            lines.append(f"CPU level: {self.cpu_level} ({shed})")
+        lines += ["", "Groups:"]
         for name, vals in self.groups.items():
             lines.append(f"  {name}: {vals}")
         out = "\n".join(lines)
@@ -148,8 +218,24 @@ class BeatDMXShow:
         ai_log_path: str = "ai.log",
         debug_log_path: str | None = None,
         genre_model: GenreClassifier | None | object = _GENRE_SENTINEL,
+        clock: Callable[[], float] | None = None,
+        genre_cache: FingerprintCache | None | object = _GENRE_SENTINEL,
+        quick_genre: QuickGenreModel | None | object = _GENRE_SENTINEL,
     ) -> None:
+        """Create the show.
+
+        ``clock`` returns the current time in seconds and defaults to
+        ``time.time``; replays pass a virtual clock so runs are reproducible.
+        ``genre_cache`` maps audio fingerprints to known genre labels; by
+        default it is loaded from ``parameters.GENRE_CACHE_FILE`` when the
+        default genre model is used and disabled otherwise.  ``quick_genre``
+        guesses a provisional genre from timbre statistics until the model
+        answers; by default it is loaded from ``models/quick_genre.npz`` when
+        that file exists and the default genre model is used.
+        """
+        log_config.configure()
         self.samplerate = samplerate
+        self.clock = clock or time.time
         self.dashboard_enabled = dashboard
         self.dashboard = Dashboard() if dashboard else None
         self.detector = None
@@ -170,6 +256,7 @@ class BeatDMXShow:
         self.smoke_gap_ms, self.smoke_duration_ms = parameters.smoke_settings(self.scenario)
         self.groups: Dict[str, list] = {}
         self.beat_ends: Dict[str, float] = {}
+        self.fades: list[dict] = []
         self._beat_line: str | None = None
         self.last_vu_dimmer = -1
         self.smoothed_vu_dimmer = 0.0
@@ -180,25 +267,89 @@ class BeatDMXShow:
         self.ai_log_handle = open(self.ai_log_path, "a")
         self.debug_log_path = debug_log_path or str(log_config.LOG_DIR / "debug.log")
         self.debug_log_handle = open(self.debug_log_path, "a")
-        if genre_model is _GENRE_SENTINEL:
+        if genre_model is _GENRE_SENTINEL and parameters.GENRE_WORKER_PROCESS:
+            from src.audio.genre_worker import GenreWorker
+
+            # model loading and inference stay out of this process; the
+            # worker is started and warmed up in ``run``
+            self.genre_classifier = GenreWorker(
+                backend=parameters.GENRE_BACKEND,
+                threads=parameters.GENRE_THREADS,
+                log_path=self.ai_log_path,
+            )
+        elif genre_model is _GENRE_SENTINEL:
             from src.audio import GenreClassifier as GC
 
-            self.genre_classifier = GC(verbose=True, log_file=self.ai_log_handle)
+            self.genre_classifier = GC(
+                verbose=True,
+                log_file=self.ai_log_handle,
+                backend=parameters.GENRE_BACKEND,
+                threads=parameters.GENRE_THREADS,
+            )
         else:
             self.genre_classifier = genre_model
+        if genre_cache is _GENRE_SENTINEL:
+            genre_cache = (
+                FingerprintCache(
+                    Path(parameters.GENRE_CACHE_FILE),
+                    parameters.GENRE_CACHE_SIZE,
+                    min_confidence=parameters.GENRE_CACHE_MIN_CONFIDENCE,
+                )
+                if genre_model is _GENRE_SENTINEL
+                else None
+            )
+        self.genre_cache = genre_cache
+        if quick_genre is _GENRE_SENTINEL:
+            quick_genre = (
+                QuickGenreModel.load(QUICK_GENRE_FILE)
+                if genre_model is _GENRE_SENTINEL and QUICK_GENRE_FILE.exists()
+                else None
+            )
+        self.quick_genre = quick_genre
+        self.quick_label = ""
+        self._quick_pending = False
+        self._quick_next = 0.0
+        self.quick_time = LatencyHistogram()
+        # one model call at a time; jobs for a song that already ended are
+        # dropped before they start
+        self.classifier_jobs = LatestJobExecutor(
+            current_key=lambda: self.song_id, name="genre"
+        )
+        # fingerprinting and cache lookups, kept off the audio thread
+        self.cache_jobs = LatestJobExecutor(
+            current_key=lambda: self.song_id, name="genre-cache"
+        )
+        self._genre_futures: list[tuple[int, Future]] = []
+        self._pending_fingerprint: tuple[int, np.ndarray] | None = None
         if self.genre_classifier is None:
             logger.info("Genre classifier disabled")
         else:
             logger.info("AI logging started")
-        self.pre_song_buffer = deque(maxlen=int(5 * self.samplerate))
+        # audio for the genre model, resampled block by block as it arrives so
+        # a classification can start without resampling
+        self.classifier_rate = CLASSIFIER_RATE
+        self.resampler = StreamingResampler(self.samplerate, self.classifier_rate)
+        self.pre_song_buffer = AudioRingBuffer(int(5 * self.classifier_rate))
         self.buffering = False
         self.buffer_start_time = 0.0
         self.classify_after: float | None = None
         self.classifying = False
+        self.vote: GenreVote | None = None
+        self._vote_sent = 0
+        self._vote_busy = False
+        # vote state is advanced on the audio thread and updated from the
+        # thread that resolves window scores
+        self._vote_lock = threading.Lock()
         self.last_genre_check = 0.0
         self.genre_label = ""
-        self.audio_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=20)
+        self.audio_ring = BlockRing(capacity=32, block_size=512)
+        self.max_batch = 16
+        self.last_latency_update = 0.0
+        self.cpu_level = 0
+        self.startup: StartupProfile | None = None
+        self.first_block_seconds: float | None = None
         self.running = False
+        self.controller: DMX | None = None
 
     def __del__(self) -> None:  # pragma: no cover - cleanup
         if hasattr(self, "debug_log_handle") and self.debug_log_handle:
@@ -235,6 +386,11 @@ class BeatDMXShow:
             self.debug_log_handle.flush()
 
     def _apply_update(self, group: str, values: Dict[str, int]) -> None:
+        """Set ``values`` on the fixtures of ``group``.
+
+        The controller picks the changed fixtures up on its next ``update()``:
+        once at the end of each audio block and before each sender tick.
+        """
         fixtures = self.groups.get(group, [])
         for fx in fixtures:
             pan = values.get("pan")
@@ -251,7 +407,6 @@ class BeatDMXShow:
                     fx.set_channel(ch, val)
                 except KeyError:
                     pass
-        self.controller.update()
 
     def _print_state_change(self, updates: Dict[str, Dict[str, int]]) -> None:
         for name, vals in updates.items():
@@ -266,7 +421,7 @@ class BeatDMXShow:
     def apply_beat_effects(self) -> None:
         beat_cfg = self.scenario.events.get("beat")
         if beat_cfg:
-            now = time.time()
+            now = self.clock()
             for group, settings in beat_cfg.items():
                 dur_ms = settings.get("duration", 100)
                 update = {k: v for k, v in settings.items() if k != "duration"}
@@ -289,7 +444,7 @@ class BeatDMXShow:
     def apply_snare_hit_effects(self) -> None:
         snare_cfg = self.scenario.events.get("snare_hit")
         if snare_cfg:
-            now = time.time()
+            now = self.clock()
             for group, settings in snare_cfg.items():
                 dur_ms = settings.get("duration", 50)
                 update = {k: v for k, v in settings.items() if k != "duration"}
@@ -309,30 +464,34 @@ class BeatDMXShow:
     def start_timer_effects(self) -> None:
         timer_cfg = self.scenario.events.get("timer")
         if timer_cfg:
-            after = timer_cfg.get("after_seconds", 0)
-            threading.Thread(
-                target=self._timer_worker,
-                args=(timer_cfg, after),
-                daemon=True,
-            ).start()
-
-    def _timer_worker(self, timer_cfg, after_seconds):
-        time.sleep(after_seconds)
-        for group, colors in timer_cfg.items():
-            if group == "after_seconds":
+            start = self.clock() + timer_cfg.get("after_seconds", 0)
+            for group, colors in timer_cfg.items():
+                if group == "after_seconds":
+                    continue
+                self.fades.append(
+                    {"group": group, "colors": colors, "start": start, "last": None}
+                )
+
+    def _advance_fades(self, now: float) -> None:
+        """Step running colour fades; called from ``_tick`` on every block."""
+        for fade in list(self.fades):
+            if now < fade["start"]:
+                continue
+            colors = fade["colors"]
+            from_colors = colors["from"]
+            to_colors = colors["to"]
+            all_colors = set(from_colors) | set(to_colors)
+            duration = colors["duration_ms"] / 1000.0
+            if now >= fade["start"] + duration:
+                final_colors = {color: to_colors.get(color, 0) for color in all_colors}
+                self._apply_update(fade["group"], final_colors)
+                self.fades.remove(fade)
+                continue
+            # refresh at most every 50 ms like the former fade thread
+            if fade["last"] is not None and now - fade["last"] < 0.05:
                 continue
-            self._color_fade_worker(group, colors)
-
-    def _color_fade_worker(self, group, colors):
-        duration = colors["duration_ms"] / 1000.0
-        start_time = time.time()
-        end_time = start_time + duration
-        from_colors = colors["from"]
-        to_colors = colors["to"]
-        all_colors = set(from_colors) | set(to_colors)
-        while time.time() < end_time:
-            elapsed = time.time() - start_time
-            ratio = elapsed / duration
+            fade["last"] = now
+            ratio = (now - fade["start"]) / duration
             current_colors = {
                 color: int(
                     from_colors.get(color, 0) * (1 - ratio)
@@ -340,10 +499,7 @@ class BeatDMXShow:
                 )
                 for color in all_colors
             }
-            self._apply_update(group, current_colors)
-            time.sleep(0.05)
-        final_colors = {color: to_colors.get(color, 0) for color in all_colors}
-        self._apply_update(group, final_colors)
+            self._apply_update(fade["group"], current_colors)
 
     def _set_scenario(self, name: parameters.Scenario, force: bool = False) -> None:
         scn = parameters.SCENARIO_MAP.get(name)
@@ -364,6 +520,7 @@ class BeatDMXShow:
         self.scenario = scn
         self.smoke_gap_ms, self.smoke_duration_ms = parameters.smoke_settings(scn)
         self.beat_ends.clear()
+        self.fades.clear()
         if self.controller:
             self.controller.reset()
         updates = dict(scn.updates)
@@ -376,14 +533,36 @@ class BeatDMXShow:
         self._launch_genre_classifier_immediately()
 
     def _run_genre_classifier(
-        self, samples: np.ndarray, sr: int, song_id: int
+        self,
+        samples: np.ndarray,
+        sr: int,
+        song_id: int,
+        result: Future | None = None,
+        confidence: float | None = None,
     ) -> None:
+        """Classify ``samples`` and apply the label if the song is current.
+
+        With ``result`` the label comes from that finished future instead of
+        calling the classifier; ``confidence`` is the probability to cache the
+        label with, by default the model's ``last_score``.
+        """
+        if result is not None and result.cancelled():
+            logger.info("THREAD cancelled   song_id=%s", song_id)
+            if song_id == self.song_id:
+                self.classifying = False
+            return
         start_t = time.perf_counter()
         logger.info("THREAD start — calling model...")
         logger.info("THREAD start       song_id=%s", song_id)
         try:
-            label = self.genre_classifier.classify(samples, sr)
+            if result is not None:
+                label = result.result()
+            else:
+                label = self.genre_classifier.classify(samples, sr)
             logger.info("THREAD got label: %s", label)
+            if confidence is None:
+                confidence = getattr(self.genre_classifier, "last_score", None)
+            self._remember_genre(song_id, label, confidence)
             scenario = self._scenario_from_label(label)
             self._ai_log(f"Genre classified as '{label}' -> Scenario: {scenario.name}")
             logger.info(
@@ -396,15 +575,25 @@ class BeatDMXShow:
                 self.genre_label = label
                 if label == "":
                     logger.info("THREAD empty label, scheduling retry")
-                    self.classify_after = time.time() + 5.0
+                    self.classify_after = self.clock() + 5.0
                     if self.dashboard_enabled:
                         self.dashboard.set_genre("(retry)")
                 else:
+                    # a matching provisional scenario keeps running untouched
+                    confirmed = (
+                        self.quick_label != ""
+                        and self._scenario_from_label(self.quick_label) == scenario
+                    )
+                    if self.quick_label:
+                        verdict = "confirmed" if confirmed else f"overridden by '{label}'"
+                        self._ai_log(f"Provisional genre '{self.quick_label}' {verdict}")
+                    self._quick_pending = False
                     self.last_genre = scenario
                     if self.current_state == SongState.STARTING:
                         self._handle_state_change(SongState.ONGOING)
-                        self._set_scenario(scenario)
-                    elif self.current_state == SongState.ONGOING:
+                        if not confirmed:
+                            self._set_scenario(scenario)
+                    elif self.current_state == SongState.ONGOING and not confirmed:
                         self._set_scenario(scenario)
                     if self.dashboard_enabled:
                         self.dashboard.set_genre(label)
@@ -415,8 +604,13 @@ class BeatDMXShow:
         finally:
             if song_id == self.song_id:
                 self.classifying = False
-                if self.last_genre is None:
-                    self.classify_after = time.time() + 5.0
+                if self._classifier_failed():
+                    # a dead worker fails every job; retrying only spams the log
+                    self.classify_after = None
+                    if self.dashboard_enabled:
+                        self.dashboard.set_genre("(unavailable)")
+                elif self.last_genre is None:
+                    self.classify_after = self.clock() + 5.0
             logger.info(
                 "THREAD finish      song_id=%s  elapsed=%.2fs",
                 song_id,
@@ -435,32 +629,364 @@ class BeatDMXShow:
         if self.genre_classifier is None:
             logger.warning("SKIP   classification: classifier disabled")
             return
+        if self._classifier_failed():
+            logger.warning("SKIP   classification: classifier unavailable")
+            self.classify_after = None
+            return
         if self.classifying:
             logger.warning("SKIP   classification: already running")
             return
-        samples = np.array(self.pre_song_buffer, dtype=np.float32)
+        # the classifier thread outlives the next block writes, so take a copy
+        samples = self.pre_song_buffer.snapshot(copy=True)
         if samples.size == 0:
             logger.warning("SKIP   classification: buffer empty")
             return
         self.classifying = True
-        self.last_genre_check = time.time()
+        self.last_genre_check = self.clock()
         sid = self.song_id
+        if self.genre_cache is not None:
+            # the model only runs if the cache has no label for this audio
+            self._start_cache_lookup(
+                samples, sid, lambda: self._launch_classifier_job(samples, sid)
+            )
+            return
+        self._launch_classifier_job(samples, sid)
+
+    def _launch_classifier_job(self, samples: np.ndarray, song_id: int) -> None:
         logger.info(
             "LAUNCH classifier thread, %d samples in buffer",
             len(self.pre_song_buffer),
         )
         logger.info(
             "LAUNCH classifier  song_id=%s  frames=%d  secs=%.2f",
-            sid,
+            song_id,
             samples.shape[0],
-            samples.shape[0] / self.samplerate,
+            samples.shape[0] / self.classifier_rate,
+        )
+        self._start_classifier_job(samples, self.classifier_rate, song_id)
+
+    def _cache_lookup(
+        self, samples: np.ndarray
+    ) -> tuple[np.ndarray, tuple[str, float, float] | None]:
+        """Fingerprint ``samples`` and look them up; returns ``(hashes, hit)``."""
+        hashes = fingerprint(samples)
+        return hashes, self.genre_cache.lookup(hashes)
+
+    def _start_cache_lookup(
+        self,
+        samples: np.ndarray,
+        song_id: int,
+        on_miss: Callable[[], None] | None = None,
+    ) -> None:
+        """Look ``samples`` up in the genre cache off the audio thread.
+
+        A hit is applied like a model label; on a miss ``on_miss`` runs.
+        """
+        future = self.cache_jobs.submit(self._cache_lookup, samples, key=song_id)
+        future.add_done_callback(
+            lambda done: self._on_cache_lookup(done, samples, song_id, on_miss)
+        )
+
+    def _on_cache_lookup(
+        self,
+        done: Future,
+        samples: np.ndarray,
+        song_id: int,
+        on_miss: Callable[[], None] | None,
+    ) -> None:
+        if song_id != self.song_id:
+            return
+        if done.cancelled():
+            if on_miss is not None:
+                self.classifying = False  # let the scheduled retry run
+            return
+        try:
+            hashes, hit = done.result()
+        except Exception:  # pragma: no cover - fingerprinting errors
+            logger.exception("Genre cache lookup failed")
+            hashes, hit = None, None
+        if hashes is not None:
+            self._log_cache_lookup(hit)
+        if hit is None:
+            if hashes is not None:
+                self._pending_fingerprint = (song_id, hashes)
+            if on_miss is not None:
+                on_miss()
+            return
+        if self.last_genre is not None:
+            return  # the vote got there first
+        # known backing track: apply its label and skip the model
+        self._pending_fingerprint = None
+        self._end_vote()
+        self.classifying = True
+        result: Future = Future()
+        result.set_result(hit[0])
+        self._run_genre_classifier(samples, self.classifier_rate, song_id, result)
+
+    def _classifier_failed(self) -> bool:
+        """True once an out-of-process classifier can no longer run jobs."""
+        return bool(getattr(self.genre_classifier, "failed", False))
+
+    def _end_vote(self) -> None:
+        """Stop voting; scores still in flight are then ignored."""
+        with self._vote_lock:
+            self.vote = None
+
+    def _start_vote(self) -> None:
+        """Begin windowed genre voting for a new song if the model supports it."""
+        clf = self.genre_classifier
+        if self._classifier_failed() or not (
+            hasattr(clf, "submit_scores") or hasattr(clf, "score_windows")
+        ):
+            self._end_vote()
+            return
+        span = self.pre_song_buffer.maxlen / self.classifier_rate
+        max_windows = int(
+            (span - parameters.GENRE_VOTE_WINDOW) / parameters.GENRE_VOTE_HOP
+        ) + 1
+        with self._vote_lock:
+            self.vote = GenreVote(
+                parameters.GENRE_VOTE_MARGIN,
+                parameters.GENRE_VOTE_MIN_WINDOWS,
+                max_windows,
+            )
+            self._vote_sent = 0
+            self._vote_busy = False
+
+    def _advance_vote(self) -> None:
+        """Send every newly complete window to the model in one batch.
+
+        Windows start at fixed offsets from the song start.  When the model
+        lags until the buffer has wrapped, offsets are shifted by the dropped
+        samples, and windows whose start is gone are left out of the vote.
+        """
+        win = int(parameters.GENRE_VOTE_WINDOW * self.classifier_rate)
+        hop = int(parameters.GENRE_VOTE_HOP * self.classifier_rate)
+        n = self.pre_song_buffer.written
+        overflow = n - len(self.pre_song_buffer)
+        settled = False
+        label = None
+        with self._vote_lock:
+            vote = self.vote
+            if (
+                vote is None
+                or self._vote_busy
+                or vote.done
+                or self.last_genre is not None
+            ):
+                return
+            ready = min(vote.max_windows, (n - win) // hop + 1 if n >= win else 0)
+            first = self._vote_sent
+            if ready <= first:
+                return
+            kept = min(ready, max(first, -(-overflow // hop)))
+            vote.max_windows -= kept - first
+            self._vote_sent = ready
+            if kept == ready:
+                if not vote.done:
+                    return
+                # every remaining window was overwritten; settle on the rest
+                settled = True
+                self.vote = None
+                label = vote.best() or None
+                if label is None:
+                    self.classifying = False
+            else:
+                self._vote_busy = True
+        if settled:
+            self._ai_log(
+                f"Genre vote: {vote.windows} windows, audio overwritten"
+                + (f" -> '{label}'" if label is not None else "")
+            )
+            if label is not None:
+                self._commit_vote(vote, self.song_id, label)
+            return
+        audio = self.pre_song_buffer.snapshot()
+        sid = self.song_id
+        if first == 0 and self.genre_cache is not None:
+            # a cache hit ends the vote when it arrives
+            self._start_cache_lookup(audio.copy(), sid)
+        starts = hop * np.arange(kept, ready) - overflow
+        windows = np.stack([audio[s : s + win] for s in starts])
+        self.classifying = True
+        self._submit_windows(windows, sid)
+
+    def _submit_windows(self, windows: np.ndarray, song_id: int) -> None:
+        """Score ``windows`` off the audio thread, then update the vote."""
+        submit = getattr(self.genre_classifier, "submit_scores", None)
+        if submit is not None:
+            future = submit(windows, self.classifier_rate)
+            self._track_genre_job(song_id, future)
+        else:
+            future = self.classifier_jobs.submit(
+                self.genre_classifier.score_windows,
+                windows,
+                self.classifier_rate,
+                key=song_id,
+            )
+        count = len(windows)
+        future.add_done_callback(
+            lambda done: self._on_window_scores(done, song_id, count)
+        )
+
+    def _on_window_scores(self, done: Future, song_id: int, count: int = 0) -> None:
+        scores = []
+        if not done.cancelled():
+            try:
+                scores = done.result()
+            except Exception:  # pragma: no cover - model errors
+                logger.exception("Genre window scoring failed")
+        with self._vote_lock:
+            vote = self.vote
+            if song_id != self.song_id or vote is None:
+                return
+            self._vote_busy = False
+            if done.cancelled():
+                # dropped before it ran; send these windows again next block
+                self._vote_sent -= count
+                return
+            if not scores:
+                # fall back to the single five-second classification
+                self.vote = None
+                self.classifying = False
+                return
+            for probs in scores:
+                vote.add(probs)
+            label = vote.decision()
+            if label is None and vote.done:
+                label = vote.best()
+            if label is not None:
+                self.vote = None
+        self._ai_log(
+            f"Genre vote: {vote.windows} windows, leading '{vote.best()}'"
+            f" margin {vote.margin:.2f}"
+            + (f" -> '{label}'" if label is not None else "")
+        )
+        if label is not None:
+            self._commit_vote(vote, song_id, label)
+
+    def _commit_vote(self, vote: GenreVote, song_id: int, label: str) -> None:
+        """Apply the label a finished vote settled on."""
+        logger.info(
+            "VOTE   song_id=%s  label=%s  after %.2fs of audio",
+            song_id,
+            label,
+            self.clock() - self.buffer_start_time,
+        )
+        if self.genre_cache is not None:
+            snapshot = self.pre_song_buffer.snapshot(copy=True)
+            self._pending_fingerprint = (song_id, fingerprint(snapshot))
+        result: Future = Future()
+        result.set_result(label)
+        self._run_genre_classifier(
+            np.zeros(0, dtype=np.float32),
+            self.classifier_rate,
+            song_id,
+            result,
+            confidence=vote.posterior().get(label, 0.0),
+        )
+
+    def _quick_classify(self, now: float) -> None:
+        """Apply the timbre model's genre until the main model answers."""
+        timbre = getattr(self.detector, "timbre", None)
+        # wait for as much audio as the model's training windows held
+        blocks = self.quick_genre.window_blocks
+        if timbre is None or timbre.frames < blocks:
+            return
+        start = time.perf_counter()
+        label, confidence = self.quick_genre.predict(timbre.vector(blocks))
+        self.quick_time.record(time.perf_counter() - start)
+        self._quick_next = now + parameters.QUICK_GENRE_REFRESH
+        if confidence < parameters.QUICK_GENRE_MIN_CONFIDENCE or label == self.quick_label:
+            return
+        self.quick_label = label
+        scenario = self._scenario_from_label(label)
+        self._ai_log(
+            f"Provisional genre '{label}' ({confidence:.2f}) after"
+            f" {now - self.buffer_start_time:.3f}s -> Scenario: {scenario.name}"
         )
-        th = threading.Thread(
-            target=self._run_genre_classifier,
-            args=(samples, self.samplerate, sid),
-            daemon=True,
+        self._set_scenario(scenario)
+        if self.dashboard_enabled:
+            self.dashboard.set_genre(f"{label}?")
+
+    def _log_cache_lookup(self, hit: tuple[str, float, float] | None) -> None:
+        cache = self.genre_cache
+        stats = cache.lookup_time
+        summary = (
+            f"lookup p50 {stats.percentile(50) * 1e3:.2f} ms"
+            f" p99 {stats.percentile(99) * 1e3:.2f} ms,"
+            f" hit rate {cache.hit_rate:.0%} of {cache.hits + cache.misses}"
         )
-        th.start()
+        if hit is None:
+            self._ai_log(f"Genre cache miss ({summary})")
+        else:
+            label, confidence, score = hit
+            self._ai_log(
+                f"Genre cache hit: '{label}' confidence {confidence:.2f}"
+                f" match {score:.2f} ({summary})"
+            )
+
+    def _remember_genre(
+        self, song_id: int, label: str, confidence: float | None
+    ) -> None:
+        """Store the model's label for the fingerprint taken at launch."""
+        pending = self._pending_fingerprint
+        if self.genre_cache is None or pending is None or pending[0] != song_id:
+            return
+        self._pending_fingerprint = None
+        if label:
+            self.genre_cache.store(
+                pending[1], label, 1.0 if confidence is None else confidence
+            )
+
+    def _start_classifier_job(
+        self, samples: np.ndarray, sr: int, song_id: int
+    ) -> None:
+        """Run ``_run_genre_classifier`` off the audio thread."""
+        submit = getattr(self.genre_classifier, "submit", None)
+        if submit is not None:
+            # worker process: handle the label when its future resolves
+            future = submit(samples, sr)
+            self._track_genre_job(song_id, future)
+            future.add_done_callback(
+                lambda done: self._run_genre_classifier(samples, sr, song_id, done)
+            )
+            return
+        self.classifier_jobs.submit(
+            self._run_genre_classifier, samples, sr, song_id, key=song_id
+        )
+
+    def _track_genre_job(self, song_id: int, future: Future) -> None:
+        """Remember a worker future so a song change can cancel it."""
+        self._genre_futures = [
+            (sid, f) for sid, f in self._genre_futures if not f.done()
+        ]
+        self._genre_futures.append((song_id, future))
+
+    def _cancel_stale_jobs(self) -> None:
+        """Drop queued classification work for songs before ``song_id``."""
+        cancelled = self.classifier_jobs.cancel_stale(self.song_id)
+        cancelled += self.cache_jobs.cancel_stale(self.song_id)
+        keep = []
+        for sid, future in self._genre_futures:
+            if sid != self.song_id and future.cancel():
+                cancelled += 1
+            elif not future.done():
+                keep.append((sid, future))
+        self._genre_futures = keep
+        if cancelled:
+            logger.info("CANCEL %d stale genre job(s) before song_id=%s", cancelled, self.song_id)
+
+    def job_stats(self) -> Dict[str, float]:
+        """Queue wait, run time and cancellation counts of genre jobs.
+
+        A worker process schedules its own jobs and reports them; otherwise
+        they run on ``classifier_jobs``.
+        """
+        worker_stats = getattr(self.genre_classifier, "stats", None)
+        if worker_stats is not None:
+            return worker_stats()
+        return self.classifier_jobs.stats()
 
     @staticmethod
     def _scenario_from_label(label: str) -> Scenario:
@@ -524,23 +1050,32 @@ class BeatDMXShow:
         self._set_scenario(mapping.get(state, Scenario.INTERMISSION))
         if state == SongState.STARTING:
             self.song_id += 1
+            self._cancel_stale_jobs()
             self.buffering = True
-            self.buffer_start_time = time.time()
-            self.classify_after = time.time() + 5.0
+            self.buffer_start_time = self.clock()
+            self.classify_after = self.buffer_start_time + 5.0
             self.pre_song_buffer.clear()
+            self._quick_pending = self.quick_genre is not None
+            self.quick_label = ""
+            self._quick_next = 0.0
+            self._start_vote()
             self._ai_log("Scheduled genre classification in 5s.")
         elif state == SongState.ONGOING:
             if self.last_genre is None:
                 # remain in STARTING until genre detected
                 return
             self.buffering = True
-            self.buffer_start_time = time.time()
+            self.buffer_start_time = self.clock()
         elif state == SongState.ENDING:
             self.buffering = False
             self.classify_after = None
+            self._end_vote()
+            self._quick_pending = False
         else:
             self.buffering = False
             self.classify_after = None
+            self._quick_pending = False
+            self._end_vote()
         self.current_state = state
 
     def _handle_beat(self, bpm: float, now: float) -> None:
@@ -573,7 +1108,6 @@ class BeatDMXShow:
                     print("Smoke on", flush=True)
                 self._debug_log("Smoke on")
                 self.smoke.set_channel("fog", 255)
-                self.controller.update()
                 self.smoke_on = True
                 self.smoke_start = now
                 self.last_smoke_time = now
@@ -593,8 +1127,9 @@ class BeatDMXShow:
                 print("Smoke off", flush=True)
             self._debug_log("Smoke off")
             self.smoke.set_channel("fog", 0)
-            self.controller.update()
             self.smoke_on = False
+        if self.fades:
+            self._advance_fades(now)
 
     @staticmethod
     def _vu_to_level(vu: float) -> int:
@@ -610,7 +1145,7 @@ class BeatDMXShow:
 
     def _update_overhead_from_vu(self, _ctrl: DMX) -> None:
         """Set Overhead Effects dimmer based on the latest VU reading."""
-        now = time.time()
+        now = self.clock()
         end = self.beat_ends.get("Overhead Effects", 0.0)
         if now < end:
             return
@@ -636,21 +1171,49 @@ class BeatDMXShow:
 
 
     def _process_samples(self, samples: np.ndarray) -> None:
-        now = time.time()
-        beat, bpm, state_changed, vu = self.detector.process(samples, now)
+        now = self.clock()
+        result = self.detector.process(samples, now)
+        self._handle_result(samples, now, result)
+
+    def _process_batch(self, blocks: np.ndarray) -> None:
+        """Catch up on several queued blocks with one batched detector call.
+
+        Blocks are stamped as if they had arrived one block period apart,
+        ending now.  Each result is handled as it is yielded, while the
+        detector's hit and section flags still describe that block.
+        """
+        now = self.clock()
+        period = blocks.shape[1] / self.samplerate
+        times = now - period * np.arange(len(blocks) - 1, -1, -1)
+        results = self.detector.iter_blocks(blocks, times)
+        for block, t, result in zip(blocks, times, results):
+            self._handle_result(block, float(t), result)
+
+    def _handle_result(
+        self,
+        samples: np.ndarray,
+        now: float,
+        result: tuple[bool, float, bool, float],
+    ) -> None:
+        """Drive buffering, effects and the dashboard from one block's result."""
+        beat, bpm, state_changed, vu = result
         self.current_vu = vu
-        self.pre_song_buffer.extend(samples)
+        self.pre_song_buffer.write(self.resampler.process(samples))
+        if self._quick_pending and now >= self._quick_next:
+            self._quick_classify(now)
+        if self.vote is not None:
+            self._advance_vote()
         if self.buffering:
             total = len(self.pre_song_buffer)
             logger.debug(
                 "AUDIO   buffer %d frames (%.2fs)",
                 total,
-                total / self.samplerate,
+                total / self.classifier_rate,
             )
             if now - self.buffer_start_time >= 5.0:
                 self.buffering = False
             elif (
-                len(self.pre_song_buffer) >= self.pre_song_buffer.maxlen
+                self.pre_song_buffer.full
                 and not self.classifying
             ):
                 # Enough audio collected, start classification early
@@ -661,14 +1224,14 @@ class BeatDMXShow:
             self.genre_classifier is not None
             and self.current_state == SongState.ONGOING
             and not self.classifying
-            and len(self.pre_song_buffer) >= self.pre_song_buffer.maxlen
+            and self.pre_song_buffer.full
             and now - self.last_genre_check >= parameters.GENRE_CHECK_INTERVAL
         ):
             self._ai_log("Launching periodic genre classifier.")
             self._launch_genre_classifier_immediately()
         if (
             self.classify_after
-            and time.time() >= self.classify_after
+            and now >= self.classify_after
             and not self.classifying
         ):
             self._ai_log("Launching genre classifier after delay.")
@@ -713,19 +1276,99 @@ class BeatDMXShow:
             self._handle_beat(bpm, now)
 
         self._tick(now)
+        # one commit per block for everything the effects above changed
+        if self.controller:
+            self.controller.update()
+
+        level = getattr(self.detector, "degradation_level", 0)
+        if level != self.cpu_level:
+            self.cpu_level = level
+            decimated = self.detector.decimated_features()
+            self._debug_log(f"CPU level {level}, decimated: {decimated}")
+            if self.dashboard_enabled:
+                self.dashboard.set_degradation(level, decimated)
 
         self.current_vu = vu
         if self.dashboard_enabled:
             self.dashboard.set_vu(vu)
+            if (
+                hasattr(self.detector, "latency_report")
+                and now - self.last_latency_update >= 1.0
+            ):
+                self.last_latency_update = now
+                self.dashboard.set_latency(
+                    self.detector.latency_report(),
+                    self.detector.block_period,
+                    self.audio_ring.stats(),
+                )
+                self.dashboard.set_jobs(self.job_stats())
+                frame_stats = getattr(self.controller, "frame_stats", None)
+                if frame_stats is not None:
+                    self.dashboard.set_dmx(frame_stats.summary())
 
     def _process_audio_queue(self) -> None:
-        while self.running or not self.audio_queue.empty():
-            try:
-                samples = self.audio_queue.get(timeout=0.1)
-            except queue.Empty:
+        ring = self.audio_ring
+        while self.running or ring.depth:
+            blocks = ring.peek(self.max_batch)
+            if not len(blocks):
+                ring.wait(timeout=0.1)
                 continue
-            self._process_samples(samples)
-            self.audio_queue.task_done()
+            if len(blocks) == 1:
+                self._process_samples(blocks[0])
+            else:
+                self._process_batch(blocks)
+            ring.release(len(blocks))
+            if self.startup is not None and "first block" not in self.startup.marks:
+                self.first_block_seconds = self.startup.mark("first block")
+                self._report_startup()
+
+    def _report_startup(self) -> None:
+        report = self.startup.report()
+        self._debug_log(report)
+        if self.dashboard_enabled:
+            logger.info(report)
+        else:
+            self._flush_beat_line()
+            print(report, flush=True)
+
+    def _warm_detector(self) -> None:
+        if self.detector is None:
+            self._create_detector()
+        warm_up = getattr(self.detector, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
+
+    def _start_warm_ups(self, profile: StartupProfile) -> Future:
+        """Warm the detector and classifier in parallel; return the detector's."""
+        clf = self.genre_classifier
+        detector = profile.start_background("detector", self._warm_detector)
+        start_worker = getattr(clf, "start", None)
+        if start_worker is not None:
+            start_worker()  # loads and warms up the model in another process
+            classifier = profile.start_background("classifier", clf.wait_ready)
+        elif hasattr(clf, "warm_up"):
+            classifier = profile.start_background("classifier", clf.warm_up)
+        else:
+            return detector
+        classifier.add_done_callback(
+            lambda done: self._log_classifier_startup(
+                done, profile.background["classifier"]
+            )
+        )
+        return detector
+
+    def _log_classifier_startup(self, done: Future, seconds: float) -> None:
+        error = done.exception()
+        if error is None:
+            logger.info("Startup: classifier ready after %.2fs", seconds)
+            return
+        logger.error(
+            "Startup: classifier failed after %.2fs (%s); shows run without genres",
+            seconds,
+            error,
+        )
+        if self.dashboard_enabled:
+            self.dashboard.set_genre("(unavailable)")
 
     def audio_callback(self, indata, frames, time_info, status) -> None:
         if status:
@@ -736,68 +1379,86 @@ class BeatDMXShow:
             else:
                 print(msg, flush=True)
         samples = np.frombuffer(indata, dtype=np.float32)
-        try:
-            self.audio_queue.put_nowait(samples)
-        except queue.Full:
-            pass
+        self.audio_ring.push(samples)
 
-    def run(self) -> None:
-        if sd is None:  # pragma: no cover - skip when sounddevice unavailable
-            import sounddevice as sd_mod
+    def _create_detector(self, **kwargs) -> None:
+        from src.audio import BeatDetector
 
-            globals()["sd"] = sd_mod
-        if self.detector is None:
-            from src.audio import BeatDetector
-
-            self.detector = BeatDetector(
-                samplerate=self.samplerate,
-                amplitude_threshold=parameters.AMPLITUDE_THRESHOLD,
-                start_duration=parameters.START_DURATION,
-                end_duration=parameters.END_DURATION,
-                print_interval=parameters.PRINT_INTERVAL,
+        self.detector = BeatDetector(
+            samplerate=self.samplerate,
+            amplitude_threshold=parameters.AMPLITUDE_THRESHOLD,
+            start_duration=parameters.START_DURATION,
+            end_duration=parameters.END_DURATION,
+            print_interval=parameters.PRINT_INTERVAL,
+            start_time=self.clock(),
+            **kwargs,
+        )
+        self.current_state = self.detector.state
+
+    def _attach_controller(self, ctrl: DMX) -> None:
+        """Bind the DMX controller and apply the current scenario."""
+        self.controller = ctrl
+        self.groups = ctrl.groups
+        smoke_group = ctrl.groups.get("Smoke Machine")
+        self.smoke = smoke_group[0] if smoke_group else None
+        if self.dashboard_enabled:
+            if ctrl.serial.error:
+                self.dashboard.set_status(f"DMX Error, {ctrl.serial.error}")
+            else:
+                self.dashboard.set_status("DMX OK")
+        elif ctrl.serial.error:
+            print(f"Status: DMX Error, {ctrl.serial.error}", flush=True)
+        self._flush_beat_line()
+        if self.dashboard_enabled:
+            self.dashboard.set_state(self.current_state.value)
+            genre = (
+                ""
+                if self.current_state == SongState.INTERMISSION
+                else self._genre_label(self.last_genre)
+            )
+            self.dashboard.set_genre(genre)
+        else:
+            init_genre = (
+                self._genre_label(self.last_genre)
+                if self.current_state != SongState.INTERMISSION
+                else ""
             )
-            self.current_state = self.detector.state
+            print(f"Initial genre {init_genre}", flush=True)
+        self._print_state_change(self.scenario.updates)
+
+    def run(self) -> None:
+        profile = StartupProfile(_IMPORT_START)
+        profile.steps["imports"] = _IMPORT_SECONDS
+        self.startup = profile
+        detector_ready = self._start_warm_ups(profile)
+        with profile.step("sounddevice"):
+            import sounddevice as sd
         devices = parameters.DEVICES
-        with open(self.log_path, "a") as log, DMX(
-            devices,
-            port=parameters.COM_PORT,
-            fps=parameters.DMX_FPS,
-            pre_send=self._update_overhead_from_vu,
-        ) as ctrl, sd.InputStream(
-            channels=1,
-            callback=self.audio_callback,
-            samplerate=self.samplerate,
-            blocksize=512,
-        ):
-            self.log_file = log
-            self.controller = ctrl
-            self.groups = ctrl.groups
-            smoke_group = ctrl.groups.get("Smoke Machine")
-            self.smoke = smoke_group[0] if smoke_group else None
-            if self.dashboard_enabled:
-                if ctrl.serial.error:
-                    self.dashboard.set_status(f"DMX Error, {ctrl.serial.error}")
-                else:
-                    self.dashboard.set_status("DMX OK")
-            elif ctrl.serial.error:
-                print(f"Status: DMX Error, {ctrl.serial.error}", flush=True)
-            self._flush_beat_line()
-            if self.dashboard_enabled:
-                self.dashboard.set_state(self.current_state.value)
-                genre = (
-                    ""
-                    if self.current_state == SongState.INTERMISSION
-                    else self._genre_label(self.last_genre)
+        with ExitStack() as stack:
+            log = stack.enter_context(open(self.log_path, "a"))
+            with profile.step("dmx"):
+                ctrl = stack.enter_context(
+                    DMX(
+                        devices,
+                        port=parameters.COM_PORT,
+                        fps=parameters.DMX_FPS,
+                        pre_send=self._update_overhead_from_vu,
+                        policy=parameters.DMX_SCHEDULE_POLICY,
+                    )
                 )
-                self.dashboard.set_genre(genre)
-            else:
-                init_genre = (
-                    self._genre_label(self.last_genre)
-                    if self.current_state != SongState.INTERMISSION
-                    else ""
+            with profile.step("detector wait"):
+                detector_ready.result()
+            with profile.step("audio stream"):
+                stack.enter_context(
+                    sd.InputStream(
+                        channels=1,
+                        callback=self.audio_callback,
+                        samplerate=self.samplerate,
+                        blocksize=512,
+                    )
                 )
-                print(f"Initial genre {init_genre}", flush=True)
-            self._print_state_change(self.scenario.updates)
+            self.log_file = log
+            self._attach_controller(ctrl)
             self._flush_beat_line()
             self.running = True
             worker = threading.Thread(target=self._process_audio_queue, daemon=True)
@@ -814,9 +1475,17 @@ class BeatDMXShow:
             finally:
                 self.running = False
                 worker.join()
+                logger.info("DMX frames: %s", ctrl.frame_stats.summary())
+        close_worker = getattr(self.genre_classifier, "close", None)
+        if close_worker is not None:
+            close_worker()
+        logger.info("Genre jobs: %s", self.job_stats())
         self.log_file = None
 
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
 def main() -> None:
     show = BeatDMXShow()
     show.run()
@@ -47,6 +47,42 @@ COM_PORT = "COM4"
 # How many DMX frames to send per second
 DMX_FPS = 60
 
+# What the DMX sender does after a frame overruns its slot: "skip" drops the
+# missed frames, "catch_up" sends them back to back (see src/dmx/dmx.py)
+DMX_SCHEDULE_POLICY = "skip"
+
+# Run the genre model in a separate, pre-warmed process instead of a thread
+GENRE_WORKER_PROCESS = True
+
+# Genre model inference backend: "onnx" (int8 graph on onnxruntime, see
+# ``python -m src.audio.genre_backends export``), "torch" (model called
+# directly), "pipeline" or "auto"
+GENRE_BACKEND = "auto"
+# Intra-op threads for the onnx/torch backends; 0 keeps the library default
+GENRE_THREADS = 0
+
+# Fingerprint cache of genre labels for songs heard before
+GENRE_CACHE_FILE = "genre_cache.npz"
+GENRE_CACHE_SIZE = 500
+# Model scores below this are stored but never served from the cache
+GENRE_CACHE_MIN_CONFIDENCE = 0.5
+
+# Incremental genre voting at song start: windows of GENRE_VOTE_WINDOW
+# seconds every GENRE_VOTE_HOP seconds are scored as they arrive and the
+# genre is committed once its mean probability leads by GENRE_VOTE_MARGIN
+GENRE_VOTE_WINDOW = 1.5
+GENRE_VOTE_HOP = 0.75
+GENRE_VOTE_MARGIN = 0.3
+GENRE_VOTE_MIN_WINDOWS = 2
+
+# Provisional genre from timbre statistics while the main model runs (train
+# with ``python -m src.audio.quick_genre train``).  The first guess comes
+# once a song has played as long as the model's training windows (50 ms by
+# default, ``--seconds``) and is refreshed every QUICK_GENRE_REFRESH seconds;
+# guesses below QUICK_GENRE_MIN_CONFIDENCE are ignored
+QUICK_GENRE_REFRESH = 0.5
+QUICK_GENRE_MIN_CONFIDENCE = 0.4
+
 # Seconds between automatic genre classification checks
 GENRE_CHECK_INTERVAL = 15.0
 
@@ -0,0 +1,210 @@
+"""Deterministic replay of a recorded set through ``BeatDMXShow``.
+
+Feeds an audio file through ``BeatDMXShow._process_samples`` block by block on
+a virtual clock and drives the DMX pre-send hook on simulated frame ticks, as
+fast as the CPU allows.  Every run over the same file, tuning and genre source
+produces the same DMX frame stream; the SHA-256 digest of that stream is
+printed so runs can be compared.
+
+```bash
+python replay.py set.flac --genre rock
+python replay.py set.flac --model   # use the real genre classifier
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import os
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import parameters
+from main import BeatDMXShow, DMX
+
+BLOCK_SIZE = 512
+
+
+class VirtualClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def set(self, now: float) -> None:
+        self.now = now
+
+
+class FixedGenre:
+    """Stand-in classifier that always returns the same label."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+
+    def classify(self, samples: np.ndarray, samplerate: int) -> str:
+        return self.label
+
+
+class ReplayShow(BeatDMXShow):
+    """Show variant that runs genre classification inline for determinism."""
+
+    def _start_classifier_job(
+        self, samples: np.ndarray, sr: int, song_id: int
+    ) -> None:
+        self._run_genre_classifier(samples, sr, song_id)
+
+    def _start_cache_lookup(
+        self,
+        samples: np.ndarray,
+        song_id: int,
+        on_miss: Callable[[], None] | None = None,
+    ) -> None:
+        done: Future = Future()
+        done.set_result(self._cache_lookup(samples))
+        self._on_cache_lookup(done, samples, song_id, on_miss)
+
+    def _submit_windows(self, windows: np.ndarray, song_id: int) -> None:
+        done: Future = Future()
+        done.set_result(self.genre_classifier.score_windows(windows, self.classifier_rate))
+        self._on_window_scores(done, song_id)
+
+
+@dataclass
+class ReplayResult:
+    blocks: int
+    frames: int
+    audio_seconds: float
+    wall_seconds: float
+    digest: str
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks / max(self.wall_seconds, 1e-9)
+
+
+def replay(
+    blocks: np.ndarray,
+    samplerate: int = parameters.SAMPLERATE,
+    *,
+    genre_model: object | None = None,
+    fps: float = parameters.DMX_FPS,
+    tuning_file: Path | None = None,
+    on_frame: Callable[[bytes], None] | None = None,
+    debug_log_path: str = os.devnull,
+) -> ReplayResult:
+    """Replay ``(n_blocks, 512)`` audio through a fresh show.
+
+    ``on_frame`` receives every simulated DMX frame.  Tuning is read from
+    ``tuning_file`` (defaults when ``None``) and never written back.  The
+    per-block debug log is discarded unless ``debug_log_path`` is given.  The
+    detector's CPU governor is off so results do not depend on machine load.
+    """
+    clock = VirtualClock()
+    show = ReplayShow(
+        samplerate=samplerate,
+        dashboard=False,
+        genre_model=genre_model,
+        clock=clock,
+        debug_log_path=debug_log_path,
+    )
+    show._create_detector(
+        tuning_file=tuning_file, persist_tuning=False, governor=False
+    )
+    ctrl = DMX(parameters.DEVICES, port=parameters.COM_PORT, fps=fps)
+    show._attach_controller(ctrl)
+    ctrl.update()
+
+    digest = hashlib.sha256()
+    frame_period = 1.0 / fps
+    block_period = BLOCK_SIZE / samplerate
+    next_frame = 0.0
+    frames = 0
+    start = time.perf_counter()
+    for index, block in enumerate(blocks):
+        now = index * block_period
+        clock.set(now)
+        show._process_samples(block)
+        end = now + block_period
+        while next_frame < end:
+            clock.set(next_frame)
+            show._update_overhead_from_vu(ctrl)
+            ctrl.update()
+            data = ctrl.universe.data
+            digest.update(data)
+            if on_frame is not None:
+                on_frame(bytes(data))
+            frames += 1
+            next_frame = frames * frame_period
+    wall = time.perf_counter() - start
+    return ReplayResult(
+        blocks=len(blocks),
+        frames=frames,
+        audio_seconds=len(blocks) * block_period,
+        wall_seconds=wall,
+        digest=digest.hexdigest(),
+    )
+
+
+def load_blocks(path: str | Path) -> tuple[np.ndarray, int]:
+    """Read an audio file as mono float32 ``(n_blocks, 512)`` blocks."""
+    import soundfile as sf
+
+    data, samplerate = sf.read(str(path), dtype="float32", always_2d=True)
+    mono = np.ascontiguousarray(data.mean(axis=1), dtype=np.float32)
+    n_blocks = len(mono) // BLOCK_SIZE
+    return mono[: n_blocks * BLOCK_SIZE].reshape(n_blocks, BLOCK_SIZE), samplerate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recording through the show")
+    parser.add_argument("path", type=Path, help="WAV/FLAC recording")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--genre", default="pop", help="Fixed genre label returned for every song"
+    )
+    source.add_argument(
+        "--model", action="store_true", help="Use the real genre classifier"
+    )
+    parser.add_argument("--fps", type=float, default=parameters.DMX_FPS)
+    parser.add_argument(
+        "--tuning", type=Path, default=None, help="Tuning JSON (defaults if omitted)"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Keep the show's console output"
+    )
+    args = parser.parse_args()
+
+    blocks, samplerate = load_blocks(args.path)
+    if args.model:
+        from src.audio import GenreClassifier
+
+        model = GenreClassifier()
+    else:
+        model = FixedGenre(args.genre)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(
+        open(os.devnull, "w")
+    )
+    with quiet:
+        result = replay(
+            blocks, samplerate, genre_model=model, fps=args.fps, tuning_file=args.tuning
+        )
+    print(
+        f"{result.blocks} blocks ({result.audio_seconds:.1f}s audio) in "
+        f"{result.wall_seconds:.2f}s: {result.blocks_per_second:.0f} blocks/s, "
+        f"{result.audio_seconds / max(result.wall_seconds, 1e-9):.0f}x realtime"
+    )
+    print(f"{result.frames} DMX frames, sha256 {result.digest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,9 @@
 This module lazily imports heavier dependencies so tests that only rely on
 ``DebouncedFlag`` do not require audio libraries like PortAudio.  Accessing any
 of the exported classes will load the appropriate module on first use.  A
-lightweight ``SongState`` enum is defined here so importing it does not pull in
-the full beat detection stack.
+lightweight ``SongState`` enum is defined here, and shared by
+``beat_detection``, so importing it does not pull in the full beat detection
+stack.
 """
 
 from enum import Enum
@@ -21,10 +22,10 @@ __all__ = ["BeatDetector", "SongState", "DebouncedFlag", "GenreClassifier"]
 
 
 def __getattr__(name: str):
-    if name in {"BeatDetector", "SongState"}:
-        from .beat_detection import BeatDetector, SongState
-        globals().update({"BeatDetector": BeatDetector, "SongState": SongState})
-        return globals()[name]
+    if name == "BeatDetector":
+        from .beat_detection import BeatDetector
+        globals()["BeatDetector"] = BeatDetector
+        return BeatDetector
     if name == "DebouncedFlag":
         from .debounce import DebouncedFlag
         globals()["DebouncedFlag"] = DebouncedFlag
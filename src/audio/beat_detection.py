@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import time
-from enum import Enum
-from typing import Tuple
+from typing import Iterator, Tuple
 import json
 from pathlib import Path
 
 import numpy as np
-import sounddevice as sd
 import aubio
-import librosa
+from . import SongState
 from .debounce import DebouncedFlag
+from .features import SpectralFrame
+from .governor import CpuGovernor
+from .metrics import LatencyHistogram
+from .persist import AsyncWriter
+from .tempo import TempoTracker
+from .timbre import TimbreStats
 from parameters import Scenario
 
 DEFAULT_TUNING = {
@@ -26,15 +30,19 @@ DEFAULT_TUNING = {
 
 TUNING_FILE = Path("tuning.json")
 
-
-class SongState(Enum):
-    """Simple states derived from audio volume."""
-
-    INTERMISSION = "Intermission"
-    STARTING = "Starting"
-    ONGOING = "Ongoing"
-    ENDING = "Ending"
-
+# Stages timed inside ``BeatDetector.process``; "spectrum" is the shared FFT
+# with RMS and flatness, "timbre" the MFCC statistics, "total" the whole call.
+STAGES = (
+    "spectrum",
+    "timbre",
+    "hpss",
+    "onset",
+    "centroid",
+    "tempo",
+    "state",
+    "tuning",
+    "total",
+)
 
 
 _SCENARIO_TO_STATE = {
@@ -81,17 +89,42 @@ class BeatDetector:
         print_interval: float = 10.0,
         chorus_debounce: float = 0.375,
         crescendo_debounce: float = 0.375,
+        *,
+        tuning_file: Path | None = TUNING_FILE,
+        persist_tuning: bool = True,
+        start_time: float | None = None,
+        governor: bool = True,
     ) -> None:
+        """Create the detector.
+
+        ``tuning_file`` selects where learned thresholds are loaded from
+        (``None`` uses the defaults) and ``persist_tuning`` controls whether
+        adjusted values are written back.  ``start_time`` sets the initial
+        clock reading for callers that do not use wall-clock time.  With
+        ``governor`` enabled, ``process`` runs HPSS, and then the timbre
+        statistics, less often when blocks take too long; pass ``False`` for
+        reproducible results independent of CPU load.
+        """
+        if start_time is None:
+            start_time = time.time()
         self.samplerate = samplerate
         self.tempo = aubio.tempo("default", 1024, 512, samplerate)
         self.onset = aubio.onset("default", 1024, 512, samplerate)
-        self.beat_times: list[float] = []
+        self.features = SpectralFrame(512, samplerate)
+        # timbre of the song start, restarted whenever a song starts and fed
+        # only while it is starting
+        self.timbre = TimbreStats(512, samplerate)
+        self.beats = TempoTracker(window=60.0, recent=8)
+        self.block_period = 512 / samplerate
+        self.timings = {stage: LatencyHistogram() for stage in STAGES}
+        self.governor = CpuGovernor(self.block_period) if governor else None
+        self.last_centroid = 0.0
         self.amplitude_threshold = amplitude_threshold
         self.start_duration = start_duration
         self.end_duration = end_duration
         self.print_interval = print_interval
         self.state: SongState = SongState.INTERMISSION
-        self.state_change_time = time.time()
+        self.state_change_time = start_time
         self.last_loud_time = 0.0
         self.last_print = 0.0
         self.last_amplitude = 0.0
@@ -104,10 +137,15 @@ class BeatDetector:
         self.chorus_flag = DebouncedFlag(chorus_debounce)
         self.crescendo_flag = DebouncedFlag(crescendo_debounce)
 
+        self.tuning_file = tuning_file
+        self.persist_tuning = persist_tuning
+        # tuning is written from a background thread so process() never
+        # waits on the disk
+        self.tuning_writer = AsyncWriter(on_error=self._tuning_write_failed)
         self.tuning = DEFAULT_TUNING.copy()
-        if TUNING_FILE.exists():
+        if tuning_file is not None and tuning_file.exists():
             try:
-                self.tuning.update(json.loads(TUNING_FILE.read_text()))
+                self.tuning.update(json.loads(tuning_file.read_text()))
             except Exception as exc:  # pragma: no cover - configuration load issue
                 print(f"Failed to load tuning: {exc}", flush=True)
 
@@ -118,7 +156,7 @@ class BeatDetector:
         self.drum_ratio = self.tuning["drum_ratio"]
         self.crescendo_mult = self.tuning["crescendo_mult"]
 
-        self.last_adjust_time = time.time()
+        self.last_adjust_time = start_time
         self.counts = {
             "chorus": 0,
             "crescendo": 0,
@@ -129,6 +167,8 @@ class BeatDetector:
         }
 
     def _save_tuning(self) -> None:
+        if not self.persist_tuning or self.tuning_file is None:
+            return
         data = {
             "snare_centroid": self.snare_centroid,
             "kick_centroid": self.kick_centroid,
@@ -137,10 +177,11 @@ class BeatDetector:
             "drum_ratio": self.drum_ratio,
             "crescendo_mult": self.crescendo_mult,
         }
-        try:
-            TUNING_FILE.write_text(json.dumps(data))
-        except Exception as exc:  # pragma: no cover - disk issues
-            print(f"Failed to save tuning: {exc}", flush=True)
+        self.tuning_writer.submit(self.tuning_file, json.dumps(data))
+
+    @staticmethod
+    def _tuning_write_failed(path: Path, exc: Exception) -> None:  # pragma: no cover
+        print(f"Failed to save tuning: {exc}", flush=True)
 
     def _adjust_tuning(self, now: float, bpm: float) -> None:
         if now - self.last_adjust_time < 30:
@@ -193,22 +234,20 @@ class BeatDetector:
             return False
         self.state = new_state
         self.state_change_time = now
+        if new_state == SongState.STARTING:
+            self.timbre.reset()
         return True
 
     # ------------------------------------------------------------------
     def _compute_bpm(self) -> float:
-        if len(self.beat_times) < 4:
+        if len(self.beats) < 4:
             return 0.0
-        recent = self.beat_times[-8:]
-        intervals = np.diff(recent)
-        if len(intervals) == 0:
-            return 0.0
-        median = float(np.median(intervals))
+        median, std = self.beats.interval_stats()
         if median <= 0:
             return 0.0
         bpm = 60.0 / median
         if bpm > 120:
-            if np.std(intervals) > median * 0.2 or self.last_amplitude < 0.1:
+            if std > median * 0.2 or self.last_amplitude < 0.1:
                 bpm /= 2.0
         return bpm
 
@@ -222,23 +261,131 @@ class BeatDetector:
         """
         if now is None:
             now = time.time()
+        timings = self.timings
+        start = time.perf_counter()
+        # Feature extraction for section detection; every feature below is
+        # derived from one shared spectrum of the block
+        features = self.features
+        features.transform(samples)
         amplitude = float(np.sqrt(np.mean(np.square(samples))))
+        mark = time.perf_counter()
+        timings["spectrum"].record(mark - start)
+        governor = self.governor
+        # the timbre statistics only serve the quick genre guess at song start
+        if self.state == SongState.STARTING and (
+            governor is None or governor.should_run("timbre")
+        ):
+            self.timbre.update(features.power)
+            now_pc = time.perf_counter()
+            timings["timbre"].record(now_pc - mark)
+            mark = now_pc
+        if governor is None or governor.should_run("hpss"):
+            features.separate()
+            timings["hpss"].record(time.perf_counter() - mark)
+        # otherwise the previous block's harmonic/percussive energies stand
+        result = self._update(
+            samples,
+            now,
+            amplitude,
+            features.rms,
+            features.flatness,
+            features.percussive_energy,
+            features.harmonic_energy,
+        )
+        elapsed = time.perf_counter() - start
+        timings["total"].record(elapsed)
+        if governor is not None:
+            governor.update(elapsed)
+        return result
+
+    @property
+    def degradation_level(self) -> int:
+        """Current governor level; 0 means every feature runs every block."""
+        return self.governor.level if self.governor is not None else 0
+
+    def decimated_features(self) -> dict[str, int]:
+        """Return ``{feature: interval}`` for features currently decimated."""
+        return self.governor.decimated() if self.governor is not None else {}
+
+    def process_blocks(
+        self, blocks: np.ndarray, times: np.ndarray
+    ) -> list[Tuple[bool, float, bool, float]]:
+        """Process a ``(n_blocks, block_size)`` array in one batch.
+
+        Returns one ``process`` result per block.
+        """
+        return list(self.iter_blocks(blocks, times))
+
+    def iter_blocks(
+        self, blocks: np.ndarray, times: np.ndarray
+    ) -> Iterator[Tuple[bool, float, bool, float]]:
+        """Yield ``process`` results for a batch of blocks.
+
+        Spectral features are computed for all blocks at once; the onset and
+        tempo trackers and the state machine then run block by block exactly
+        as in ``process``.  Detector attributes such as ``is_chorus`` reflect
+        each block when its result is yielded.
+
+        Batches are what the show falls back to when it lags, so the governor
+        sees them too: HPSS and the timbre statistics run only for the blocks
+        they would run for in ``process``, and each block's share of the
+        batch cost is recorded.
+        """
+        n = len(blocks)
+        if not n:
+            return
+        governor = self.governor
+        separate = None
+        if governor is not None:
+            separate = np.array([governor.should_run("hpss") for _ in range(n)])
+        start = time.perf_counter()
+        feats = self.features.analyze_blocks(blocks, separate)
+        amplitudes = np.sqrt(np.mean(np.square(blocks), axis=1))
+        # batched features are not split by stage; spread evenly per block
+        shared = (time.perf_counter() - start) / n
+        self.timings["spectrum"].record(shared, n)
+        for i in range(n):
+            block_start = time.perf_counter()
+            if self.state == SongState.STARTING and (
+                governor is None or governor.should_run("timbre")
+            ):
+                self.timbre.update(feats.power[i])
+                self.timings["timbre"].record(time.perf_counter() - block_start)
+            result = self._update(
+                blocks[i],
+                float(times[i]),
+                float(amplitudes[i]),
+                float(feats.rms[i]),
+                float(feats.flatness[i]),
+                float(feats.percussive_energy[i]),
+                float(feats.harmonic_energy[i]),
+                float(feats.centroid[i]),
+            )
+            elapsed = shared + time.perf_counter() - block_start
+            self.timings["total"].record(elapsed)
+            if governor is not None:
+                governor.update(elapsed)
+            yield result
+
+    def _update(
+        self,
+        samples: np.ndarray,
+        now: float,
+        amplitude: float,
+        rms: float,
+        flatness: float,
+        perc_energy: float,
+        harm_energy: float,
+        centroid: float | None = None,
+    ) -> Tuple[bool, float, bool, float]:
+        """Advance detection state for one block given its features."""
+        timings = self.timings
         self.last_amplitude = amplitude
         loud = amplitude > self.amplitude_threshold
         state_changed = False
         if loud:
             self.last_loud_time = now
 
-        # Feature extraction for section detection
-        n_fft = min(1024, len(samples))
-        rms = float(
-            librosa.feature.rms(
-                y=samples, frame_length=n_fft, hop_length=n_fft // 2
-            ).mean()
-        )
-        flatness = float(
-            librosa.feature.spectral_flatness(y=samples, n_fft=n_fft).mean()
-        )
         chorus_raw = rms > self.chorus_rms and flatness < self.chorus_flatness
         crescendo_raw = rms > self.previous_rms * self.crescendo_mult
         self.is_chorus = self.chorus_flag.update(chorus_raw, now)
@@ -249,10 +396,6 @@ class BeatDetector:
             self.counts["crescendo"] += 1
         self.previous_rms = rms
 
-        S = librosa.stft(samples, n_fft=n_fft, hop_length=n_fft // 2)
-        y_harm, y_perc = librosa.decompose.hpss(S)
-        perc_energy = float(np.sum(np.abs(y_perc) ** 2))
-        harm_energy = float(np.sum(np.abs(y_harm) ** 2))
         self.is_drum_solo = perc_energy > self.drum_ratio * harm_energy
         if self.is_drum_solo:
             self.counts["drum_solo"] += 1
@@ -261,13 +404,20 @@ class BeatDetector:
         self.snare_hit = False
         self.kick_hit = False
         onset_detected = False
-        if self.onset(samples):
+        mark = time.perf_counter()
+        is_onset = self.onset(samples)
+        now_pc = time.perf_counter()
+        timings["onset"].record(now_pc - mark)
+        if is_onset:
             onset_detected = True
-            centroid = float(
-                librosa.feature.spectral_centroid(
-                    y=samples, sr=self.samplerate, n_fft=n_fft
-                ).mean()
-            )
+            if centroid is None:
+                # always this block's centroid: hits are never judged on a
+                # stale one
+                centroid = self.features.centroid()
+                mark = now_pc
+                now_pc = time.perf_counter()
+                timings["centroid"].record(now_pc - mark)
+            self.last_centroid = centroid
             if centroid > self.snare_centroid:
                 self.snare_hit = True
             elif centroid < self.kick_centroid:
@@ -280,6 +430,7 @@ class BeatDetector:
             self.counts["kick"] += 1
 
         # song state machine
+        mark = time.perf_counter()
         if self.state == SongState.INTERMISSION and loud:
             state_changed |= self._set_state(SongState.STARTING, now)
         elif self.state == SongState.STARTING:
@@ -300,21 +451,57 @@ class BeatDetector:
                 state_changed |= self._set_state(SongState.STARTING, now)
             elif now - self.state_change_time >= self.end_duration:
                 state_changed |= self._set_state(SongState.INTERMISSION, now)
+        now_pc = time.perf_counter()
+        timings["state"].record(now_pc - mark)
 
         beat = False
         bpm = 0.0
+        mark = now_pc
         if self.tempo(samples):
             beat = True
-            self.beat_times.append(now)
+            self.beats.add_beat(now)
             bpm = self._compute_bpm()
             if bpm and now - self.last_print >= self.print_interval:
                 print(f"Estimated BPM: {bpm:.2f}", flush=True)
                 self.last_print = now
 
-        self.beat_times = [t for t in self.beat_times if now - t <= 60]
+        self.beats.expire(now)
+        now_pc = time.perf_counter()
+        timings["tempo"].record(now_pc - mark)
         self._adjust_tuning(now, bpm)
+        timings["tuning"].record(time.perf_counter() - now_pc)
         return beat, bpm, state_changed, amplitude
 
+    def warm_up(self) -> None:
+        """Run a silent block through every analysis stage on scratch objects.
+
+        The first FFT, median filter and aubio call allocate and initialise
+        lazily; doing that before the stream opens keeps it off the first
+        real block.  The spectral frame, timbre stats and aubio trackers used
+        here are thrown away, so the detector's HPSS history, onset and tempo
+        state, flags and timings are exactly as constructed.
+        """
+        silent = np.zeros(512, dtype=np.float32)
+        features = SpectralFrame(512, self.samplerate)
+        features.transform(silent)
+        features.separate()
+        features.centroid()
+        TimbreStats(512, self.samplerate).update(features.power)
+        aubio.onset("default", 1024, 512, self.samplerate)(silent)
+        aubio.tempo("default", 1024, 512, self.samplerate)(silent)
+
+    def latency_report(self) -> dict[str, dict[str, float]]:
+        """Return per-stage latency summaries in milliseconds.
+
+        Each entry has ``count``, ``mean_ms``, ``p50_ms``, ``p99_ms`` and
+        ``max_ms``; compare them with ``block_period`` (11.6 ms at 44.1 kHz).
+        ``tuning_write`` covers background tuning saves, which run off the
+        audio thread.
+        """
+        report = {stage: hist.summary() for stage, hist in self.timings.items()}
+        report["tuning_write"] = self.tuning_writer.latency.summary()
+        return report
+
     # ------------------------------------------------------------------
     def audio_callback(self, indata, frames, time_info, status):
         if status:
@@ -324,6 +511,8 @@ class BeatDetector:
 
     def run(self) -> None:
         """Run beat detection using the default input device."""
+        import sounddevice as sd
+
         with sd.InputStream(
             channels=1,
             callback=self.audio_callback,
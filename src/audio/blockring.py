@@ -0,0 +1,107 @@
+"""Single-producer/single-consumer ring of fixed-size audio blocks."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+
+class BlockRing:
+    """Hand audio blocks from the PortAudio callback to a worker thread.
+
+    Blocks live in a preallocated ``(capacity, block_size)`` float32 pool.
+    The producer only advances ``_head`` and the consumer only advances
+    ``_tail``; each index is written by one thread and read by the other, so
+    no lock is needed under the GIL.  The consumer ``peek``s a contiguous run
+    of pending blocks, processes it in place and then ``release``s it, which
+    keeps the producer from overwriting blocks still being read.  ``push``
+    sets an event so an idle consumer can block in ``wait`` instead of
+    polling.
+
+    Counters: ``depth`` (pending blocks), ``max_depth``, ``drops`` (blocks
+    rejected because the ring was full), ``batches`` (runs handed to the
+    consumer) and ``coalesced`` (runs holding more than one block).
+    """
+
+    def __init__(self, capacity: int = 32, block_size: int = 512) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.block_size = block_size
+        self._pool = np.zeros((capacity, block_size), dtype=np.float32)
+        self._head = 0  # total blocks written, producer only
+        self._tail = 0  # total blocks released, consumer only
+        self.drops = 0
+        self.max_depth = 0
+        self.batches = 0
+        self.coalesced = 0
+        self._ready = threading.Event()
+
+    @property
+    def depth(self) -> int:
+        return self._head - self._tail
+
+    def push(self, samples: np.ndarray) -> bool:
+        """Copy one block into the ring; return ``False`` if it was dropped.
+
+        Shorter blocks are zero padded and longer ones truncated to
+        ``block_size``.
+        """
+        head = self._head
+        depth = head - self._tail
+        if depth >= self.capacity:
+            self.drops += 1
+            return False
+        slot = self._pool[head % self.capacity]
+        n = min(len(samples), self.block_size)
+        slot[:n] = samples[:n]
+        if n < self.block_size:
+            slot[n:] = 0.0
+        self._head = head + 1
+        self._ready.set()
+        if depth + 1 > self.max_depth:
+            self.max_depth = depth + 1
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until a block is pending; return ``False`` on timeout."""
+        if self._head != self._tail:
+            return True
+        self._ready.clear()
+        # a push between the check and the clear would otherwise be missed
+        if self._head != self._tail:
+            return True
+        return self._ready.wait(timeout)
+
+    def peek(self, max_blocks: int | None = None) -> np.ndarray:
+        """Return a ``(n, block_size)`` view of the oldest pending blocks.
+
+        The run stops at the end of the pool, so a wrapped backlog takes two
+        calls.  The view stays valid until ``release`` is called.
+        """
+        tail = self._tail
+        n = self._head - tail
+        if n <= 0:
+            return self._pool[:0]
+        start = tail % self.capacity
+        n = min(n, self.capacity - start)
+        if max_blocks is not None:
+            n = min(n, max_blocks)
+        self.batches += 1
+        if n > 1:
+            self.coalesced += 1
+        return self._pool[start : start + n]
+
+    def release(self, count: int) -> None:
+        """Mark ``count`` blocks returned by ``peek`` as consumed."""
+        self._tail += count
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "drops": self.drops,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+        }
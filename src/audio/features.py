@@ -0,0 +1,202 @@
+"""Per-block spectral features computed from a single shared FFT."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .hpss import StreamingHPSS
+
+# Floor applied to power values before taking logs, as in librosa.
+_AMIN = 1e-10
+
+
+class BlockFeatures(NamedTuple):
+    """Per-block feature arrays returned by ``SpectralFrame.analyze_blocks``."""
+
+    rms: np.ndarray
+    flatness: np.ndarray
+    percussive_energy: np.ndarray
+    harmonic_energy: np.ndarray
+    centroid: np.ndarray
+    power: np.ndarray
+
+
+class SpectralFrame:
+    """Compute loudness and timbre features from one windowed spectrum.
+
+    ``BeatDetector`` used to call several librosa helpers per block, each of
+    which ran its own STFT.  ``analyze`` computes a single Hann-windowed
+    magnitude spectrum per block and derives RMS, spectral flatness,
+    percussive/harmonic energy (via ``StreamingHPSS``) and, on demand, the
+    spectral centroid from it.
+    The window, frequency bins and all intermediate arrays are allocated once
+    and reused for every block.
+    """
+
+    def __init__(
+        self,
+        n_fft: int = 512,
+        samplerate: int = 44100,
+        percussive_kernel: int = 31,
+        harmonic_frames: int = 31,
+    ) -> None:
+        self.samplerate = samplerate
+        self.percussive_kernel = percussive_kernel
+        self.harmonic_frames = harmonic_frames
+        self.rms = 0.0
+        self.flatness = 0.0
+        self.percussive_energy = 0.0
+        self.harmonic_energy = 0.0
+        self._allocate(n_fft)
+
+    def _allocate(self, n_fft: int) -> None:
+        self.n_fft = n_fft
+        n_bins = n_fft // 2 + 1
+        # periodic Hann window matches librosa's default STFT window
+        self.window = (
+            0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)
+        ).astype(np.float32)
+        self.frequencies = np.fft.rfftfreq(n_fft, 1.0 / self.samplerate)
+        self._window_power = float(np.sum(self.window.astype(np.float64) ** 2))
+        # one-sided spectrum weights so Parseval's theorem holds for rfft bins
+        self._bin_weights = np.full(n_bins, 2.0)
+        self._bin_weights[0] = 1.0
+        if n_fft % 2 == 0:
+            self._bin_weights[-1] = 1.0
+        self._frame = np.zeros(n_fft, dtype=np.float32)
+        self.magnitude = np.zeros(n_bins, dtype=np.float64)
+        self.power = np.zeros(n_bins, dtype=np.float64)
+        self._scratch = np.zeros(n_bins, dtype=np.float64)
+        self._mask_h = np.zeros(n_bins, dtype=np.float64)
+        self._mask_p = np.zeros(n_bins, dtype=np.float64)
+        self.hpss = StreamingHPSS(
+            n_bins, self.harmonic_frames, self.percussive_kernel
+        )
+
+    # ------------------------------------------------------------------
+    def analyze(self, samples: np.ndarray) -> None:
+        """Update all block features from ``samples``."""
+        self.transform(samples)
+        self.separate()
+
+    def transform(self, samples: np.ndarray) -> None:
+        """Compute the block spectrum, RMS and flatness."""
+        if len(samples) != self.n_fft:
+            # block size changed; resize buffers once for the new size
+            self._allocate(len(samples))
+        np.multiply(samples, self.window, out=self._frame)
+        np.abs(np.fft.rfft(self._frame), out=self.magnitude)
+        np.square(self.magnitude, out=self.power)
+
+        # RMS via Parseval, compensating for the energy removed by the window
+        energy = float(np.dot(self._bin_weights, self.power))
+        self.rms = float(np.sqrt(energy / (self.n_fft * self._window_power)))
+
+        # Spectral flatness: geometric over arithmetic mean of the power
+        np.maximum(self.power, _AMIN, out=self._scratch)
+        amean = float(self._scratch.mean())
+        np.log(self._scratch, out=self._scratch)
+        self.flatness = float(np.exp(self._scratch.mean()) / amean)
+
+    def separate(self) -> None:
+        """Split the magnitude into percussive and harmonic energy.
+
+        The streaming separator keeps the last ``harmonic_frames`` spectra so
+        the harmonic estimate has real temporal context; the two estimates are
+        combined with soft Wiener masks.
+        """
+        self.hpss.update(self.magnitude)
+        self._apply_masks(self.hpss.harmonic, self.hpss.percussive)
+
+    def _apply_masks(self, harmonic: np.ndarray, percussive: np.ndarray) -> None:
+        h2 = np.square(harmonic, out=self._mask_h)
+        p2 = np.square(percussive, out=self._mask_p)
+        total = np.add(h2, p2, out=self._scratch)
+        np.maximum(total, _AMIN, out=total)
+        # Wiener masks h2/total and p2/total applied to the magnitude
+        np.divide(h2, total, out=h2)
+        np.divide(p2, total, out=p2)
+        np.square(h2, out=h2)
+        np.square(p2, out=p2)
+        self.harmonic_energy = float(np.dot(self.power, h2))
+        self.percussive_energy = float(np.dot(self.power, p2))
+
+    def analyze_blocks(
+        self, blocks: np.ndarray, separate: np.ndarray | None = None
+    ) -> BlockFeatures:
+        """Vectorised ``analyze`` over a ``(n_blocks, n_fft)`` array.
+
+        Used for offline analysis, where many blocks are available at once.
+        Leaves the streaming state as if each block had been passed to
+        ``analyze`` in order.  An empty batch returns empty features and
+        leaves the state untouched.
+
+        ``separate`` is an optional boolean mask of the blocks that run HPSS;
+        the others carry the previous percussive/harmonic energy forward, as
+        when ``process`` calls ``transform`` without ``separate``.
+        """
+        if blocks.shape[1] != self.n_fft:
+            self._allocate(blocks.shape[1])
+        if not len(blocks):
+            empty = np.zeros(0)
+            power = np.zeros((0, len(self.power)))
+            return BlockFeatures(empty, empty, empty, empty, empty, power)
+        magnitude = np.abs(np.fft.rfft(blocks * self.window, axis=1))
+        power = np.square(magnitude)
+
+        rms = np.sqrt(power @ self._bin_weights / (self.n_fft * self._window_power))
+
+        floored = np.maximum(power, _AMIN)
+        flatness = np.exp(np.log(floored).mean(axis=1)) / floored.mean(axis=1)
+
+        if separate is None:
+            harm_energy, perc_energy = self._separate_blocks(magnitude, power)
+        else:
+            rows = np.flatnonzero(separate)
+            harm = np.empty(len(rows) + 1)
+            perc = np.empty(len(rows) + 1)
+            harm[0] = self.harmonic_energy
+            perc[0] = self.percussive_energy
+            if len(rows):
+                harm[1:], perc[1:] = self._separate_blocks(magnitude[rows], power[rows])
+            # index of the latest separated block at or before each block
+            latest = np.searchsorted(rows, np.arange(len(blocks)), side="right")
+            harm_energy = harm[latest]
+            perc_energy = perc[latest]
+
+        mag_sum = magnitude.sum(axis=1)
+        centroid = np.divide(
+            magnitude @ self.frequencies,
+            mag_sum,
+            out=np.zeros(len(blocks)),
+            where=mag_sum > 0,
+        )
+
+        np.copyto(self.magnitude, magnitude[-1])
+        np.copyto(self.power, power[-1])
+        self.rms = float(rms[-1])
+        self.flatness = float(flatness[-1])
+        self.harmonic_energy = float(harm_energy[-1])
+        self.percussive_energy = float(perc_energy[-1])
+        return BlockFeatures(rms, flatness, perc_energy, harm_energy, centroid, power)
+
+    def _separate_blocks(
+        self, magnitude: np.ndarray, power: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return harmonic and percussive energy per row via ``update_many``."""
+        harmonic, percussive = self.hpss.update_many(magnitude)
+        h2 = np.square(harmonic)
+        p2 = np.square(percussive)
+        total = np.maximum(h2 + p2, _AMIN)
+        harm_energy = np.sum(power * np.square(h2 / total), axis=1)
+        perc_energy = np.sum(power * np.square(p2 / total), axis=1)
+        return harm_energy, perc_energy
+
+    def centroid(self) -> float:
+        """Return the spectral centroid in Hz of the last analyzed block."""
+        total = float(self.magnitude.sum())
+        if total <= 0.0:
+            return 0.0
+        return float(np.dot(self.frequencies, self.magnitude) / total)
@@ -0,0 +1,223 @@
+"""Spectral-peak fingerprints and an on-disk LRU genre cache.
+
+``fingerprint`` turns a few seconds of 16 kHz audio into landmark hashes:
+prominent spectrogram peaks are paired with later peaks nearby and each pair
+``(f1, f2, dt)`` is packed into one ``uint32``.  The hashes do not depend on
+where the clip starts, so the same backing track matches even when a song is
+detected a little earlier or later.  ``FingerprintCache`` maps fingerprints to
+the genre label the model gave them.
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .metrics import LatencyHistogram
+from .persist import AsyncWriter
+
+N_FFT = 1024
+HOP = 256
+MAX_BIN = 512  # 8 kHz at 16 kHz; also keeps bins within 10 bits
+PEAK_SIZE = (15, 21)  # neighbourhood in (frames, bins) a peak must dominate
+FAN_OUT = 5
+MAX_DT = 63
+
+
+def fingerprint(samples: np.ndarray) -> np.ndarray:
+    """Return the sorted unique landmark hashes of 16 kHz ``samples``."""
+    from scipy.ndimage import maximum_filter
+
+    x = np.asarray(samples, dtype=np.float32)
+    if len(x) < N_FFT:
+        return np.zeros(0, dtype=np.uint32)
+    frames = sliding_window_view(x, N_FFT)[::HOP] * np.hanning(N_FFT).astype(np.float32)
+    spec = np.log1p(np.abs(np.fft.rfft(frames, axis=1))[:, 1:MAX_BIN] * 10.0)
+    floor = spec.mean() + spec.std()
+    peaks = (spec == maximum_filter(spec, size=PEAK_SIZE)) & (spec > floor)
+    t, f = np.nonzero(peaks)  # sorted by frame
+    f = f + 1
+    hashes = []
+    for k in range(1, FAN_OUT + 1):
+        dt = t[k:] - t[:-k]
+        keep = (dt > 0) & (dt <= MAX_DT)
+        packed = (
+            (f[:-k][keep].astype(np.uint32) << 16)
+            | (f[k:][keep].astype(np.uint32) << 6)
+            | dt[keep].astype(np.uint32)
+        )
+        hashes.append(packed)
+    if not hashes:
+        return np.zeros(0, dtype=np.uint32)
+    return np.unique(np.concatenate(hashes))
+
+
+@dataclass
+class CacheEntry:
+    label: str
+    confidence: float
+    hashes: np.ndarray
+
+
+class FingerprintCache:
+    """LRU map of fingerprint to ``(label, confidence)`` saved to ``path``.
+
+    All hashes live in one sorted array with a parallel array of entry ids, so
+    a lookup is a ``searchsorted`` plus a ``bincount``.  A query matches the
+    entry sharing the most hashes when that share (of the smaller
+    fingerprint) reaches ``min_score`` and the entry's confidence reaches
+    ``min_confidence``.  ``store`` merges the new hashes into that array
+    instead of rebuilding it, and the file is serialised and written by an
+    ``AsyncWriter`` thread, so storing from a show thread stays cheap.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        capacity: int = 500,
+        *,
+        min_score: float = 0.08,
+        min_matches: int = 15,
+        min_confidence: float = 0.0,
+    ) -> None:
+        self.path = None if path is None else Path(path)
+        self.capacity = capacity
+        self.min_score = min_score
+        self.min_matches = min_matches
+        self.min_confidence = min_confidence
+        self.entries: OrderedDict[int, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = LatencyHistogram()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._hashes = np.zeros(0, dtype=np.uint32)
+        self._owners = np.zeros(0, dtype=np.int64)
+        self._writer = AsyncWriter()
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, hashes: np.ndarray) -> tuple[str, float, float] | None:
+        """Return ``(label, confidence, score)`` for a match, else ``None``."""
+        start = time.perf_counter()
+        with self._lock:
+            match = self._match(hashes)
+            if match is not None:
+                entry_id, score = match
+                self.entries.move_to_end(entry_id)
+                entry = self.entries[entry_id]
+        self.lookup_time.record(time.perf_counter() - start)
+        if match is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.label, entry.confidence, score
+
+    def _match(self, hashes: np.ndarray) -> tuple[int, float] | None:
+        if not len(hashes) or not len(self._hashes):
+            return None
+        lo = np.searchsorted(self._hashes, hashes, side="left")
+        hi = np.searchsorted(self._hashes, hashes, side="right")
+        found = hi > lo
+        if not found.any():
+            return None
+        # hashes are unique per entry, so each run holds distinct owners
+        runs = [self._owners[a:b] for a, b in zip(lo[found], hi[found])]
+        counts = np.bincount(np.concatenate(runs))
+        best = int(np.argmax(counts))
+        entry = self.entries.get(best)
+        if entry is None or counts[best] < self.min_matches:
+            return None
+        score = counts[best] / min(len(hashes), len(entry.hashes))
+        if score < self.min_score or entry.confidence < self.min_confidence:
+            return None
+        return best, float(score)
+
+    def store(self, hashes: np.ndarray, label: str, confidence: float = 1.0) -> None:
+        """Remember ``label`` for ``hashes``, evicting the least recently used."""
+        if not len(hashes) or not label:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self.entries[entry_id] = CacheEntry(label, float(confidence), hashes)
+            pos = np.searchsorted(self._hashes, hashes)
+            self._hashes = np.insert(self._hashes, pos, hashes)
+            self._owners = np.insert(self._owners, pos, entry_id)
+            evicted = []
+            while len(self.entries) > self.capacity:
+                evicted.append(self.entries.popitem(last=False)[0])
+            if evicted:
+                keep = ~np.isin(self._owners, evicted)
+                self._hashes = self._hashes[keep]
+                self._owners = self._owners[keep]
+        self._save()
+
+    def _reindex(self) -> None:
+        if not self.entries:
+            self._hashes = np.zeros(0, dtype=np.uint32)
+            self._owners = np.zeros(0, dtype=np.int64)
+            return
+        hashes = np.concatenate([e.hashes for e in self.entries.values()])
+        owners = np.concatenate(
+            [np.full(len(e.hashes), i) for i, e in self.entries.items()]
+        )
+        order = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[order]
+        self._owners = owners[order]
+
+    def _save(self) -> None:
+        if self.path is not None:
+            self._writer.submit(self.path, self._serialise)
+
+    def _serialise(self) -> bytes:
+        # runs on the writer thread
+        with self._lock:
+            entries = list(self.entries.values())  # oldest first
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            labels=np.array([e.label for e in entries]),
+            confidence=np.array([e.confidence for e in entries], dtype=np.float32),
+            lengths=np.array([len(e.hashes) for e in entries], dtype=np.int64),
+            hashes=np.concatenate([e.hashes for e in entries])
+            if entries
+            else np.zeros(0, dtype=np.uint32),
+        )
+        return buf.getvalue()
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.path) as data:
+                labels = [str(label) for label in data["labels"]]
+                confidence = data["confidence"]
+                parts = np.split(data["hashes"], np.cumsum(data["lengths"])[:-1])
+        except Exception as exc:  # pragma: no cover - corrupt cache file
+            print(f"Failed to load genre cache: {exc}", flush=True)
+            return
+        for label, conf, hashes in zip(labels, confidence, parts):
+            self.entries[self._next_id] = CacheEntry(label, float(conf), hashes)
+            self._next_id += 1
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        self._reindex()
+
+    def flush(self) -> None:
+        """Wait for pending writes of the cache file."""
+        self._writer.flush()
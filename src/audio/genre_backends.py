@@ -0,0 +1,356 @@
+"""Inference backends for ``GenreClassifier``.
+
+``PipelineBackend`` is the ``transformers`` audio-classification pipeline the
+classifier always used.  ``TorchBackend`` calls the same model directly,
+skipping the pipeline's feature extractor and post-processing.
+``OnnxBackend`` runs an exported, dynamically int8 quantized graph of the
+model with onnxruntime; it only needs numpy and onnxruntime at show time.
+Create the graph once with::
+
+    python -m src.audio.genre_backends export
+
+``load_backend("auto", ...)`` tries ONNX first, then torch, then the pipeline.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from .metrics import LatencyHistogram
+
+log = logging.getLogger("AI")
+
+SAMPLERATE = 16000
+ONNX_FILE = "model.onnx"
+QUANTIZED_FILE = "model.int8.onnx"
+BACKENDS = ("auto", "onnx", "torch", "pipeline")
+
+
+class InferenceBackend(abc.ABC):
+    """Return ranked ``{"label", "score"}`` predictions for 16 kHz audio."""
+
+    name = "base"
+
+    def __init__(self, model_path: Path) -> None:
+        self.model_path = Path(model_path)
+
+    def load(self) -> None:
+        """Load the model; called once before the first ``predict``."""
+
+    @abc.abstractmethod
+    def predict(self, samples: np.ndarray) -> List[Dict[str, float | str]]:
+        """Return every label with its score, best first."""
+
+    def predict_batch(self, windows: np.ndarray) -> List[Dict[str, float]]:
+        """Return ``{label: probability}`` over all labels for each row."""
+        return [
+            {r["label"]: float(r["score"]) for r in self.predict(row)}
+            for row in windows
+        ]
+
+
+class PipelineBackend(InferenceBackend):
+    """The generic ``transformers`` pipeline (PyTorch or TensorFlow)."""
+
+    name = "pipeline"
+
+    def __init__(self, model_path: Path, device: int = -1) -> None:
+        super().__init__(model_path)
+        self.device = device
+        self._pipeline = None
+
+    def load(self) -> None:
+        from transformers import is_tf_available, is_torch_available, pipeline
+
+        if not is_torch_available() and not is_tf_available():
+            raise ImportError(
+                "PyTorch or TensorFlow is required for genre classification"
+            )
+        self._pipeline = pipeline(
+            "audio-classification",
+            model=str(self.model_path),
+            local_files_only=True,
+            device=self.device,
+        )
+
+    def predict(self, samples: np.ndarray) -> List[Dict[str, float | str]]:
+        n_labels = len(self._pipeline.model.config.id2label)
+        return self._pipeline(
+            {"array": samples, "sampling_rate": SAMPLERATE}, top_k=n_labels
+        )
+
+    def predict_batch(self, windows: np.ndarray) -> List[Dict[str, float]]:
+        inputs = [{"array": row, "sampling_rate": SAMPLERATE} for row in windows]
+        n_labels = len(self._pipeline.model.config.id2label)
+        results = self._pipeline(inputs, top_k=n_labels, batch_size=len(inputs))
+        return [{r["label"]: float(r["score"]) for r in rows} for rows in results]
+
+
+class _LogitsBackend(InferenceBackend):
+    """Shared ranking for backends that produce a probability matrix.
+
+    Preprocessing follows ``preprocessor_config.json`` (zero-mean,
+    unit-variance normalisation when ``do_normalize`` is set) and labels come
+    from ``config.json``, so the ``transformers`` feature extractor is never
+    involved.
+    """
+
+    def __init__(self, model_path: Path) -> None:
+        super().__init__(model_path)
+        self.labels: Dict[int, str] = {}
+        self.normalize = True
+
+    def _read_config(self) -> None:
+        config = json.loads((self.model_path / "config.json").read_text())
+        self.labels = {int(k): v for k, v in config["id2label"].items()}
+        prep = self.model_path / "preprocessor_config.json"
+        if prep.exists():
+            self.normalize = json.loads(prep.read_text()).get("do_normalize", True)
+
+    @abc.abstractmethod
+    def probabilities(self, batch: np.ndarray) -> np.ndarray:
+        """Return ``(rows, labels)`` probabilities for a 2-D batch."""
+
+    def predict(self, samples: np.ndarray) -> List[Dict[str, float | str]]:
+        probs = self.probabilities(np.asarray(samples)[None, :])[0]
+        order = np.argsort(probs)[::-1]
+        return [
+            {"label": self.labels.get(int(i), str(i)), "score": float(probs[i])}
+            for i in order
+        ]
+
+    def predict_batch(self, windows: np.ndarray) -> List[Dict[str, float]]:
+        # equal-length windows go through the model as one batch
+        probs = self.probabilities(windows)
+        return [
+            {self.labels.get(i, str(i)): float(row[i]) for i in range(len(row))}
+            for row in probs
+        ]
+
+
+def _normalize(x: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Write zero-mean, unit-variance rows of ``x`` into ``out``."""
+    mean = x.mean(axis=1, keepdims=True)
+    std = np.sqrt(x.var(axis=1, keepdims=True) + 1e-7)
+    np.subtract(x, mean, out=out)
+    np.divide(out, std, out=out)
+    return out
+
+
+class TorchBackend(_LogitsBackend):
+    """The PyTorch model called directly, without the ``transformers`` pipeline.
+
+    Weights and labels are loaded once.  Audio is normalised with numpy into
+    a preallocated float32 buffer that a torch tensor shares, so a call
+    allocates nothing before the forward pass, which runs under
+    ``torch.inference_mode`` with ``threads`` intra-op threads (0 keeps the
+    torch default).  ``forward_time`` and ``overhead`` record the model call
+    and everything around it.
+    """
+
+    name = "torch"
+
+    def __init__(
+        self, model_path: Path, threads: int = 0, capacity: int = 5 * SAMPLERATE
+    ) -> None:
+        super().__init__(model_path)
+        self.threads = threads
+        self.forward_time = LatencyHistogram()
+        self.overhead = LatencyHistogram()
+        self._torch = None
+        self._model = None
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._tensor = None
+        self._capacity = capacity
+
+    def load(self) -> None:
+        import torch
+        from transformers import AutoModelForAudioClassification
+
+        self._read_config()
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        self._torch = torch
+        self._model = AutoModelForAudioClassification.from_pretrained(
+            str(self.model_path), local_files_only=True
+        )
+        self._model.eval()
+        self._reserve(self._capacity)
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._buffer):
+            return
+        self._buffer = np.zeros(size, dtype=np.float32)
+        self._tensor = self._torch.from_numpy(self._buffer)
+
+    def probabilities(self, batch: np.ndarray) -> np.ndarray:
+        start = time.perf_counter()
+        x = np.asarray(batch, dtype=np.float32)
+        rows, n = x.shape
+        self._reserve(rows * n)
+        # contiguous prefix of the shared buffer, seen by numpy and torch
+        view = self._buffer[: rows * n].reshape(rows, n)
+        if self.normalize:
+            _normalize(x, view)
+        else:
+            view[...] = x
+        inputs = self._tensor[: rows * n].view(rows, n)
+        forward = time.perf_counter()
+        with self._torch.inference_mode():
+            logits = self._model(inputs).logits
+            done = time.perf_counter()
+            probs = self._torch.softmax(logits, dim=-1).numpy()
+        self.forward_time.record(done - forward)
+        self.overhead.record(time.perf_counter() - start - (done - forward))
+        return probs
+
+
+class OnnxBackend(_LogitsBackend):
+    """onnxruntime session over an exported (by default int8) graph.
+
+    Neither torch nor transformers is imported.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self, model_path: Path, onnx_file: str = QUANTIZED_FILE, threads: int = 0
+    ) -> None:
+        super().__init__(model_path)
+        self.onnx_path = self.model_path / onnx_file
+        self.threads = threads
+        self._session = None
+        self._input = ""
+
+    def load(self) -> None:
+        import onnxruntime as ort
+
+        if not self.onnx_path.exists():
+            raise FileNotFoundError(
+                f"ONNX graph not found at {self.onnx_path}; "
+                "run `python -m src.audio.genre_backends export`"
+            )
+        self._read_config()
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        self._session = ort.InferenceSession(
+            str(self.onnx_path), options, providers=["CPUExecutionProvider"]
+        )
+        self._input = self._session.get_inputs()[0].name
+
+    def probabilities(self, batch: np.ndarray) -> np.ndarray:
+        x = np.asarray(batch, dtype=np.float32)
+        if self.normalize:
+            x = _normalize(x, np.empty_like(x))
+        logits = self._session.run(None, {self._input: x})[0]
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def load_backend(
+    kind: str, model_path: Path, *, device: int = -1, threads: int = 0
+) -> InferenceBackend:
+    """Create and load a backend; ``"auto"`` tries ONNX, torch, then pipeline.
+
+    The direct torch path runs on CPU, so a GPU ``device`` skips it.  In
+    ``"auto"`` mode any failure to load a backend (missing package or graph,
+    but also a corrupt or incompatible model) is logged and the next one is
+    tried; naming a backend explicitly raises instead.
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown backend {kind!r}; choose from {BACKENDS}")
+    if kind in ("auto", "onnx"):
+        backend: InferenceBackend = OnnxBackend(model_path, threads=threads)
+        try:
+            backend.load()
+            return backend
+        except (ImportError, FileNotFoundError) as exc:
+            if kind == "onnx":
+                raise
+            log.info("ONNX backend unavailable (%s); trying torch", exc)
+        except Exception as exc:
+            if kind == "onnx":
+                raise
+            log.warning("ONNX backend failed to load (%r); trying torch", exc)
+    if kind == "torch" or (kind == "auto" and device < 0):
+        backend = TorchBackend(model_path, threads=threads)
+        try:
+            backend.load()
+            return backend
+        except ImportError as exc:
+            if kind == "torch":
+                raise
+            log.info("Torch backend unavailable (%s); using pipeline", exc)
+        except Exception as exc:
+            if kind == "torch":
+                raise
+            log.warning("Torch backend failed to load (%r); using pipeline", exc)
+    backend = PipelineBackend(model_path, device=device)
+    backend.load()
+    return backend
+
+
+def export_onnx(
+    model_path: Path, *, quantize: bool = True, opset: int = 17
+) -> Path:
+    """Export the model to ONNX next to its weights; return the graph path.
+
+    With ``quantize`` the float graph is also converted with onnxruntime's
+    dynamic int8 quantization (weights int8, activations quantized at run
+    time), which is what ``OnnxBackend`` loads by default.
+    """
+    import torch
+    from transformers import AutoModelForAudioClassification
+
+    model_path = Path(model_path)
+    model = AutoModelForAudioClassification.from_pretrained(
+        str(model_path), local_files_only=True
+    )
+    model.eval()
+    dummy = torch.zeros(1, SAMPLERATE, dtype=torch.float32)
+    out = model_path / ONNX_FILE
+    torch.onnx.export(
+        model,
+        (dummy,),
+        str(out),
+        input_names=["input_values"],
+        output_names=["logits"],
+        dynamic_axes={"input_values": {0: "batch", 1: "samples"}, "logits": {0: "batch"}},
+        opset_version=opset,
+    )
+    if not quantize:
+        return out
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized = model_path / QUANTIZED_FILE
+    quantize_dynamic(str(out), str(quantized), weight_type=QuantType.QInt8)
+    return quantized
+
+
+def main() -> None:
+    import argparse
+
+    root = Path(__file__).resolve().parents[2]
+    parser = argparse.ArgumentParser(description="Genre model backend tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="Export the model to (int8) ONNX")
+    exp.add_argument(
+        "--model", type=Path, default=root / "models" / "music_genres_classification"
+    )
+    exp.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args()
+    path = export_onnx(args.model, quantize=not args.no_quantize)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
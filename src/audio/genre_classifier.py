@@ -3,12 +3,12 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TextIO
 import logging
-import log
+import log as log_config
 
 log = logging.getLogger("AI")
-from transformers import pipeline, is_torch_available, is_tf_available
 import numpy as np
-import librosa
+
+from .genre_backends import BACKENDS, InferenceBackend, load_backend
 
 
 class GenreClassifier:
@@ -21,6 +21,8 @@ class GenreClassifier:
         log_file: str | Path | TextIO | None = None,
         *,
         device: int = -1,
+        backend: str = "auto",
+        threads: int = 0,
     ) -> None:
         """Create the classifier.
 
@@ -35,7 +37,15 @@ class GenreClassifier:
         device:
             ``transformers`` device ID; ``-1`` forces CPU which avoids
             GPU-related crashes on some systems.
+        backend:
+            ``"onnx"`` for the exported int8 graph on onnxruntime,
+            ``"torch"`` for the model called directly, ``"pipeline"`` for the
+            ``transformers`` pipeline or ``"auto"`` to try them in that order.
+        threads:
+            Intra-op thread count for the ONNX and torch backends; ``0``
+            keeps the library default.
         """
+        log_config.configure()
         if model_path is None:
             root_dir = Path(__file__).resolve().parents[2]
             model_path = root_dir / "models" / "music_genres_classification"
@@ -43,14 +53,15 @@ class GenreClassifier:
         if not self.model_path.exists():
             raise FileNotFoundError(f"Genre model not found at {self.model_path}")
 
-        if not is_torch_available() and not is_tf_available():
-            raise ImportError(
-                "PyTorch or TensorFlow is required for genre classification"
-            )
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; choose from {BACKENDS}")
 
-        self._classifier = None
+        self.backend_name = backend
+        self._classifier: InferenceBackend | None = None
+        self.last_score: float | None = None
         self.verbose = verbose
         self.device = device
+        self.threads = threads
         self.log_file: TextIO | None = None
         self._own_log = False
         if log_file is not None:
@@ -68,18 +79,24 @@ class GenreClassifier:
         if self.verbose:
             print(message, flush=True)
 
-    def classify(self, samples: np.ndarray, samplerate: int) -> str:
-        """Return the top predicted genre label for the given audio."""
+    def _backend(self) -> InferenceBackend:
         if self._classifier is None:
             self._log(
                 f"Loading genre model from {self.model_path} on device {self.device}"
+                f" (backend {self.backend_name})"
             )
-            self._classifier = pipeline(
-                "audio-classification",
-                model=str(self.model_path),
-                local_files_only=True,
+            self._classifier = load_backend(
+                self.backend_name,
+                self.model_path,
                 device=self.device,
+                threads=self.threads,
             )
+            self._log(f"Genre model backend: {self._classifier.name}")
+        return self._classifier
+
+    def classify(self, samples: np.ndarray, samplerate: int) -> str:
+        """Return the top predicted genre label for the given audio."""
+        backend = self._backend()
         self._log(
             f"classify: samples={samples.shape} samplerate={samplerate}"
         )
@@ -87,16 +104,43 @@ class GenreClassifier:
             self._log(
                 f"Resampling from {samplerate}Hz to 16000Hz for classifier"
             )
+            import librosa
+
             samples = librosa.resample(samples, orig_sr=samplerate, target_sr=16000)
             samplerate = 16000
-        result = self._classifier({"array": samples, "sampling_rate": samplerate})
+        result = backend.predict(samples)
         if not result:
             self._log("genre model returned no predictions")
+            self.last_score = None
             return ""
         label = result[0].get("label", "")
+        self.last_score = result[0].get("score")
         self._log(f"Genre label returned: {label}")
         return label
 
+    def warm_up(self) -> None:
+        """Load the model and run it once on a second of silence.
+
+        The show resamples to 16 kHz as audio arrives, so there is no
+        ``librosa.resample`` to prime here.
+        """
+        self.classify(np.zeros(16000, dtype=np.float32), 16000)
+
+    def score_windows(
+        self, windows: np.ndarray, samplerate: int
+    ) -> list[dict[str, float]]:
+        """Return label probabilities for each row of ``windows`` in one pass."""
+        backend = self._backend()
+        if samplerate != 16000:
+            import librosa
+
+            windows = librosa.resample(
+                np.asarray(windows), orig_sr=samplerate, target_sr=16000, axis=-1
+            )
+        scores = backend.predict_batch(np.asarray(windows, dtype=np.float32))
+        self._log(f"scored {len(scores)} windows of {windows.shape[-1]} samples")
+        return scores
+
     def __del__(self) -> None:
         if self._own_log and self.log_file:
             try:
@@ -0,0 +1,59 @@
+"""Accumulate per-window genre probabilities and decide early."""
+
+from __future__ import annotations
+
+from typing import Dict, Mapping
+
+
+class GenreVote:
+    """Average label probabilities over windows until one label clearly leads.
+
+    ``add`` takes the full probability distribution of one window.  The
+    posterior is the mean distribution so far; ``decision`` returns its top
+    label once at least ``min_windows`` windows are in and the gap to the
+    runner-up reaches ``margin``.  After ``max_windows`` the caller should
+    settle for ``best``.
+    """
+
+    def __init__(
+        self, margin: float = 0.3, min_windows: int = 2, max_windows: int = 5
+    ) -> None:
+        self.margin_threshold = margin
+        self.min_windows = min_windows
+        self.max_windows = max_windows
+        self.windows = 0
+        self._totals: Dict[str, float] = {}
+
+    def add(self, probs: Mapping[str, float]) -> None:
+        for label, p in probs.items():
+            self._totals[label] = self._totals.get(label, 0.0) + float(p)
+        self.windows += 1
+
+    def posterior(self) -> Dict[str, float]:
+        """Return the mean probability per label, highest first."""
+        if not self.windows:
+            return {}
+        ranked = sorted(self._totals.items(), key=lambda kv: kv[1], reverse=True)
+        return {label: total / self.windows for label, total in ranked}
+
+    @property
+    def margin(self) -> float:
+        """Posterior gap between the two leading labels."""
+        top = list(self.posterior().values())[:2]
+        if not top:
+            return 0.0
+        return top[0] - (top[1] if len(top) > 1 else 0.0)
+
+    @property
+    def done(self) -> bool:
+        return self.windows >= self.max_windows
+
+    def best(self) -> str:
+        """Return the leading label, or ``""`` before any window."""
+        return next(iter(self.posterior()), "")
+
+    def decision(self) -> str | None:
+        """Return the label to commit to, or ``None`` to keep listening."""
+        if self.windows >= self.min_windows and self.margin >= self.margin_threshold:
+            return self.best()
+        return None
@@ -0,0 +1,394 @@
+"""Genre classification in a dedicated, pre-warmed worker process.
+
+``GenreWorker`` starts a child process that builds the classifier and runs one
+dummy inference before the first song, so model loading never delays a
+scenario change.  Audio is copied into a shared-memory slot and only a small
+``(job, method, shape, samplerate)`` message crosses the pipe; results come
+back as ``concurrent.futures.Future`` results.  PyTorch only ever runs in the child,
+so the audio thread in the show process never competes with it for the GIL.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+from .metrics import LatencyHistogram
+
+log = logging.getLogger("AI")
+
+# Rate of the warm-up clip; the show resamples everything it submits to it.
+WARMUP_SAMPLERATE = 16000
+# Longest clip accepted, in samples; longer submissions keep their most
+# recent part.  Thirty seconds at 16 kHz is ~2 MB of float32.
+DEFAULT_CAPACITY = 30 * WARMUP_SAMPLERATE
+
+
+def _default_factory(
+    model_path: str | None,
+    device: int,
+    log_path: str | None,
+    backend: str,
+    threads: int,
+) -> object:
+    from .genre_classifier import GenreClassifier
+
+    return GenreClassifier(
+        model_path, log_file=log_path, device=device, backend=backend, threads=threads
+    )
+
+
+def _worker_main(
+    conn,
+    shm_name: str,
+    capacity: int,
+    factory: Callable[[], object] | None,
+    model_path: str | None,
+    device: int,
+    log_path: str | None,
+    backend: str,
+    threads: int,
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slot = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    try:
+        start = time.perf_counter()
+        try:
+            if factory is not None:
+                classifier = factory()
+            else:
+                classifier = _default_factory(
+                    model_path, device, log_path, backend, threads
+                )
+            # one forward pass on silence loads weights and primes kernels
+            warm_up = getattr(classifier, "warm_up", None)
+            if warm_up is not None:
+                warm_up()
+            else:
+                classifier.classify(
+                    np.zeros(WARMUP_SAMPLERATE, dtype=np.float32), WARMUP_SAMPLERATE
+                )
+        except Exception as exc:
+            conn.send(("failed", None, repr(exc)))
+            return
+        conn.send(("ready", None, time.perf_counter() - start))
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                return
+            if msg[0] == "stop":
+                return
+            _, job, method, shape, samplerate = msg
+            data = slot[: int(np.prod(shape))].reshape(shape).copy()
+            try:
+                value = getattr(classifier, method)(data, samplerate)
+            except Exception as exc:
+                conn.send(("error", job, repr(exc)))
+            else:
+                score = getattr(classifier, "last_score", None)
+                conn.send(("result", job, (value, score)))
+    finally:
+        del slot
+        shm.close()
+        conn.close()
+
+
+class GenreWorker:
+    """Run a genre classifier in a child process with a futures interface.
+
+    Call ``start`` at show start to load and warm up the model in the
+    background and ``wait_ready`` to learn whether that worked; ``ready`` is
+    only set on success and ``failed`` stays true once the model failed to
+    load or the process died.  ``submit`` returns a ``Future`` resolving to
+    the label and ``classify`` blocks for it, so the worker can stand in for
+    ``GenreClassifier``; ``last_score`` mirrors the model's top score.  Jobs
+    are scheduled like ``LatestJobExecutor``: one runs in the child and one
+    waits; submitting while a job waits replaces it (its future is
+    cancelled and counted in ``replaced``), and a future cancelled before
+    its job reaches the child is skipped.  ``stats`` reports the same
+    counters and wait/run percentiles as the executor.  ``submit_scores``
+    does the same for ``GenreClassifier.score_windows``; a batch larger
+    than ``capacity`` samples is rejected.
+    ``factory`` (a picklable callable returning an object with
+    ``classify(samples, samplerate)`` and optionally ``score_windows``)
+    replaces the default ``GenreClassifier``.
+    """
+
+    def __init__(
+        self,
+        model_path: str | Path | None = None,
+        *,
+        device: int = -1,
+        backend: str = "auto",
+        threads: int = 0,
+        log_path: str | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+        factory: Callable[[], object] | None = None,
+    ) -> None:
+        self.model_path = None if model_path is None else str(model_path)
+        self.device = device
+        self.backend = backend
+        self.threads = threads
+        self.log_path = log_path
+        self.capacity = capacity
+        self.factory = factory
+        self.ready = threading.Event()
+        # set once the warm-up finished either way
+        self._settled = threading.Event()
+        self.warmup_seconds: float | None = None
+        self.error: str | None = None
+        self.last_score: float | None = None
+        self.wait_time = LatencyHistogram()
+        self.run_time = LatencyHistogram()
+        self.completed = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.replaced = 0
+        self._lock = threading.Lock()
+        # the waiting job: (job, method, data, samplerate, queued)
+        self._pending: tuple[int, str, np.ndarray, int, float] | None = None
+        self._futures: dict[int, Future] = {}
+        self._busy = False
+        self._started = 0.0
+        self._next_job = 0
+        self._process: mp.Process | None = None
+        self._conn = None
+        self._shm: shared_memory.SharedMemory | None = None
+        self._slot: np.ndarray | None = None
+        self._listener: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def failed(self) -> bool:
+        """True once the model failed to load or the worker process exited."""
+        return self.error is not None
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait for the warm-up; ``False`` on timeout.
+
+        Raises ``RuntimeError`` with the worker's error if it failed.
+        """
+        if not self._settled.wait(timeout):
+            return False
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return True
+
+    def start(self) -> None:
+        """Spawn the worker; returns immediately while the model warms up."""
+        if self._process is not None:
+            return
+        ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+        self._slot = np.ndarray((self.capacity,), dtype=np.float32, buffer=self._shm.buf)
+        parent, child = ctx.Pipe()
+        self._conn = parent
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(
+                child,
+                self._shm.name,
+                self.capacity,
+                self.factory,
+                self.model_path,
+                self.device,
+                self.log_path,
+                self.backend,
+                self.threads,
+            ),
+            name="genre-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+        self._listener = threading.Thread(
+            target=self._listen, name="genre-worker-results", daemon=True
+        )
+        self._listener.start()
+        log.info("Genre worker started (pid %s)", self._process.pid)
+
+    def submit(self, samples: np.ndarray, samplerate: int) -> Future:
+        """Queue ``samples`` for classification and return a label future."""
+        return self._submit("classify", samples, samplerate)
+
+    def submit_scores(self, windows: np.ndarray, samplerate: int) -> Future:
+        """Queue equal-length ``windows`` for one batched scoring pass.
+
+        The future resolves to one ``{label: probability}`` dict per row.
+        """
+        return self._submit("score_windows", windows, samplerate)
+
+    def _submit(self, method: str, data: np.ndarray, samplerate: int) -> Future:
+        shape = np.shape(data)
+        if len(shape) > 1 and int(np.prod(shape)) > self.capacity:
+            raise ValueError(
+                f"{shape[0]} windows of {shape[1]} samples exceed the worker"
+                f" capacity of {self.capacity} samples; submit fewer at a time"
+            )
+        if self._process is None:
+            self.start()
+        future: Future = Future()
+        replaced = None
+        with self._lock:
+            error = self.error
+            if error is None:
+                job = self._next_job
+                self._next_job += 1
+                self._futures[job] = future
+                if self._pending is not None:
+                    replaced = self._futures.pop(self._pending[0], None)
+                self._pending = (job, method, data, samplerate, time.perf_counter())
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+            return future
+        if replaced is not None:
+            # resolved outside the lock: its callbacks may submit again
+            if replaced.cancelled():
+                with self._lock:
+                    self.cancelled += 1
+            elif replaced.cancel():
+                with self._lock:
+                    self.replaced += 1
+        self._dispatch()
+        return future
+
+    def classify(self, samples: np.ndarray, samplerate: int) -> str:
+        """Blocking ``submit``; mirrors ``GenreClassifier.classify``."""
+        return self.submit(samples, samplerate).result()
+
+    def _dispatch(self) -> None:
+        """Send the next live job to the child if the slot is free.
+
+        Called without ``_lock`` held: the job is claimed under the lock and
+        its future is resolved outside it, so a callback that submits again
+        cannot deadlock.  ``_busy`` marks the slot as owned by this call.
+        """
+        while True:
+            with self._lock:
+                if self._busy or self._pending is None:
+                    return
+                job, method, data, samplerate, queued = self._pending
+                self._pending = None
+                future = self._futures.get(job)
+                if future is None:
+                    continue
+                self._busy = True
+            if future.set_running_or_notify_cancel():
+                break
+            # cancelled while queued, e.g. for a song that already ended
+            with self._lock:
+                self._futures.pop(job, None)
+                self.cancelled += 1
+                self._busy = False
+        self._started = time.perf_counter()
+        self.wait_time.record(self._started - queued)
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim == 1:
+            data = data[-self.capacity :]
+        try:
+            self._slot[: data.size] = data.ravel()
+            self._conn.send(("call", job, method, data.shape, samplerate))
+        except (OSError, ValueError, TypeError) as exc:
+            # pipe closed or shared memory released under us
+            self._fail_all(f"genre worker unavailable: {exc!r}")
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                kind, job, payload = self._conn.recv()
+            except (EOFError, OSError):
+                self._fail_all("genre worker exited")
+                return
+            if kind == "ready":
+                self.warmup_seconds = payload
+                self.ready.set()
+                self._settled.set()
+                log.info("Genre worker ready after %.2fs warm-up", payload)
+                continue
+            if kind == "failed":
+                log.error("Genre worker failed to load model: %s", payload)
+                self._fail_all(payload)
+                return
+            elapsed = time.perf_counter() - self._started
+            self.run_time.record(elapsed)
+            with self._lock:
+                future = self._futures.pop(job, None)
+                self._busy = False
+                if kind == "result":
+                    self.completed += 1
+                else:
+                    self.errors += 1
+            log.info("JOB    genre-worker job=%s ran %.3fs", job, elapsed)
+            self._dispatch()
+            if future is None:
+                continue
+            if kind == "result":
+                value, self.last_score = payload
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def stats(self) -> Dict[str, float]:
+        """Counters and wait/run percentiles in ``LatestJobExecutor`` form."""
+        return {
+            "completed": self.completed,
+            "failed": self.errors,
+            "cancelled": self.cancelled,
+            "replaced": self.replaced,
+            "wait_p50_ms": self.wait_time.percentile(50) * 1e3,
+            "wait_p99_ms": self.wait_time.percentile(99) * 1e3,
+            "run_p50_ms": self.run_time.percentile(50) * 1e3,
+            "run_p99_ms": self.run_time.percentile(99) * 1e3,
+        }
+
+    def _fail_all(self, reason: str) -> None:
+        with self._lock:
+            if self.error is None:
+                self.error = reason
+            futures = list(self._futures.values())
+            self._futures.clear()
+            self._pending = None
+            self._busy = False
+        self._settled.set()
+        for future in futures:
+            if not future.cancelled():
+                future.set_exception(RuntimeError(reason))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the worker process and release the shared memory."""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():  # pragma: no cover - hung model
+            self._process.terminate()
+            self._process.join(timeout)
+        self._conn.close()
+        if self._listener is not None:
+            self._listener.join(timeout)
+        self._slot = None
+        self._shm.close()
+        self._shm.unlink()
+        self._process = None
+
+    def __enter__(self) -> "GenreWorker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
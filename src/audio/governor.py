@@ -0,0 +1,110 @@
+"""CPU-budget governor that decimates expensive per-block features."""
+
+from __future__ import annotations
+
+from typing import Dict, Mapping, Sequence
+
+# Run interval (in blocks) of each optional feature per degradation level.
+# Features are shed in priority order: HPSS first, as the costliest and only
+# used for section detection, then the timbre statistics, which only feed the
+# provisional genre guess at song start.  Beat tracking, tempo, VU and the
+# spectral centroid are not listed and always run every block: the centroid
+# decides every snare and kick hit and costs a single dot product.
+DEFAULT_LEVELS: tuple[Mapping[str, int], ...] = (
+    {},
+    {"hpss": 2},
+    {"hpss": 4},
+    {"hpss": 8},
+    {"hpss": 8, "timbre": 2},
+)
+
+
+class CpuGovernor:
+    """Track processing load against the block period and pick a level.
+
+    ``update`` takes the time spent on one block.  The load is an exponential
+    moving average of ``elapsed / period``; it must stay above ``high`` for
+    ``raise_after`` blocks to step one level down in quality and below
+    ``low`` for ``lower_after`` blocks to step back up, so short spikes and
+    the drop in load caused by decimation itself do not make it oscillate.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        levels: Sequence[Mapping[str, int]] = DEFAULT_LEVELS,
+        *,
+        high: float = 0.6,
+        low: float = 0.3,
+        alpha: float = 0.1,
+        raise_after: int = 8,
+        lower_after: int = 172,
+    ) -> None:
+        self.period = period
+        self.levels = tuple(levels)
+        self.high = high
+        self.low = low
+        self.alpha = alpha
+        self.raise_after = raise_after
+        self.lower_after = lower_after
+        self.level = 0
+        self.load = 0.0
+        self._above = 0
+        self._below = 0
+        self._counters: Dict[str, int] = {}
+
+    @property
+    def max_level(self) -> int:
+        return len(self.levels) - 1
+
+    def update(self, elapsed: float) -> bool:
+        """Record one block's processing time; return ``True`` on a level change."""
+        self.load += self.alpha * (elapsed / self.period - self.load)
+        if self.load > self.high and self.level < self.max_level:
+            self._above += 1
+            self._below = 0
+            if self._above >= self.raise_after:
+                return self._set_level(self.level + 1)
+        elif self.load < self.low and self.level > 0:
+            self._below += 1
+            self._above = 0
+            if self._below >= self.lower_after:
+                return self._set_level(self.level - 1)
+        else:
+            self._above = 0
+            self._below = 0
+        return False
+
+    def _set_level(self, level: int) -> bool:
+        self.level = level
+        self._above = 0
+        self._below = 0
+        return True
+
+    def interval(self, feature: str) -> int:
+        """Return how many blocks pass between runs of ``feature``."""
+        return self.levels[self.level].get(feature, 1)
+
+    def should_run(self, feature: str) -> bool:
+        """Return whether ``feature`` runs for the current block."""
+        interval = self.interval(feature)
+        if interval <= 1:
+            return True
+        count = self._counters.get(feature, 0) + 1
+        if count >= interval:
+            count = 0
+        self._counters[feature] = count
+        return count == 0
+
+    def decimated(self) -> Dict[str, int]:
+        """Return ``{feature: interval}`` for features not run every block."""
+        return {
+            name: every for name, every in self.levels[self.level].items() if every > 1
+        }
+
+    def reset(self) -> None:
+        self.level = 0
+        self.load = 0.0
+        self._above = 0
+        self._below = 0
+        self._counters.clear()
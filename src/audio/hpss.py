@@ -0,0 +1,128 @@
+"""Streaming harmonic/percussive separation over a rolling spectrogram."""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.ndimage import median_filter
+
+# Rows per vectorised median pass; bounds temporary memory to roughly
+# ``_BATCH * n_bins * width`` floats.
+_BATCH = 256
+
+
+def _sliding_median(data: np.ndarray, width: int, axis: int) -> np.ndarray:
+    """Median of every ``width``-long window along ``axis`` of a 2-D array.
+
+    Rows of the result correspond to rows of ``data`` (``axis=1``) or to
+    window positions (``axis=0``).  Uses ``np.partition`` in batches, which is
+    several times faster than ``scipy.ndimage.median_filter`` for 2-D input.
+    """
+    windows = sliding_window_view(data, width, axis=axis)
+    mid = width // 2
+    out = np.empty(windows.shape[:2], dtype=data.dtype)
+    for start in range(0, len(out), _BATCH):
+        part = np.partition(windows[start : start + _BATCH], mid, axis=-1)
+        out[start : start + _BATCH] = part[..., mid]
+    return out
+
+
+class StreamingHPSS:
+    """Median-filter HPSS that consumes one spectral column at a time.
+
+    Harmonic content is the per-bin median over the last ``n_frames`` columns
+    and percussive content the median across ``percussive_kernel`` bins of the
+    newest column, as in ``librosa.decompose.hpss``.  The time-axis median is
+    kept incrementally: every bin holds a sorted copy of its window, and each
+    update removes the value leaving the ring buffer and inserts the new one.
+    Cost per column is ``O(n_bins * n_frames)`` with no allocations besides a
+    few per-bin index arrays.
+    """
+
+    def __init__(
+        self, n_bins: int, n_frames: int = 31, percussive_kernel: int = 31
+    ) -> None:
+        if n_frames % 2 == 0:
+            n_frames += 1  # odd window so the median is a single element
+        self.n_bins = n_bins
+        self.n_frames = n_frames
+        self.percussive_kernel = percussive_kernel
+        self.harmonic = np.zeros(n_bins, dtype=np.float64)
+        self.percussive = np.zeros(n_bins, dtype=np.float64)
+        self._ring = np.zeros((n_frames, n_bins), dtype=np.float64)
+        self._sorted = np.zeros((n_bins, n_frames), dtype=np.float64)
+        self._shifted = np.zeros((n_bins, n_frames), dtype=np.float64)
+        self._less = np.zeros((n_bins, n_frames), dtype=bool)
+        self._move = np.zeros((n_bins, n_frames - 1), dtype=bool)
+        self._cols = np.arange(n_frames - 1)
+        self._rows = np.arange(n_bins)
+        self._pos = 0
+        self._primed = False
+
+    def reset(self) -> None:
+        """Forget all spectral history."""
+        self._primed = False
+        self._pos = 0
+
+    def update(self, column: np.ndarray) -> None:
+        """Add a magnitude column and refresh ``harmonic``/``percussive``."""
+        if not self._primed:
+            # Fill the whole window with the first column, which behaves like
+            # edge padding and keeps the median meaningful from the start.
+            self._ring[:] = column
+            self._sorted[:] = column[:, None]
+            self._primed = True
+        else:
+            self._replace(self._ring[self._pos], column)
+            self._ring[self._pos] = column
+            self._pos = (self._pos + 1) % self.n_frames
+        np.copyto(self.harmonic, self._sorted[:, self.n_frames // 2])
+        median_filter(
+            column, size=self.percussive_kernel, mode="reflect", output=self.percussive
+        )
+
+    def _replace(self, old: np.ndarray, new: np.ndarray) -> None:
+        srt = self._sorted
+        shifted = self._shifted
+        # remove ``old``: shift everything right of its position one step left
+        np.less(srt, old[:, None], out=self._less)
+        idx = self._less.sum(axis=1)
+        np.greater_equal(self._cols, idx[:, None], out=self._move)
+        np.copyto(shifted, srt)
+        np.copyto(srt[:, :-1], shifted[:, 1:], where=self._move)
+        # insert ``new`` among the remaining n_frames - 1 values
+        np.less(srt[:, :-1], new[:, None], out=self._less[:, :-1])
+        idx = self._less[:, :-1].sum(axis=1)
+        np.greater_equal(self._cols, idx[:, None], out=self._move)
+        np.copyto(shifted, srt)
+        np.copyto(srt[:, 1:], shifted[:, :-1], where=self._move)
+        srt[self._rows, idx] = new
+
+    def update_many(self, columns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorised ``update`` for a ``(n_columns, n_bins)`` array.
+
+        Returns ``(harmonic, percussive)`` arrays with one row per column and
+        leaves the separator in the same state as calling ``update`` for
+        every column in turn.
+        """
+        n = len(columns)
+        width = self.n_frames
+        if not self._primed:
+            history = np.repeat(columns[:1], width - 1, axis=0)
+        else:
+            order = (self._pos + 1 + np.arange(width - 1)) % width
+            history = self._ring[order]
+        extended = np.concatenate([history, columns])
+        harmonic = _sliding_median(extended, width, axis=0)
+        pad = self.percussive_kernel // 2
+        # numpy's "symmetric" padding equals scipy.ndimage's "reflect" mode
+        padded = np.pad(columns, ((0, 0), (pad, pad)), mode="symmetric")
+        percussive = _sliding_median(padded, self.percussive_kernel, axis=1)
+
+        self._ring[:] = extended[-width:]
+        self._pos = 0
+        np.copyto(self._sorted, np.sort(self._ring.T, axis=1))
+        self._primed = True
+        np.copyto(self.harmonic, harmonic[-1])
+        np.copyto(self.percussive, percussive[-1])
+        return harmonic, percussive
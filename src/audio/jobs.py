@@ -0,0 +1,151 @@
+"""Single-worker job executor where the newest pending job wins."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable
+
+from .metrics import LatencyHistogram
+
+log = logging.getLogger("AI")
+
+
+@dataclass
+class _Job:
+    fn: Callable[..., Any]
+    args: tuple
+    key: Hashable | None
+    future: Future = field(default_factory=Future)
+    queued: float = field(default_factory=time.perf_counter)
+
+
+class LatestJobExecutor:
+    """Run at most one job at a time with a single pending slot.
+
+    Submitting while a job waits replaces it (the old future is cancelled and
+    counted in ``replaced``).  A job whose ``key`` differs from
+    ``current_key()`` when the worker reaches it is cancelled instead of run,
+    so work for a song that already ended never starts; ``cancel_stale``
+    drops such a job as soon as the song changes.  ``wait_time`` and
+    ``run_time`` hold queue-wait and execution histograms.
+    """
+
+    def __init__(
+        self,
+        current_key: Callable[[], Hashable] | None = None,
+        name: str = "jobs",
+    ) -> None:
+        self.current_key = current_key
+        self.name = name
+        self.wait_time = LatencyHistogram()
+        self.run_time = LatencyHistogram()
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.replaced = 0
+        self._pending: _Job | None = None
+        self._running: _Job | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, fn: Callable[..., Any], *args, key: Hashable | None = None) -> Future:
+        """Queue ``fn(*args)`` and return its future."""
+        job = _Job(fn, args, key)
+        with self._cond:
+            old = self._pending
+            if old is not None and old.future.cancel():
+                self.replaced += 1
+            self._pending = job
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return job.future
+
+    def cancel_stale(self, key: Hashable) -> int:
+        """Cancel the pending job unless it belongs to ``key``; return count."""
+        with self._cond:
+            job = self._pending
+            if job is None or job.key == key or not job.future.cancel():
+                return 0
+            self._pending = None
+            self.cancelled += 1
+            self._cond.notify_all()
+        return 1
+
+    @property
+    def busy(self) -> bool:
+        return self._running is not None or self._pending is not None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                job = self._pending
+                self._pending = None
+                stale = (
+                    job.key is not None
+                    and self.current_key is not None
+                    and job.key != self.current_key()
+                )
+                if stale:
+                    job.future.cancel()
+                if not job.future.set_running_or_notify_cancel():
+                    self.cancelled += 1
+                    log.info("JOB    %s cancelled before start (key=%s)", self.name, job.key)
+                    self._cond.notify_all()
+                    continue
+                self._running = job
+            start = time.perf_counter()
+            self.wait_time.record(start - job.queued)
+            try:
+                result = job.fn(*job.args)
+            except BaseException as exc:
+                self.failed += 1
+                job.future.set_exception(exc)
+            else:
+                self.completed += 1
+                job.future.set_result(result)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.run_time.record(elapsed)
+                with self._cond:
+                    self._running = None
+                    self._cond.notify_all()
+            log.info(
+                "JOB    %s key=%s waited %.3fs ran %.3fs",
+                self.name,
+                job.key,
+                start - job.queued,
+                elapsed,
+            )
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until nothing is pending or running; ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "replaced": self.replaced,
+            "wait_p50_ms": self.wait_time.percentile(50) * 1e3,
+            "wait_p99_ms": self.wait_time.percentile(99) * 1e3,
+            "run_p50_ms": self.run_time.percentile(50) * 1e3,
+            "run_p99_ms": self.run_time.percentile(99) * 1e3,
+        }
@@ -0,0 +1,144 @@
+"""Low-overhead latency histograms for the audio path and startup timing."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+
+class LatencyHistogram:
+    """Fixed log-spaced buckets from ``low`` to ``high`` seconds.
+
+    ``record`` is a handful of float operations and a list increment, so it
+    can run several times per audio block.  Percentiles are resolved to the
+    upper edge of the matching bucket (about 12 % resolution with the default
+    20 buckets per decade).
+    """
+
+    def __init__(
+        self, low: float = 1e-6, high: float = 1.0, per_decade: int = 20
+    ) -> None:
+        self.low = low
+        self.per_decade = per_decade
+        self._log_low = math.log10(low)
+        n = int(math.ceil((math.log10(high) - self._log_low) * per_decade))
+        # bucket i covers (edge[i-1], edge[i]]; the last bucket is overflow
+        self.edges = [low * 10 ** (i / per_decade) for i in range(n + 1)]
+        self.counts = [0] * (n + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Add ``count`` samples of ``seconds`` each."""
+        if seconds <= self.low:
+            idx = 0
+        else:
+            idx = int(math.ceil((math.log10(seconds) - self._log_low) * self.per_decade))
+            if idx >= len(self.counts):
+                idx = len(self.counts) - 1
+        self.counts[idx] += count
+        self.count += count
+        self.total += seconds * count
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Return the ``pct`` percentile (0–100) in seconds."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                if idx >= len(self.edges):
+                    return self.max
+                return min(self.edges[idx], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, p50, p99 and max with times in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.mean * 1e3,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class StartupProfile:
+    """Durations of startup steps and offsets of milestones such as the first block.
+
+    ``step`` times a block inline; ``start_background`` runs a warm-up on its
+    own thread so slow ones overlap each other and the inline steps.
+    Milestones are seconds since ``origin``, a ``time.perf_counter`` reading
+    taken as early as possible (by default, construction time).
+    """
+
+    def __init__(self, origin: float | None = None) -> None:
+        self.origin = time.perf_counter() if origin is None else origin
+        self.steps: Dict[str, float] = {}
+        self.background: Dict[str, float | None] = {}
+        self.marks: Dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - start
+
+    def start_background(self, name: str, fn: Callable[[], object]) -> Future:
+        """Run ``fn`` on a daemon thread; the future holds its result."""
+        future: Future = Future()
+        self.background[name] = None
+
+        def run() -> None:
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except BaseException as exc:
+                self.background[name] = time.perf_counter() - start
+                future.set_exception(exc)
+            else:
+                self.background[name] = time.perf_counter() - start
+                future.set_result(result)
+
+        threading.Thread(target=run, name=f"warm-up {name}", daemon=True).start()
+        return future
+
+    def mark(self, name: str) -> float:
+        """Record and return the seconds from ``origin`` to now."""
+        self.marks[name] = time.perf_counter() - self.origin
+        return self.marks[name]
+
+    def report(self) -> str:
+        """One line: inline steps, background warm-ups, then milestones."""
+        parts = [", ".join(f"{n} {s:.2f}s" for n, s in self.steps.items())]
+        if self.background:
+            parts.append(
+                "background: "
+                + ", ".join(
+                    f"{n} {'running' if s is None else f'{s:.2f}s'}"
+                    for n, s in self.background.items()
+                )
+            )
+        parts += [f"{n} at {s:.2f}s" for n, s in self.marks.items()]
+        return "Startup: " + " | ".join(parts)
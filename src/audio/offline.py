@@ -0,0 +1,261 @@
+"""Faster-than-realtime analysis of audio files with ``BeatDetector``.
+
+Run from the project root::
+
+    python -m src.audio.offline analyze set.flac -o set.npz --tuning tuning.json
+    python -m src.audio.offline diff before.npz after.npz
+
+``analyze`` reads the file in large chunks, computes spectral features for
+thousands of 512-sample blocks at once and then steps the detector's onset,
+tempo and state logic block by block, so each row matches what
+``BeatDetector.process`` returns live.  Results are stored column by column in
+a compressed ``.npz`` file that ``diff`` can compare between tuning versions.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+
+from .beat_detection import BeatDetector, SongState
+
+BLOCK_SIZE = 512
+
+# Columns written for every block, in file order.
+COLUMNS = (
+    "time",
+    "beat",
+    "bpm",
+    "state",
+    "vu",
+    "chorus",
+    "crescendo",
+    "drum_solo",
+    "snare",
+    "kick",
+)
+
+STATE_CODES = {state: code for code, state in enumerate(SongState)}
+
+
+def _read_chunks(
+    path: Path, chunk_seconds: float
+) -> tuple[int, Iterator[np.ndarray]]:
+    try:
+        import soundfile as sf
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError("soundfile is required for offline analysis") from exc
+
+    info = sf.info(str(path))
+    chunk_frames = max(BLOCK_SIZE, int(chunk_seconds * info.samplerate))
+
+    def chunks() -> Iterator[np.ndarray]:
+        for chunk in sf.blocks(
+            str(path), blocksize=chunk_frames, dtype="float32", always_2d=True
+        ):
+            # downmix to mono like a single-channel input stream
+            yield np.ascontiguousarray(chunk.mean(axis=1), dtype=np.float32)
+
+    return info.samplerate, chunks()
+
+
+def analyze_file(
+    path: str | Path,
+    output: str | Path | None = None,
+    *,
+    tuning_file: Path | None = None,
+    chunk_seconds: float = 60.0,
+    **detector_args,
+) -> Dict[str, np.ndarray]:
+    """Analyse ``path`` and return one array per column in ``COLUMNS``.
+
+    ``tuning_file`` selects the thresholds to use (defaults when ``None``);
+    tuning adjustments made during the run are never written back.  The CPU
+    governor is off, as in ``replay``, so the columns do not depend on
+    machine load.  Extra keyword arguments are passed to ``BeatDetector``.
+    When ``output`` is set the columns are also saved there with
+    ``save_columns``.
+    """
+    path = Path(path)
+    samplerate, chunks = _read_chunks(path, chunk_seconds)
+    detector_args.setdefault("print_interval", float("inf"))
+    detector_args.setdefault("governor", False)
+    detector = BeatDetector(
+        samplerate=samplerate,
+        tuning_file=tuning_file,
+        persist_tuning=False,
+        start_time=0.0,
+        **detector_args,
+    )
+    period = BLOCK_SIZE / samplerate
+    parts: Dict[str, list[np.ndarray]] = {name: [] for name in COLUMNS}
+    pending = np.zeros(0, dtype=np.float32)
+    index = 0
+    for chunk in chunks:
+        data = np.concatenate([pending, chunk]) if len(pending) else chunk
+        n_blocks = len(data) // BLOCK_SIZE
+        pending = data[n_blocks * BLOCK_SIZE :]
+        if not n_blocks:
+            continue
+        blocks = data[: n_blocks * BLOCK_SIZE].reshape(n_blocks, BLOCK_SIZE)
+        times = (index + np.arange(n_blocks)) * period
+        index += n_blocks
+        cols = _run_blocks(detector, blocks, times)
+        for name in COLUMNS:
+            parts[name].append(cols[name])
+
+    columns = {
+        name: np.concatenate(parts[name]) if parts[name] else np.zeros(0)
+        for name in COLUMNS
+    }
+    meta = {
+        "source": path.name,
+        "samplerate": samplerate,
+        "block_size": BLOCK_SIZE,
+        "tuning": detector.tuning,
+        "states": [state.value for state in SongState],
+    }
+    if output is not None:
+        save_columns(output, columns, meta)
+    return columns
+
+
+def _run_blocks(
+    detector: BeatDetector, blocks: np.ndarray, times: np.ndarray
+) -> Dict[str, np.ndarray]:
+    n = len(blocks)
+    cols = {
+        "time": times.astype(np.float64),
+        "beat": np.zeros(n, dtype=bool),
+        "bpm": np.zeros(n, dtype=np.float32),
+        "state": np.zeros(n, dtype=np.uint8),
+        "vu": np.zeros(n, dtype=np.float32),
+        "chorus": np.zeros(n, dtype=bool),
+        "crescendo": np.zeros(n, dtype=bool),
+        "drum_solo": np.zeros(n, dtype=bool),
+        "snare": np.zeros(n, dtype=bool),
+        "kick": np.zeros(n, dtype=bool),
+    }
+    results = detector.iter_blocks(blocks, times)
+    for i, (beat, bpm, _, vu) in enumerate(results):
+        cols["beat"][i] = beat
+        cols["bpm"][i] = bpm
+        cols["state"][i] = STATE_CODES[detector.state]
+        cols["vu"][i] = vu
+        cols["chorus"][i] = detector.is_chorus
+        cols["crescendo"][i] = detector.is_crescendo
+        cols["drum_solo"][i] = detector.is_drum_solo
+        cols["snare"][i] = detector.snare_hit
+        cols["kick"][i] = detector.kick_hit
+    return cols
+
+
+def save_columns(
+    path: str | Path, columns: Dict[str, np.ndarray], meta: dict | None = None
+) -> None:
+    """Write ``columns`` plus JSON metadata to a compressed ``.npz`` file."""
+    np.savez_compressed(
+        path, meta=np.array(json.dumps(meta or {})), **columns
+    )
+
+
+def load_columns(path: str | Path) -> tuple[Dict[str, np.ndarray], dict]:
+    """Return ``(columns, meta)`` from a file written by ``save_columns``."""
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"])) if "meta" in data else {}
+        columns = {name: data[name] for name in data.files if name != "meta"}
+    return columns, meta
+
+
+def diff_columns(
+    a: Dict[str, np.ndarray], b: Dict[str, np.ndarray], bpm_tolerance: float = 0.5
+) -> Dict[str, dict]:
+    """Compare two analyses and summarise differing blocks per column."""
+    n = min(len(a["time"]), len(b["time"]))
+    report: Dict[str, dict] = {}
+    for name in COLUMNS:
+        if name == "time" or name not in a or name not in b:
+            continue
+        x = a[name][:n]
+        y = b[name][:n]
+        if name == "bpm":
+            differs = np.abs(x - y) > bpm_tolerance
+        elif name == "vu":
+            differs = ~np.isclose(x, y, rtol=1e-4, atol=1e-6)
+        else:
+            differs = x != y
+        count = int(np.count_nonzero(differs))
+        entry: dict = {"differing": count, "a_total": None, "b_total": None}
+        if x.dtype == bool:
+            entry["a_total"] = int(np.count_nonzero(x))
+            entry["b_total"] = int(np.count_nonzero(y))
+        if count:
+            entry["first_time"] = float(a["time"][int(np.argmax(differs))])
+        report[name] = entry
+    return report
+
+
+def main() -> None:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Analyse audio files offline with BeatDetector"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("analyze", help="Analyse a WAV/FLAC file")
+    run.add_argument("path", type=Path, help="Audio file to analyse")
+    run.add_argument("-o", "--output", type=Path, help="Columnar .npz output")
+    run.add_argument(
+        "--tuning", type=Path, default=None, help="Tuning JSON (defaults if omitted)"
+    )
+    run.add_argument(
+        "--chunk-seconds", type=float, default=60.0, help="Seconds read per chunk"
+    )
+    run.add_argument(
+        "--amplitude-threshold", type=float, default=0.02,
+        help="RMS amplitude threshold for song detection",
+    )
+    run.add_argument("--start-duration", type=float, default=2.0)
+    run.add_argument("--end-duration", type=float, default=3.0)
+    cmp = sub.add_parser("diff", help="Compare two analysis files")
+    cmp.add_argument("a", type=Path)
+    cmp.add_argument("b", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "analyze":
+        output = args.output or args.path.with_suffix(".npz")
+        start = time.perf_counter()
+        columns = analyze_file(
+            args.path,
+            output,
+            tuning_file=args.tuning,
+            chunk_seconds=args.chunk_seconds,
+            amplitude_threshold=args.amplitude_threshold,
+            start_duration=args.start_duration,
+            end_duration=args.end_duration,
+        )
+        elapsed = time.perf_counter() - start
+        audio = float(columns["time"][-1]) if len(columns["time"]) else 0.0
+        print(
+            f"{len(columns['time'])} blocks ({audio:.1f}s audio) in {elapsed:.2f}s"
+            f" ({audio / max(elapsed, 1e-9):.0f}x realtime), "
+            f"{int(columns['beat'].sum())} beats -> {output}"
+        )
+    else:
+        a, _ = load_columns(args.a)
+        b, _ = load_columns(args.b)
+        for name, entry in diff_columns(a, b).items():
+            line = f"{name:<10} differing blocks: {entry['differing']}"
+            if entry["a_total"] is not None:
+                line += f"  (events {entry['a_total']} -> {entry['b_total']})"
+            if "first_time" in entry:
+                line += f"  first at {entry['first_time']:.2f}s"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Background atomic file writes for state saved from the audio path."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Callable, Dict
+
+from .metrics import LatencyHistogram
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temporary file and ``os.replace``.
+
+    Readers see either the old or the new contents, never a partial file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent or ".", prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# writers with a running thread; one exit hook flushes them all
+_writers: "weakref.WeakSet[AsyncWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers() -> None:
+    for writer in list(_writers):
+        writer.flush()
+
+
+class AsyncWriter:
+    """Persist files from a daemon thread, keeping only the newest payload.
+
+    ``submit`` stores the data and returns immediately; if a path is
+    submitted again before the thread gets to it, the older payload is
+    replaced (counted in ``coalesced``).  The payload may be a callable
+    returning bytes, so costly serialisation also runs on the thread and is
+    skipped for coalesced submissions.  Write times go into ``latency``.
+    The thread starts on first use and pending writes are flushed at exit;
+    ``close`` flushes and stops it earlier.
+    """
+
+    def __init__(self, on_error: Callable[[Path, Exception], None] | None = None) -> None:
+        self.on_error = on_error
+        self.latency = LatencyHistogram()
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._pending: Dict[Path, bytes | Callable[[], bytes]] = {}
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+
+    def submit(self, path: Path, data: bytes | str | Callable[[], bytes]) -> None:
+        """Queue ``data`` for ``path`` without blocking on I/O."""
+        path = Path(path)
+        if isinstance(data, str):
+            data = data.encode()
+        with self._cond:
+            if path in self._pending:
+                self.coalesced += 1
+            self._pending[path] = data
+            if self._thread is None:
+                self._closing = False
+                self._thread = threading.Thread(
+                    target=self._run, name="async-writer", daemon=True
+                )
+                self._thread.start()
+                _writers.add(self)
+            self._cond.notify()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until all submitted data is on disk; ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> bool:
+        """Flush, then stop the thread; a later ``submit`` starts a new one."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._closing = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        _writers.discard(self)
+        return flushed
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    if self._closing:
+                        return
+                    self._cond.wait()
+                path, data = self._pending.popitem()
+                self._busy = True
+            start = time.perf_counter()
+            try:
+                write_atomic(path, data() if callable(data) else data)
+                self.writes += 1
+            except Exception as exc:  # pragma: no cover - disk issues
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(path, exc)
+            self.latency.record(time.perf_counter() - start)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,261 @@
+"""Provisional genre from timbre statistics while the main model runs.
+
+``QuickGenreModel`` is a multinomial logistic regression over
+``TimbreStats.vector`` features.  It is small enough to evaluate on the
+audio thread, so the show can pick a genre-flavoured scenario within about
+50 ms of a song starting and let the transformer confirm or override it.  The
+model remembers the window length it was trained on and the show only queries
+it once that many blocks of the song have been heard.  Train and evaluate it
+on a local folder with one sub-folder of clips per genre::
+
+    python -m src.audio.quick_genre train clips/
+    python -m src.audio.quick_genre eval clips/
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .timbre import TimbreStats
+
+MODEL_FILE = Path(__file__).resolve().parents[2] / "models" / "quick_genre.npz"
+BLOCK = 512
+WINDOW_SECONDS = 0.05
+AUDIO_SUFFIXES = {".wav", ".flac", ".ogg", ".mp3", ".au"}
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class QuickGenreModel:
+    """Linear softmax classifier on standardised timbre statistics."""
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        weights: np.ndarray,
+        bias: np.ndarray,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        samplerate: int = 44100,
+        window_seconds: float = WINDOW_SECONDS,
+    ) -> None:
+        self.labels = list(labels)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = np.asarray(bias, dtype=np.float64)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.samplerate = samplerate
+        self.window_seconds = window_seconds
+
+    @property
+    def window_blocks(self) -> int:
+        """Blocks of audio the training windows covered."""
+        return max(1, int(round(self.window_seconds * self.samplerate / BLOCK)))
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Return label probabilities for one vector or a matrix of them."""
+        z = (np.asarray(features) - self.mean) / self.scale
+        return _softmax(z @ self.weights + self.bias)
+
+    def predict(self, features: np.ndarray) -> Tuple[str, float]:
+        """Return ``(label, probability)`` of the most likely genre."""
+        probs = self.predict_proba(features)
+        best = int(np.argmax(probs))
+        return self.labels[best], float(probs[best])
+
+    @classmethod
+    def fit(
+        cls,
+        features: np.ndarray,
+        labels: Sequence[str],
+        *,
+        samplerate: int = 44100,
+        window_seconds: float = WINDOW_SECONDS,
+        epochs: int = 2000,
+        learning_rate: float = 0.5,
+        l2: float = 1e-3,
+    ) -> "QuickGenreModel":
+        """Fit by full-batch gradient descent on the cross-entropy.
+
+        ``window_seconds`` is the length of audio each row of ``features``
+        was computed from (see ``clip_features``).
+        """
+        x = np.asarray(features, dtype=np.float64)
+        names = sorted(set(labels))
+        y = np.array([names.index(label) for label in labels])
+        mean = x.mean(axis=0)
+        scale = x.std(axis=0)
+        scale[scale == 0] = 1.0
+        z = (x - mean) / scale
+        onehot = np.eye(len(names))[y]
+        weights = np.zeros((x.shape[1], len(names)))
+        bias = np.zeros(len(names))
+        for _ in range(epochs):
+            error = (_softmax(z @ weights + bias) - onehot) / len(z)
+            weights -= learning_rate * (z.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+        return cls(names, weights, bias, mean, scale, samplerate, window_seconds)
+
+    def save(self, path: Path) -> None:
+        np.savez(
+            path,
+            labels=np.array(self.labels),
+            weights=self.weights,
+            bias=self.bias,
+            mean=self.mean,
+            scale=self.scale,
+            samplerate=self.samplerate,
+            window_seconds=self.window_seconds,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "QuickGenreModel":
+        with np.load(path) as data:
+            return cls(
+                [str(label) for label in data["labels"]],
+                data["weights"],
+                data["bias"],
+                data["mean"],
+                data["scale"],
+                int(data["samplerate"]),
+                # models saved before the window was stored used 3 s windows
+                float(data["window_seconds"]) if "window_seconds" in data else 3.0,
+            )
+
+
+def clip_features(
+    samples: np.ndarray, samplerate: int, seconds: float = WINDOW_SECONDS
+) -> np.ndarray:
+    """Return the ``TimbreStats`` vector the show would hold after ``samples``.
+
+    Blocks are windowed and transformed exactly like ``SpectralFrame``; only
+    the last ``seconds`` count, as when the show queries the model.
+    """
+    stats = TimbreStats(BLOCK, samplerate, seconds)
+    n = len(samples) // BLOCK
+    if n:
+        blocks = np.asarray(samples[: n * BLOCK], dtype=np.float32).reshape(n, BLOCK)
+        window = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(BLOCK) / BLOCK)
+        stats.update_many(np.square(np.abs(np.fft.rfft(blocks * window, axis=1))))
+    return stats.vector()
+
+
+def labelled_clips(folder: Path) -> List[Tuple[Path, str]]:
+    """Return ``(path, genre)`` for audio files in ``folder/<genre>/``."""
+    return [
+        (path, genre_dir.name)
+        for genre_dir in sorted(p for p in Path(folder).iterdir() if p.is_dir())
+        for path in sorted(genre_dir.iterdir())
+        if path.suffix.lower() in AUDIO_SUFFIXES
+    ]
+
+
+def dataset(
+    clips: Sequence[Tuple[Path, str]],
+    samplerate: int,
+    seconds: float = WINDOW_SECONDS,
+    per_clip: int = 8,
+) -> Tuple[np.ndarray, List[str], List[int]]:
+    """Cut up to ``per_clip`` windows from each clip.
+
+    Returns features, labels and the index of the clip each row came from,
+    so an evaluation split can keep whole clips apart.
+    """
+    import librosa
+
+    rows, labels, owners = [], [], []
+    length = int(seconds * samplerate)
+    for i, (path, genre) in enumerate(clips):
+        audio, _ = librosa.load(str(path), sr=samplerate, mono=True)
+        # spread short windows over the clip instead of its first fraction
+        hop = max(length // 2, (len(audio) - length) // per_clip, 1)
+        starts = range(0, max(1, len(audio) - length + 1), hop)
+        for start in list(starts)[:per_clip]:
+            rows.append(clip_features(audio[start : start + length], samplerate, seconds))
+            labels.append(genre)
+            owners.append(i)
+    return np.array(rows), labels, owners
+
+
+def evaluate(model: QuickGenreModel, features: np.ndarray, labels: Sequence[str]) -> Dict:
+    """Return accuracy, per-genre accuracy and per-prediction latency."""
+    times = []
+    predicted = []
+    for row in features:
+        start = time.perf_counter()
+        predicted.append(model.predict(row)[0])
+        times.append(time.perf_counter() - start)
+    hits = np.array([p == t for p, t in zip(predicted, labels)])
+    per_genre = {
+        genre: float(hits[[t == genre for t in labels]].mean())
+        for genre in sorted(set(labels))
+    }
+    return {
+        "accuracy": float(hits.mean()) if len(hits) else 0.0,
+        "per_genre": per_genre,
+        "predict_ms": float(np.median(times) * 1e3) if times else 0.0,
+    }
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quick genre pre-classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("train", "Fit on folder/<genre>/* and save the model"),
+        ("eval", "Report accuracy of a saved model on folder/<genre>/*"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("folder", type=Path)
+        cmd.add_argument("--model", type=Path, default=MODEL_FILE)
+        cmd.add_argument("--samplerate", type=int, default=44100)
+    sub.choices["train"].add_argument(
+        "--seconds",
+        type=float,
+        default=WINDOW_SECONDS,
+        help="window length; the show waits this long into a song before asking",
+    )
+    sub.choices["train"].add_argument(
+        "--holdout", type=float, default=0.2, help="fraction of clips held out"
+    )
+    args = parser.parse_args()
+
+    clips = labelled_clips(args.folder)
+    if not clips:
+        parser.error(f"no labelled clips under {args.folder}")
+    if args.command == "eval":
+        model = QuickGenreModel.load(args.model)
+        x, y, _ = dataset(clips, model.samplerate, model.window_seconds)
+        print(evaluate(model, x, y))
+        return
+    x, y, owners = dataset(clips, args.samplerate, args.seconds)
+    # hold out whole clips so windows of one song never sit on both sides
+    held = np.random.default_rng(0).random(len(clips)) < args.holdout
+    test = held[owners]
+    labels = np.array(y)
+    if test.any() and not test.all():
+        model = QuickGenreModel.fit(
+            x[~test],
+            list(labels[~test]),
+            samplerate=args.samplerate,
+            window_seconds=args.seconds,
+        )
+        print("held-out", evaluate(model, x[test], list(labels[test])))
+    model = QuickGenreModel.fit(
+        x, y, samplerate=args.samplerate, window_seconds=args.seconds
+    )
+    args.model.parent.mkdir(parents=True, exist_ok=True)
+    model.save(args.model)
+    print(f"Wrote {args.model} ({len(model.labels)} genres, {len(x)} windows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Fixed-size float32 ring buffer for recent audio."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Keep the most recent ``maxlen`` samples in a preallocated array.
+
+    ``write`` copies a whole block with at most two slice assignments and
+    ``snapshot`` exports the buffered samples oldest first.  Like
+    ``collections.deque(maxlen=...)``, writing past capacity drops the oldest
+    samples; ``written`` counts every sample written since the last
+    ``clear``, so ``written - len(buffer)`` is how many were dropped.
+    """
+
+    def __init__(self, maxlen: int, dtype=np.float32) -> None:
+        if maxlen <= 0:
+            raise ValueError("maxlen must be positive")
+        self.maxlen = int(maxlen)
+        self._data = np.zeros(self.maxlen, dtype=dtype)
+        self._end = 0  # index of the next write
+        self._size = 0
+        self.written = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.maxlen
+
+    def clear(self) -> None:
+        self._end = 0
+        self._size = 0
+        self.written = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append ``samples``, overwriting the oldest data when full."""
+        n = len(samples)
+        if n == 0:
+            return
+        self.written += n
+        cap = self.maxlen
+        if n >= cap:
+            self._data[:] = samples[n - cap :]
+            self._end = 0
+            self._size = cap
+            return
+        first = min(n, cap - self._end)
+        self._data[self._end : self._end + first] = samples[:first]
+        if first < n:
+            self._data[: n - first] = samples[first:]
+        self._end = (self._end + n) % cap
+        self._size = min(self._size + n, cap)
+
+    def snapshot(self, copy: bool = False) -> np.ndarray:
+        """Return the buffered samples, oldest first, as one contiguous array.
+
+        Without ``copy`` the result is a view of the internal storage when
+        the data does not wrap, and is overwritten by later writes; when it
+        wraps, or with ``copy=True``, exactly one copy is made.
+        """
+        start = (self._end - self._size) % self.maxlen
+        stop = start + self._size
+        if stop <= self.maxlen:
+            view = self._data[start:stop]
+            return view.copy() if copy else view
+        return np.concatenate((self._data[start:], self._data[: stop - self.maxlen]))
@@ -0,0 +1,159 @@
+"""Fixed-capacity beat history with running tempo statistics."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class TempoTracker:
+    """Track recent beat timestamps and derive tempo from their intervals.
+
+    Beats live in a preallocated ring buffer.  Adding a beat and expiring old
+    ones is ``O(1)`` and updates running sums of the intervals inside the
+    window, so the mean BPM never rescans the history.  Median-based figures
+    only look at the last ``recent`` beats using a preallocated scratch array.
+    """
+
+    def __init__(
+        self, window: float = 60.0, capacity: int = 512, recent: int = 8
+    ) -> None:
+        self.window = window
+        self.capacity = capacity
+        self.recent = recent
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._scratch = np.zeros(max(recent - 1, 1), dtype=np.float64)
+        self._head = 0  # index of the oldest beat
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    @property
+    def last_beat(self) -> float | None:
+        """Timestamp of the most recent beat."""
+        if not self._count:
+            return None
+        return float(self._times[(self._head + self._count - 1) % self.capacity])
+
+    def _drop_oldest(self) -> None:
+        if self._count > 1:
+            nxt = self._times[(self._head + 1) % self.capacity]
+            interval = nxt - self._times[self._head]
+            self._sum -= interval
+            self._sumsq -= interval * interval
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        if self._count <= 1:
+            # no intervals left; also clears accumulated rounding error
+            self._sum = 0.0
+            self._sumsq = 0.0
+
+    def add_beat(self, now: float) -> None:
+        """Record a beat at ``now`` and expire beats outside the window."""
+        if self._count == self.capacity:
+            self._drop_oldest()
+        last = self.last_beat
+        if last is not None:
+            interval = now - last
+            self._sum += interval
+            self._sumsq += interval * interval
+        self._times[(self._head + self._count) % self.capacity] = now
+        self._count += 1
+        self.expire(now)
+
+    def expire(self, now: float) -> None:
+        """Forget beats older than ``window`` seconds before ``now``."""
+        while self._count and now - self._times[self._head] > self.window:
+            self._drop_oldest()
+
+    # ------------------------------------------------------------------
+    def _recent_intervals(self) -> np.ndarray:
+        """Return the intervals between the last ``recent`` beats, sorted."""
+        n = min(self._count, self.recent) - 1
+        out = self._scratch[: max(n, 0)]
+        if n <= 0:
+            return out
+        end = self._head + self._count
+        prev = self._times[(end - n - 1) % self.capacity]
+        for i in range(n):
+            cur = self._times[(end - n + i) % self.capacity]
+            out[i] = cur - prev
+            prev = cur
+        out.sort()
+        return out
+
+    def _summary(self) -> tuple[float, float, float]:
+        intervals = self._recent_intervals()
+        n = len(intervals)
+        if n == 0:
+            return 0.0, 0.0, 0.0
+        mid = n // 2
+        if n % 2:
+            median = float(intervals[mid])
+        else:
+            median = 0.5 * float(intervals[mid - 1] + intervals[mid])
+        mean = float(intervals.sum()) / n
+        var = max(float(np.dot(intervals, intervals)) / n - mean * mean, 0.0)
+        return median, mean, math.sqrt(var)
+
+    def interval_stats(self) -> tuple[float, float]:
+        """Return ``(median, std)`` of the recent beat intervals in seconds."""
+        median, _, std = self._summary()
+        return median, std
+
+    @property
+    def bpm(self) -> float:
+        """Tempo from the median of the recent intervals."""
+        median, _ = self.interval_stats()
+        return 60.0 / median if median > 0 else 0.0
+
+    @property
+    def mean_bpm(self) -> float:
+        """Tempo from the mean of all intervals inside the window."""
+        if self._count < 2 or self._sum <= 0:
+            return 0.0
+        return 60.0 * (self._count - 1) / self._sum
+
+    @property
+    def interval_std(self) -> float:
+        """Standard deviation of all intervals inside the window."""
+        n = self._count - 1
+        if n < 1:
+            return 0.0
+        mean = self._sum / n
+        return math.sqrt(max(self._sumsq / n - mean * mean, 0.0))
+
+    @property
+    def stability(self) -> float:
+        """``1`` for perfectly regular recent beats, falling towards ``0``."""
+        if min(self._count, self.recent) < 3:
+            return 0.0
+        _, mean, std = self._summary()
+        if mean <= 0:
+            return 0.0
+        return max(0.0, 1.0 - std / mean)
+
+    @property
+    def confidence(self) -> float:
+        """Stability weighted by how full the recent history is."""
+        fill = min(1.0, (self._count - 1) / max(self.recent - 1, 1))
+        return self.stability * max(fill, 0.0)
+
+    def phase(self, now: float, bpm: float | None = None) -> float:
+        """Fraction of the beat period elapsed since the last beat (0–1)."""
+        last = self.last_beat
+        if bpm is None:
+            bpm = self.bpm
+        if last is None or bpm <= 0:
+            return 0.0
+        return ((now - last) * bpm / 60.0) % 1.0
@@ -0,0 +1,122 @@
+"""Running MFCC and spectral-shape statistics over recent blocks."""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Floor applied to power values before taking logs, as in librosa.
+_AMIN = 1e-10
+
+# Per-block columns: MFCCs, then centroid, rolloff (both kHz) and flatness.
+SHAPE_FEATURES = ("centroid_khz", "rolloff_khz", "flatness")
+
+
+def _hz_to_mel(hz: np.ndarray) -> np.ndarray:
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def dct_matrix(n_out: int, n_in: int) -> np.ndarray:
+    """Return the first ``n_out`` rows of the orthonormal DCT-II matrix."""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    basis = np.sqrt(2.0 / n_in) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_in))
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+def mel_filterbank(
+    n_fft: int, samplerate: int, n_mels: int, fmax: float | None = None
+) -> np.ndarray:
+    """Return an ``(n_mels, n_fft // 2 + 1)`` bank of triangular HTK filters."""
+    fmax = samplerate / 2 if fmax is None else fmax
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / samplerate)
+    edges = _mel_to_hz(np.linspace(0.0, _hz_to_mel(fmax), n_mels + 2))
+    lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs - lower) / (centre - lower)
+    falling = (upper - freqs) / (upper - centre)
+    bank = np.maximum(0.0, np.minimum(rising, falling))
+    # equal-area filters so wide high bands do not dominate
+    return bank * (2.0 / (upper - lower))
+
+
+class TimbreStats:
+    """Mean and spread of per-block timbre features over the last ``seconds``.
+
+    ``update`` takes one block's power spectrum (``SpectralFrame.power``),
+    so the statistics come from the FFT the detector already computes.  Each
+    block contributes ``n_mfcc`` MFCCs plus spectral centroid, 85 % rolloff
+    and flatness; ``vector`` returns their mean followed by their standard
+    deviation.  The mel bank, DCT matrix and history are allocated once.
+    The beat detector feeds it only while a song is starting, which is the
+    only time the quick genre model reads it.
+    """
+
+    def __init__(
+        self,
+        n_fft: int = 512,
+        samplerate: int = 44100,
+        seconds: float = 3.0,
+        n_mels: int = 40,
+        n_mfcc: int = 13,
+    ) -> None:
+        self.n_fft = n_fft
+        self.samplerate = samplerate
+        self.n_mfcc = n_mfcc
+        self.mel = mel_filterbank(n_fft, samplerate, n_mels)
+        self.dct = dct_matrix(n_mfcc, n_mels)
+        self.frequencies_khz = np.fft.rfftfreq(n_fft, 1.0 / samplerate) / 1000.0
+        self.width = n_mfcc + len(SHAPE_FEATURES)
+        self.capacity = max(1, int(round(seconds * samplerate / n_fft)))
+        self._history = np.zeros((self.capacity, self.width))
+        self._pos = 0
+        self.frames = 0
+
+    def reset(self) -> None:
+        """Forget all blocks, e.g. when a new song starts."""
+        self._pos = 0
+        self.frames = 0
+
+    def block_features(self, power: np.ndarray) -> np.ndarray:
+        """Return the feature rows for one or more power spectra."""
+        power = np.atleast_2d(np.maximum(power, _AMIN))
+        mfcc = np.log(power @ self.mel.T + _AMIN) @ self.dct.T
+        total = power.sum(axis=1)
+        centroid = power @ self.frequencies_khz / total
+        cumulative = np.cumsum(power, axis=1)
+        rolloff_bin = (cumulative < 0.85 * total[:, None]).sum(axis=1)
+        rolloff = self.frequencies_khz[np.minimum(rolloff_bin, power.shape[1] - 1)]
+        flatness = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+        return np.column_stack([mfcc, centroid, rolloff, flatness])
+
+    def update(self, power: np.ndarray) -> None:
+        """Add one block's power spectrum."""
+        self._history[self._pos] = self.block_features(power)[0]
+        self._pos = (self._pos + 1) % self.capacity
+        self.frames += 1
+
+    def update_many(self, power: np.ndarray) -> None:
+        """Add a ``(blocks, bins)`` matrix of power spectra in order."""
+        rows = self.block_features(power)[-self.capacity :]
+        idx = (self._pos + np.arange(len(rows))) % self.capacity
+        self._history[idx] = rows
+        self._pos = (self._pos + len(rows)) % self.capacity
+        self.frames += len(power)
+
+    def vector(self, blocks: int | None = None) -> np.ndarray:
+        """Return ``[means, stds]`` over the blocks held, zeros when empty.
+
+        ``blocks`` limits the statistics to the most recent blocks.
+        """
+        held = min(self.frames, self.capacity)
+        if blocks is not None and blocks < held:
+            idx = (self._pos - blocks + np.arange(blocks)) % self.capacity
+            rows = self._history[idx]
+        else:
+            rows = self._history[:held]
+        if not len(rows):
+            return np.zeros(2 * self.width)
+        return np.concatenate([rows.mean(axis=0), rows.std(axis=0)])
@@ -6,6 +6,8 @@ from dmx import DmxDevice
 class Fuzzix_PartyParUV_7ch(DmxDevice):
     """Fuzzix PartyPar UV fixture in 7-channel mode."""
 
+    __slots__ = ()
+
     CHANNEL_OFFSETS = {
         "dimmer": 0,
         "uv1": 1,
@@ -15,11 +17,3 @@ class Fuzzix_PartyParUV_7ch(DmxDevice):
         "strobe": 5,
         "macro": 6,
     }
-
-    def __init__(self, start_address: int) -> None:
-        self.start_address = int(start_address)
-        channels = {
-            name: self.start_address + off
-            for name, off in self.CHANNEL_OFFSETS.items()
-        }
-        super().__init__(channels)
@@ -5,6 +5,8 @@ from dmx import DmxDevice
 class Prolights_LumiPar7UTRI_8ch(DmxDevice):
     """Prolights LumiPar 7 UTRI fixture in 8-channel mode."""
 
+    __slots__ = ()
+
     CHANNEL_OFFSETS = {
         "red": 0,
         "green": 1,
@@ -15,9 +17,3 @@ class Prolights_LumiPar7UTRI_8ch(DmxDevice):
         "dimmer": 6,
         "dimmer_speed": 7,
     }
-
-    def __init__(self, start_address: int) -> None:
-        self.start_address = int(start_address)
-        channels = {name: self.start_address + off for name, off in self.CHANNEL_OFFSETS.items()}
-        super().__init__(channels)
-
@@ -6,6 +6,8 @@ from dmx import DmxDevice
 class Prolights_PixieWash_13ch(DmxDevice):
     """Prolights PixieWash moving head in 13-channel mode."""
 
+    __slots__ = ()
+
     CHANNEL_OFFSETS = {
         "pan": 0,
         "pan_fine": 1,
@@ -21,11 +23,3 @@ class Prolights_PixieWash_13ch(DmxDevice):
         "white": 11,
         "color_macros": 12,
     }
-
-    def __init__(self, start_address: int) -> None:
-        self.start_address = int(start_address)
-        channels = {
-            name: self.start_address + off
-            for name, off in self.CHANNEL_OFFSETS.items()
-        }
-        super().__init__(channels)
@@ -1,3 +1,3 @@
-from .dmx import DmxDevice, DmxSerial, DMX
+from .dmx import DmxDevice, DmxSerial, DMX, Universe
 
-__all__ = ["DmxDevice", "DmxSerial", "DMX"]
+__all__ = ["DmxDevice", "DmxSerial", "DMX", "Universe"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple, Type, Optional
+from typing import Callable, Dict, Iterable, Tuple, Type, Optional
+import logging
 import threading
 import time
 
@@ -10,128 +10,248 @@ try:
 except Exception:  # pragma: no cover - serial only required when running on real hardware
     serial = None
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Channels in one DMX512 universe; the transmitted frame adds a start code.
+UNIVERSE_SIZE = 512
+# Shortest frame sent; some receivers ignore packets with very few slots.
+MIN_SLOTS = 24
+# DMX512 requires at least 1204 us from one break to the next.
+MIN_FRAME_SECONDS = 0.001204
+
+# What the sender does when a frame finishes after the next one was due:
+# "skip" drops the missed slots and sends the latest one at once, "catch_up"
+# sends the missed frames back to back (at most MAX_CATCH_UP in a row).
+SCHEDULE_POLICIES = ("skip", "catch_up")
+MAX_CATCH_UP = 3
+
+
+class Universe:
+    """One DMX512 universe held in a single preallocated buffer.
+
+    ``buffer`` is the 513-byte frame as it goes on the wire: the start code
+    in byte 0 followed by the 512 channel slots, so channel ``n`` lives at
+    ``buffer[n]``.  Devices get writable ``memoryview`` slices of it from
+    ``slot`` and the serial sender transmits ``buffer`` itself, so producing
+    a frame allocates nothing.  ``pending`` lists attached devices whose
+    values changed since they were last written.
+    """
+
+    def __init__(self, start_code: int = 0) -> None:
+        self.buffer = bytearray(UNIVERSE_SIZE + 1)
+        self.buffer[0] = start_code
+        self._view = memoryview(self.buffer)
+        # channel slots without the start code, e.g. for hashing a frame
+        self.data = self._view[1:]
+        self._blank = bytes(UNIVERSE_SIZE)
+        self.pending: list[DmxDevice] = []
+
+    def slot(self, first: int, count: int) -> memoryview:
+        """Return a writable view of channels ``first .. first + count - 1``."""
+        if first < 1 or count < 0 or first + count - 1 > UNIVERSE_SIZE:
+            raise ValueError(
+                f"Channels {first}..{first + count - 1} outside 1..{UNIVERSE_SIZE}"
+            )
+        return self._view[first : first + count]
+
+    def clear(self) -> None:
+        """Set every channel to zero, keeping the start code."""
+        self.data[:] = self._blank
+
+    def __getitem__(self, channel: int) -> int:
+        return self.buffer[channel]
+
+    def packet(self, slots: int) -> memoryview:
+        """Return the start code and the first ``slots`` channels as one view."""
+        slots = max(0, min(UNIVERSE_SIZE, slots))
+        return self._view[: slots + 1]
+
+
+def _clamp(value: int) -> int:
+    value = int(value)
+    return 0 if value < 0 else 255 if value > 255 else value
+
+
+# Abstract colours set_color() accepts, in argument order.
+_COLOR_NAMES = ("red", "green", "blue", "white", "amber", "uv")
+
+
 class DmxDevice:
     """
-    Base class for any DMX fixture.  
-    - Define `channels` as a dict of feature → channel-offset (0-based).  
-    - Use the provided setters (or override compute_values) to update internal state.  
-    - Call frame() to get {offset: value} ready for your DMX output pipeline.
+    Base class for any DMX fixture.
+    - Define `CHANNEL_OFFSETS` as a dict of feature → channel-offset (0-based)
+      from the start address; subclasses get a compiled layout at class
+      creation and should declare `__slots__ = ()`.
+    - Use the provided setters (or override compute_values) to update internal state.
+    - Call frame() to get {channel: value} ready for your DMX output pipeline.
+    - Or attach() the device to a Universe and call write() to copy the values
+      straight into its slice of the frame buffer.  Setters that change a
+      value queue the device on the universe's `pending` list, so the
+      controller only rewrites fixtures that changed.
     """
 
-    def __init__(self, channels: Dict[str, int]) -> None:
-        """
-        :param channels: mapping of logical feature names to relative DMX offsets.
-                         e.g. {"red":0, "green":1, "blue":2, "fog":3, "pan":4, ...}
-        """
-        # Validate & store channel offsets
-        self.channels: Dict[str, int] = {}
-        for name, off in channels.items():
+    __slots__ = ("start_address", "_values", "_slot", "_dirty", "_pending")
+
+    CHANNEL_OFFSETS: Dict[str, int] = {}
+
+    # Compiled from CHANNEL_OFFSETS by _compile_layout():
+    # name → offset, the offsets in declaration order, the slot width, and
+    # name → ((offset, scale), ...) for every name set_channel() accepts.
+    _LAYOUT: Dict[str, int]
+    _OFFSETS: Tuple[int, ...]
+    _WIDTH: int
+    _BLANK: bytes
+    _TARGETS: Dict[str, Tuple[Tuple[int, float], ...]]
+    _COLOR_TARGETS: Tuple[Optional[Tuple[Tuple[int, float], ...]], ...]
+    _STROBE: Optional[int]
+    # True when compute_values() is overridden, so the device is rewritten on
+    # every update() whether or not a setter ran
+    _DYNAMIC: bool
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._compile_layout()
+
+    @classmethod
+    def _compile_layout(cls) -> None:
+        layout: Dict[str, int] = {}
+        for name, off in cls.CHANNEL_OFFSETS.items():
             off = int(off)
             if off < 0:
                 raise ValueError(f"Offset for '{name}' must be ≥ 0")
-            self.channels[name] = off
-
-        # Initialize all channel values to 0
-        self._values: Dict[str, int] = {name: 0 for name in self.channels}
+            layout[name] = off
+        cls._LAYOUT = layout
+        cls._OFFSETS = tuple(layout.values())
+        cls._WIDTH = max(cls._OFFSETS) + 1 if layout else 0
+        cls._BLANK = bytes(cls._WIDTH)
+
+        targets = {name: ((off, 1.0),) for name, off in layout.items()}
+        rgb = tuple((layout[c], 1.0) for c in ("red", "green", "blue") if c in layout)
+        # Fallbacks for abstract colour channels the fixture lacks
+        for name in ("white", "warm_white", "cold_white"):
+            if name in targets:
+                continue
+            if "white" in layout:
+                targets[name] = ((layout["white"], 1.0),)
+            elif len(rgb) == 3:
+                targets[name] = rgb
+        if "amber" not in targets and {"red", "green"} <= layout.keys():
+            # simple approximation using mostly red
+            targets["amber"] = ((layout["red"], 1.0), (layout["green"], 0.5))
+        cls._TARGETS = targets
+        cls._COLOR_TARGETS = tuple(targets.get(name) for name in _COLOR_NAMES)
+        cls._STROBE = layout.get("strobe", layout.get("shutter"))
+        cls._DYNAMIC = cls.compute_values is not DmxDevice.compute_values
+
+    def __init__(self, start_address: int) -> None:
+        """
+        :param start_address: DMX channel (1-based) of the device's offset 0.
+        """
+        self.start_address = int(start_address)
+        # Channel values in offset order, all 0 to start with
+        self._values = bytearray(self._WIDTH)
+        self._slot: Optional[memoryview] = None
+        self._dirty = False
+        self._pending: Optional[list] = None
+
+    @property
+    def channels(self) -> Dict[str, int]:
+        """Mapping of logical feature names to absolute DMX channels."""
+        start = self.start_address
+        return {name: start + off for name, off in self._LAYOUT.items()}
+
+    def _mark_dirty(self) -> None:
+        if not self._dirty:
+            self._dirty = True
+            if self._pending is not None:
+                self._pending.append(self)
 
     def reset(self) -> None:
         """Reset all channels to zero."""
-        for name in self._values:
-            self._values[name] = 0
+        if self._values != self._BLANK:
+            self._values[:] = self._BLANK
+            self._mark_dirty()
 
-    def _approximate_channel(self, name: str, value: int) -> bool:
-        """Fallback for abstract color channels.
+    def set_channel(self, name: str, value: int) -> None:
+        """Set one channel by logical name (0–255).
 
-        Returns ``True`` if the value was mapped to existing channels.
+        Abstract colours the fixture lacks (white, warm/cold white, amber) are
+        approximated with the channels it has.
         """
-        if name in {"white", "warm_white", "cold_white"}:
-            if "white" in self.channels:
-                self._values["white"] = max(0, min(255, int(value)))
-                return True
-            if {"red", "green", "blue"}.issubset(self.channels):
-                val = max(0, min(255, int(value)))
-                # Avoid recursion by setting RGB directly
-                self._values["red"] = val
-                self._values["green"] = val
-                self._values["blue"] = val
-                return True
-        if name == "amber":
-            if "amber" in self.channels:
-                self._values["amber"] = max(0, min(255, int(value)))
-                return True
-            if {"red", "green"}.issubset(self.channels):
-                val = max(0, min(255, int(value)))
-                # simple approximation using mostly red
-                # Set RGB directly to prevent recursive calls
-                self._values["red"] = val
-                self._values["green"] = int(val * 0.5)
-                return True
-        return False
-
-    def set_channel(self, name: str, value: int) -> None:
-        """Set one channel by logical name (0–255)."""
-        if name in self.channels:
-            self._values[name] = max(0, min(255, int(value)))
-        elif not self._approximate_channel(name, value):
+        targets = self._TARGETS.get(name)
+        if targets is None:
             raise KeyError(f"No such channel: '{name}'")
+        value = _clamp(value)
+        values = self._values
+        for off, scale in targets:
+            new = value if scale == 1.0 else int(value * scale)
+            if values[off] != new:
+                values[off] = new
+                self._mark_dirty()
 
     def get_channel(self, name: str) -> int:
         """Get current value for a logical channel (defaults to 0)."""
-        return self._values.get(name, 0)
+        off = self._LAYOUT.get(name)
+        return 0 if off is None else self._values[off]
 
     # Convenience color methods:
 
     def set_color(self, red: int, green: int, blue: int, white: int = 0, amber: int = 0, uv: int = 0) -> None:
-        """Set multiple color channels at once with fallbacks."""
-        for name, val in (
-            ("red", red),
-            ("green", green),
-            ("blue", blue),
-            ("white", white),
-            ("amber", amber),
-            ("uv", uv),
-        ):
-            try:
-                self.set_channel(name, val)
-            except KeyError:
-                # Ignore unknown channels if they cannot be approximated
-                pass
+        """Set multiple color channels at once with fallbacks.
+
+        Colours the fixture can neither show nor approximate are ignored.
+        """
+        values = self._values
+        for targets, value in zip(self._COLOR_TARGETS, (red, green, blue, white, amber, uv)):
+            if targets is None:
+                continue
+            value = _clamp(value)
+            for off, scale in targets:
+                new = value if scale == 1.0 else int(value * scale)
+                if values[off] != new:
+                    values[off] = new
+                    self._mark_dirty()
+
+    def _store(self, off: int, value: int) -> None:
+        if self._values[off] != value:
+            self._values[off] = value
+            self._mark_dirty()
 
     def set_dimmer(self, value: int) -> None:
-        if "dimmer" not in self.channels:
+        off = self._LAYOUT.get("dimmer")
+        if off is None:
             raise KeyError("No 'dimmer' channel defined")
-        self._values["dimmer"] = max(0, min(255, int(value)))
+        self._store(off, _clamp(value))
 
     def set_strobe(self, value: int) -> None:
-        for key in ("strobe", "shutter"):
-            if key in self.channels:
-                self._values[key] = max(0, min(255, int(value)))
-                return
-        raise KeyError("No strobe/shutter channel defined")
+        if self._STROBE is None:
+            raise KeyError("No strobe/shutter channel defined")
+        self._store(self._STROBE, _clamp(value))
 
     # Movement:
 
     def set_pan_tilt(self, pan: int, tilt: int) -> None:
+        layout = self._LAYOUT
+        store = self._store
         # Pan
-        if "pan" not in self.channels:
+        if "pan" not in layout:
             raise KeyError("No 'pan' channel defined")
         pan = max(0, int(pan))
-        if "pan_fine" in self.channels:
-            self._values["pan"] = pan >> 8
-            self._values["pan_fine"] = pan & 0xFF
+        if "pan_fine" in layout:
+            store(layout["pan"], min(255, pan >> 8))
+            store(layout["pan_fine"], pan & 0xFF)
         else:
-            self._values["pan"] = min(255, pan)
+            store(layout["pan"], min(255, pan))
 
         # Tilt
-        if "tilt" not in self.channels:
+        if "tilt" not in layout:
             raise KeyError("No 'tilt' channel defined")
         tilt = max(0, int(tilt))
-        if "tilt_fine" in self.channels:
-            self._values["tilt"] = tilt >> 8
-            self._values["tilt_fine"] = tilt & 0xFF
+        if "tilt_fine" in layout:
+            store(layout["tilt"], min(255, tilt >> 8))
+            store(layout["tilt_fine"], tilt & 0xFF)
         else:
-            self._values["tilt"] = min(255, tilt)
+            store(layout["tilt"], min(255, tilt))
 
     # Hook for subclasses to inject computed values before framing:
     def compute_values(self) -> None:
@@ -144,20 +264,107 @@ class DmxDevice:
 
     def frame(self) -> Dict[int, int]:
         """
-        Returns a dict mapping *relative* channel-offset → 0–255 value.
+        Returns a dict mapping absolute DMX channel → 0–255 value.
         Call compute_values() first, so any dynamic logic runs.
         """
         self.compute_values()
-        # Only include channels that exist in self.channels
+        start = self.start_address
+        values = self._values
+        return {start + off: values[off] for off in self._OFFSETS}
+
+    def attach(self, universe: Universe) -> memoryview:
+        """Bind the device to the span of ``universe`` its layout covers."""
+        self._slot = universe.slot(self.start_address, self._WIDTH)
+        self._pending = universe.pending
+        self._dirty = False
+        self._mark_dirty()
+        return self._slot
+
+    def write(self) -> None:
+        """Run compute_values() and copy the values into the attached slice."""
+        if self._slot is None:
+            raise RuntimeError("Device is not attached to a universe")
+        self.compute_values()
+        # cleared before the copy: a change racing with it re-queues the device
+        self._dirty = False
+        self._slot[:] = self._values
+
+
+DmxDevice._compile_layout()
+
+
+class FrameStats:
+    """Timing of the frames the sender loop started.
+
+    The last ``window`` intervals between frame starts are kept for the
+    achieved rate and jitter (deviation from the nominal interval)
+    percentiles.  ``overruns`` counts frames that finished after the next one
+    was due and ``skipped`` the slots the "skip" policy dropped.  The sender
+    thread updates the stats under a lock and ``summary`` works on a
+    snapshot, so other threads can read it at any time.
+    """
+
+    def __init__(self, interval: float, window: int = 1024) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._intervals = [0.0] * window
+        self._pos = 0
+        self._count = 0
+        self._last: Optional[float] = None
+        self.frames = 0
+        self.overruns = 0
+        self.skipped = 0
+
+    def record(self, started: float) -> None:
+        """Note that a frame started at ``started`` (monotonic seconds)."""
+        with self._lock:
+            if self._last is not None:
+                self._intervals[self._pos] = started - self._last
+                self._pos = (self._pos + 1) % len(self._intervals)
+                self._count = min(self._count + 1, len(self._intervals))
+            self._last = started
+            self.frames += 1
+
+    def overrun(self, skipped: int = 0) -> None:
+        """Note a frame that overran, and the slots dropped after it."""
+        with self._lock:
+            self.overruns += 1
+            self.skipped += skipped
+
+    def summary(self) -> Dict[str, float]:
+        """Return achieved fps, jitter p50/p99/max in ms and the counters."""
+        with self._lock:
+            intervals = self._intervals[: self._count]
+            frames, overruns, skipped = self.frames, self.overruns, self.skipped
+        total = sum(intervals)
+        jitter = sorted(abs(i - self.interval) for i in intervals)
+
+        def pct(q: float) -> float:
+            if not jitter:
+                return 0.0
+            return jitter[min(len(jitter) - 1, int(q / 100.0 * len(jitter)))] * 1e3
+
         return {
-            offset: max(0, min(255, self._values[name]))
-            for name, offset in self.channels.items()
+            "target_fps": 1.0 / self.interval,
+            "fps": len(intervals) / total if total > 0 else 0.0,
+            "jitter_p50_ms": pct(50),
+            "jitter_p99_ms": pct(99),
+            "jitter_max_ms": jitter[-1] * 1e3 if jitter else 0.0,
+            "frames": frames,
+            "overruns": overruns,
+            "skipped": skipped,
         }
 
 
 class DmxSerial:
     """Simple DMX sender using a serial interface."""
 
+    # Break (>=88us) and mark after break (>=8us) as sent by send()
+    BREAK_SECONDS = 0.0001
+    MAB_SECONDS = 0.000012
+    # 1 start bit, 8 data bits and 2 stop bits per slot
+    BITS_PER_SLOT = 11
+
     def __init__(self, port: str = "COM4", baudrate: int = 250000) -> None:
         self.port = port
         self.baudrate = baudrate
@@ -195,21 +402,44 @@ class DmxSerial:
             self._serial.close()
             self._serial = None
 
-    def send(self, values: Dict[int, int]) -> None:
-        """Send DMX values as a full 512 byte frame."""
-        data = bytearray(512)
-        for channel, value in values.items():
-            if 1 <= channel <= 512:
-                data[channel - 1] = max(0, min(255, value))
+    def frame_time(self, slots: int) -> float:
+        """Seconds on the wire for break, MAB, start code and ``slots`` slots."""
+        wire = (slots + 1) * self.BITS_PER_SLOT / self.baudrate
+        return max(MIN_FRAME_SECONDS, self.BREAK_SECONDS + self.MAB_SECONDS + wire)
+
+    def max_fps(self, slots: int) -> float:
+        """Highest refresh rate the link can carry with ``slots`` slots."""
+        return 1.0 / self.frame_time(slots)
+
+    def write_frame(self, frame: Universe | bytes | bytearray | memoryview) -> None:
+        """Start one frame: break, MAB, then the start code and slots.
+
+        ``frame`` is a ``Universe`` (all 512 slots), its ``buffer`` or a
+        shorter ``packet``; it is written to the port as is, without copying.
+        """
         if self._serial is None:
             return
-        # Break (>=88us) and mark after break (>=8us)
+        if isinstance(frame, Universe):
+            frame = frame.buffer
         self._serial.break_condition = True
-        time.sleep(0.0001)
+        time.sleep(self.BREAK_SECONDS)
         self._serial.break_condition = False
-        time.sleep(0.000012)
-        # Start code (0) + data
-        self._serial.write(bytes([0]) + data)
+        time.sleep(self.MAB_SECONDS)
+        self._serial.write(frame)
+
+    def flush(self) -> None:
+        """Wait until the port has transmitted everything written to it."""
+        if self._serial is not None:
+            self._serial.flush()
+
+    def send(self, frame: Universe | bytes | bytearray | memoryview) -> None:
+        """Send a frame and wait for it to leave the OS buffer.
+
+        Waiting keeps frames from queuing up behind each other, which would
+        delay every change by the length of the queue.
+        """
+        self.write_frame(frame)
+        self.flush()
 
 
 class DMX:
@@ -223,14 +453,27 @@ class DMX:
         port: str = "COM4",
         fps: int = 44,
         pre_send: Callable[["DMX"], None] | None = None,
+        policy: str = "skip",
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         """Create a DMX controller.
 
         ``pre_send`` is an optional callback executed in the sending thread
         right before each frame is transmitted. It can update device values
         without risking a backlog of pending frames.
+
+        Frames are sent on absolute deadlines ``1 / fps`` apart on ``clock``,
+        so send and callback time do not stretch the period; ``policy`` (one
+        of ``SCHEDULE_POLICIES``) decides what happens after an overrun.
+
+        Frames stop at the highest channel any device uses (at least
+        ``MIN_SLOTS``).  ``fps`` is capped at the rate the link can carry with
+        that many slots, with a warning when it asks for more.
         """
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"Unknown schedule policy: {policy!r}")
 
+        self.universe = Universe()
         self.devices: list[DmxDevice] = []
         self.groups: Dict[str, list[DmxDevice]] = {}
         for item in devices:
@@ -242,54 +485,126 @@ class DMX:
                 if isinstance(names, (str, bytes)):
                     names = [names]
             device = cls(addr)
+            device.attach(self.universe)
             self.devices.append(device)
             if names:
                 for name in names:
                     self.groups.setdefault(name, []).append(device)
 
+        self._dynamic = [device for device in self.devices if device._DYNAMIC]
         self.serial = DmxSerial(port)
+        self.slots = max(
+            [MIN_SLOTS]
+            + [device.start_address + device._WIDTH - 1 for device in self.devices]
+        )
+        self._packet = self.universe.packet(self.slots)
+        # what the port sends: a copy of the packet taken under the lock
+        self._frame = bytearray(len(self._packet))
+        self.max_fps = self.serial.max_fps(self.slots)
+        if fps > self.max_fps:
+            logger.warning(
+                "DMX: %s fps requested but %d slots at %d baud allow at most "
+                "%.1f fps; sending at that rate",
+                fps,
+                self.slots,
+                self.serial.baudrate,
+                self.max_fps,
+            )
+            fps = self.max_fps
+        self.fps = float(fps)
         self.interval = 1.0 / float(fps)
-        self._frame: Dict[int, int] = {}
+        self.policy = policy
+        self.clock = clock
+        self.frame_stats = FrameStats(self.interval)
+        self._behind = 0
         self._lock = threading.Lock()
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self.pre_send = pre_send
 
     def reset(self) -> None:
-        """Reset all device channels to zero and store the frame."""
+        """Reset all device channels to zero; the next update() writes them."""
         for device in self.devices:
             device.reset()
-        self.update()
 
-    def _compute_frame(self) -> Dict[int, int]:
-        frame: Dict[int, int] = {}
-        for device in self.devices:
-            frame.update(device.frame())
-        return frame
+    def update(self) -> int:
+        """Write changed devices into the universe buffer.
 
-    def update(self) -> None:
-        """Compute the current frame from devices and store it."""
-        frame = self._compute_frame()
+        Only devices queued by a setter since the last call, plus those with
+        their own compute_values(), are rewritten, so the cost follows what
+        changed rather than the size of the rig.  Returns the number of
+        devices written.
+        """
+        pending = self.universe.pending
         with self._lock:
-            self._frame = frame
+            for device in self._dynamic:
+                device.write()
+            written = len(self._dynamic)
+            while pending:
+                device = pending.pop()
+                # a dynamic device may already have been written above
+                if device._dirty:
+                    device.write()
+                    written += 1
+        return written
+
+    def frame(self) -> Dict[int, int]:
+        """Return the non-zero channels of the current frame as a dict."""
+        with self._lock:
+            return {ch: v for ch, v in enumerate(self.universe.data, 1) if v}
 
     def send_frame(self) -> None:
+        """Commit pending changes and transmit one frame.
+
+        Only the copy of the packet into the outgoing buffer holds the lock,
+        so update() never waits for the break, MAB or the port.
+        """
         self.update()
         with self._lock:
-            frame = dict(self._frame)
-        self.serial.send(frame)
+            self._frame[:] = self._packet
+        self.serial.send(self._frame)
+
+    def _tick(self) -> None:
+        """Run pre_send, then send one frame."""
+        if self.pre_send:
+            try:
+                self.pre_send(self)
+            except Exception:
+                pass
+        self.send_frame()
+
+    def _next_deadline(self, deadline: float, now: float) -> float:
+        """Return the deadline after the frame due at ``deadline``.
+
+        Deadlines stay on the grid ``deadline + k * interval``; when ``now``
+        is already past the next one the frame overran and ``policy`` picks
+        the slot to send next.
+        """
+        interval = self.interval
+        deadline += interval
+        if now <= deadline:
+            self._behind = 0
+            return deadline
+        if self.policy == "catch_up" and self._behind < MAX_CATCH_UP:
+            self.frame_stats.overrun()
+            self._behind += 1
+            return deadline
+        # slots after ``deadline`` that are already due as well
+        late = int((now - deadline) / interval)
+        self.frame_stats.overrun(late)
+        self._behind = 0
+        return deadline + late * interval
 
     def _loop(self) -> None:
+        clock = self.clock
+        deadline = clock()
         while self._running:
-            if self.pre_send:
-                try:
-                    self.pre_send(self)
-                except Exception:
-                    pass
-            with self._lock:
-                frame = dict(self._frame)
-            self.serial.send(frame)
-            time.sleep(self.interval)
+            self.frame_stats.record(clock())
+            self._tick()
+            deadline = self._next_deadline(deadline, clock())
+            delay = deadline - clock()
+            if delay > 0:
+                time.sleep(delay)
 
     def start(self) -> None:
         if not self._running:
@@ -43,3 +43,31 @@ def test_start_to_intermission_blocked():
     changed = det._set_state(SongState.INTERMISSION, now=0.0)
     assert changed is False
     assert det.state is SongState.STARTING
+
+
+def test_timbre_is_only_fed_while_a_song_starts():
+    det = BeatDetector(
+        amplitude_threshold=0.1, start_duration=1.0, end_duration=1.0, governor=False
+    )
+    loud = np.ones(512, dtype=np.float32) * 0.2
+    det.process(loud, now=0.0)
+    assert det.state is SongState.STARTING
+    det.process(loud, now=0.5)
+    assert det.timbre.frames == 1
+    det.process(loud, now=1.1)
+    assert det.state is SongState.ONGOING
+    det.process(loud, now=1.2)
+    list(det.iter_blocks(np.stack([loud, loud]), np.array([1.3, 1.4])))
+    assert det.timbre.frames == 2
+
+
+def test_governor_halves_timbre_updates_at_its_last_level():
+    det = BeatDetector(amplitude_threshold=0.1, start_duration=10.0, end_duration=1.0)
+    det.governor.level = det.governor.max_level
+    loud = np.ones(512, dtype=np.float32) * 0.2
+    det.process(loud, now=0.0)
+    assert det.state is SongState.STARTING
+    for i in range(4):
+        det.process(loud, now=0.1 * (i + 1))
+    list(det.iter_blocks(np.stack([loud] * 4), np.arange(4) * 0.01 + 0.5))
+    assert det.timbre.frames == 4
@@ -0,0 +1,45 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks import bench_genre_classifier as bench
+
+
+def test_summary_counts_top_k_and_confusion():
+    truth = ["rock", "jazz", "rock"]
+    ranked = [["rock", "metal"], ["blues", "metal", "jazz"], ["metal", "pop", "disco"]]
+    report = bench.summarize(truth, ranked, [0.01, 0.02, 0.03])
+    assert report["top1"] == pytest.approx(1 / 3)
+    assert report["top3"] == pytest.approx(2 / 3)
+    assert report["confusion"]["rock"]["metal"] == 1
+    assert report["confusion"]["jazz"]["blues"] == 1
+    assert report["latency_ms"]["p50"] == pytest.approx(20.0)
+    assert bench.canonical("4") == "rock"
+
+
+def test_tiny_model_run_writes_json(tmp_path):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    import soundfile as sf
+
+    rng = np.random.default_rng(0)
+    for genre in ("rock", "jazz"):
+        (tmp_path / "clips" / genre).mkdir(parents=True)
+        for i in range(2):
+            sf.write(
+                tmp_path / "clips" / genre / f"{i}.wav",
+                0.1 * rng.standard_normal(16000),
+                16000,
+            )
+    out = tmp_path / "run.json"
+    bench.main([str(tmp_path / "clips"), "--tiny", "--seconds", "1", "--out", str(out)])
+    report = json.loads(out.read_text())
+    assert report["clips"] == 4
+    assert report["backend"] in ("torch", "pipeline")
+    assert 0.0 <= report["top1"] <= report["top3"] <= 1.0
+    assert report["cold_first_call_s"] > 0
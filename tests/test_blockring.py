@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.audio.blockring import BlockRing
+
+
+def test_ring_coalesces_backlog_and_counts_drops():
+    ring = BlockRing(capacity=4, block_size=8)
+    for i in range(6):
+        ring.push(np.full(8, i, dtype=np.float32))
+    assert ring.drops == 2
+    assert ring.depth == ring.max_depth == 4
+
+    batch = ring.peek()
+    assert batch.shape == (4, 8)
+    assert list(batch[:, 0]) == [0, 1, 2, 3]
+    ring.release(len(batch))
+    assert ring.depth == 0 and ring.coalesced == 1
+
+    # a wrapped backlog is returned as two contiguous runs
+    for value in (10, 11, 12):
+        ring.push(np.full(8, value, dtype=np.float32))
+    assert len(ring.peek(max_blocks=2)) == 2
+    ring.release(2)
+    for value in (13, 14):
+        ring.push(np.full(8, value, dtype=np.float32))
+    ring.push(np.full(3, 15, dtype=np.float32))
+    first = ring.peek()
+    ring.release(len(first))
+    rest = ring.peek()
+    assert list(first[:, 0]) == [12, 13]
+    assert list(rest[:, 0]) == [14, 15]
+    assert list(rest[-1]) == [15, 15, 15, 0, 0, 0, 0, 0]
+    ring.release(len(rest))
+    assert len(ring.peek()) == 0
+    assert ring.stats()["drops"] == 2
+
+
+def test_wait_wakes_on_push_and_times_out_when_idle():
+    ring = BlockRing(capacity=4, block_size=8)
+    assert ring.wait(timeout=0.01) is False
+
+    pusher = threading.Timer(0.05, ring.push, [np.ones(8, dtype=np.float32)])
+    start = time.perf_counter()
+    pusher.start()
+    assert ring.wait(timeout=5.0) is True
+    assert time.perf_counter() - start < 1.0
+    # pending blocks return at once until they are released
+    assert ring.wait(timeout=5.0) is True
+    ring.release(len(ring.peek()))
+    assert ring.wait(timeout=0.01) is False
@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+
+from dmx.dmx import DMX, MAX_CATCH_UP, MIN_SLOTS, DmxSerial, FrameStats, Universe
+from dmx.Prolights_LumiPar7UTRI_3ch import Prolights_LumiPar7UTRI_3ch
+from dmx.WhatSoftware_Generic_4ch import WhatSoftware_Generic_4ch
+
+
+class FakePort:
+    def __init__(self):
+        self.break_condition = False
+        self.written = []
+        self.calls = []
+
+    def write(self, data):
+        self.written.append(data)
+        self.calls.append("write")
+
+    def flush(self):
+        self.calls.append("flush")
+
+
+def test_universe_buffer_holds_start_code_and_slots():
+    universe = Universe()
+    assert len(universe.buffer) == 513
+    view = universe.slot(510, 3)
+    view[2] = 200
+    assert universe[512] == 200
+    assert universe.buffer[0] == 0
+    universe.clear()
+    assert universe[512] == 0
+    with pytest.raises(ValueError):
+        universe.slot(511, 3)
+    with pytest.raises(ValueError):
+        universe.slot(0, 1)
+
+
+def test_devices_write_into_their_slice():
+    ctrl = DMX(
+        [(Prolights_LumiPar7UTRI_3ch, 1), (WhatSoftware_Generic_4ch, 10)],
+        port="none",
+    )
+    lamp, fog = ctrl.devices
+    for name, value in (("red", 10), ("green", 20), ("blue", 30)):
+        lamp.set_channel(name, value)
+    fog.set_channel("fog", 255)
+    ctrl.update()
+    assert bytes(ctrl.universe.buffer[:4]) == bytes([0, 10, 20, 30])
+    assert ctrl.universe[10] == 255
+    assert ctrl.frame() == {1: 10, 2: 20, 3: 30, 10: 255}
+    # values only reach the buffer on update()
+    lamp.set_channel("red", 99)
+    assert ctrl.universe[1] == 10
+
+
+def test_sender_reuses_one_frame_buffer():
+    ctrl = DMX([(Prolights_LumiPar7UTRI_3ch, 1)], port="none")
+    port = FakePort()
+    ctrl.serial._serial = port
+    ctrl.devices[0].set_channel("blue", 7)
+    ctrl.send_frame()
+    ctrl.send_frame()
+    first, second = port.written
+    assert first is second is ctrl._frame
+    assert bytes(first[:4]) == bytes([0, 0, 0, 7])
+    assert port.calls == ["write", "flush", "write", "flush"]
+
+
+def test_port_io_runs_outside_the_lock():
+    ctrl = DMX([(Prolights_LumiPar7UTRI_3ch, 1)], port="none")
+    held = []
+
+    class LockCheckingPort(FakePort):
+        def write(self, data):
+            held.append(ctrl._lock.locked())
+            super().write(data)
+
+        def flush(self):
+            held.append(ctrl._lock.locked())
+            super().flush()
+
+    ctrl.serial._serial = LockCheckingPort()
+    ctrl.devices[0].set_channel("red", 1)
+    ctrl._tick()
+    assert held == [False, False]
+    assert ctrl._frame[1] == 1
+
+
+def test_sender_accepts_a_raw_frame():
+    sender = DmxSerial("none")
+    port = FakePort()
+    sender._serial = port
+    frame = bytearray(513)
+    sender.send(frame)
+    assert port.written[0] is frame
+
+
+def test_layout_is_compiled_per_class_and_values_are_compact():
+    a = Prolights_LumiPar7UTRI_3ch(1)
+    b = Prolights_LumiPar7UTRI_3ch(40)
+    assert a._LAYOUT is b._LAYOUT
+    assert not hasattr(a, "__dict__")
+    assert isinstance(a._values, bytearray) and len(a._values) == 3
+    assert b.channels == {"red": 40, "green": 41, "blue": 42}
+    with pytest.raises(AttributeError):
+        a.extra = 1
+
+
+def test_setters_clamp_and_approximate_missing_colours():
+    lamp = Prolights_LumiPar7UTRI_3ch(1)
+    lamp.set_channel("red", 300)
+    assert lamp.get_channel("red") == 255
+    lamp.set_channel("amber", 200)
+    assert lamp.frame() == {1: 200, 2: 100, 3: 0}
+    lamp.set_channel("warm_white", -5)
+    assert lamp.frame() == {1: 0, 2: 0, 3: 0}
+    lamp.set_color(1, 2, 3, uv=9)
+    # white=0 falls back to RGB, as it always has
+    assert lamp.frame() == {1: 0, 2: 0, 3: 0}
+    with pytest.raises(KeyError):
+        lamp.set_channel("fog", 1)
+    assert lamp.get_channel("fog") == 0
+
+
+def test_update_writes_only_changed_devices():
+    ctrl = DMX([(Prolights_LumiPar7UTRI_3ch, 1 + 3 * i) for i in range(50)], port="none")
+    assert ctrl.update() == 50  # freshly attached devices
+    assert ctrl.update() == 0
+    ctrl.devices[7].set_channel("red", 5)
+    ctrl.devices[7].set_channel("green", 6)
+    ctrl.devices[9].set_channel("blue", 0)  # unchanged value
+    assert ctrl.update() == 1
+    assert ctrl.universe[22] == 5 and ctrl.universe[23] == 6
+    ctrl.reset()
+    # reset is deferred to the next commit and only touches non-zero devices
+    assert ctrl.universe[22] == 5
+    assert ctrl.update() == 1
+    assert ctrl.universe[22] == 0
+
+
+def test_dynamic_devices_are_written_every_update():
+    class Chase(Prolights_LumiPar7UTRI_3ch):
+        __slots__ = ("step",)
+
+        def __init__(self, start_address):
+            super().__init__(start_address)
+            self.step = 0
+
+        def compute_values(self):
+            self.step += 1
+            self.set_channel("red", self.step)
+
+    ctrl = DMX([(Chase, 1), (Prolights_LumiPar7UTRI_3ch, 4)], port="none")
+    ctrl.update()
+    assert ctrl.update() == 1
+    assert ctrl.universe[1] == 2
+    assert ctrl.universe.pending == []
+
+
+def test_deadlines_stay_on_the_grid():
+    ctrl = DMX([], port="none", fps=50)
+    # a frame that finishes early or on time keeps the absolute schedule
+    assert ctrl._next_deadline(1.0, 1.005) == pytest.approx(1.02)
+    assert ctrl._next_deadline(1.02, 1.04) == pytest.approx(1.04)
+    assert ctrl.frame_stats.overruns == 0
+
+
+def test_skip_policy_drops_missed_slots():
+    ctrl = DMX([], port="none", fps=50, policy="skip")
+    # next slot was due at 1.02; 1.04 and 1.06 have passed too
+    assert ctrl._next_deadline(1.0, 1.065) == pytest.approx(1.06)
+    assert ctrl.frame_stats.overruns == 1
+    assert ctrl.frame_stats.skipped == 2
+
+
+def test_catch_up_policy_sends_missed_frames_then_resyncs():
+    ctrl = DMX([], port="none", fps=50, policy="catch_up")
+    deadline = 1.0
+    now = 1.205
+    for _ in range(MAX_CATCH_UP):
+        deadline = ctrl._next_deadline(deadline, now)
+    assert deadline == pytest.approx(1.0 + 0.02 * MAX_CATCH_UP)
+    assert ctrl.frame_stats.skipped == 0
+    # still behind after the burst: jump to the latest due slot
+    assert ctrl._next_deadline(deadline, now) == pytest.approx(1.2)
+    assert ctrl.frame_stats.overruns == MAX_CATCH_UP + 1
+    with pytest.raises(ValueError):
+        DMX([], port="none", policy="later")
+
+
+def test_frame_stats_summary():
+    stats = FrameStats(0.02)
+    for t in (0.0, 0.02, 0.041, 0.06, 0.08):
+        stats.record(t)
+    summary = stats.summary()
+    assert summary["frames"] == 5
+    assert summary["fps"] == pytest.approx(50.0)
+    assert summary["jitter_max_ms"] == pytest.approx(1.0)
+    assert summary["jitter_p50_ms"] == pytest.approx(1.0)
+
+
+def test_send_time_does_not_lower_the_frame_rate():
+    def slow(_ctrl):
+        time.sleep(0.008)
+
+    ctrl = DMX([], port="none", fps=50, pre_send=slow)
+    ctrl.start()
+    time.sleep(0.6)
+    ctrl.stop()
+    # sleeping a full interval after each 8 ms tick would give about 21
+    assert ctrl.frame_stats.frames >= 27
+    assert ctrl.frame_stats.summary()["fps"] == pytest.approx(50.0, rel=0.1)
+
+
+def test_frames_stop_at_the_highest_patched_channel():
+    ctrl = DMX(
+        [(Prolights_LumiPar7UTRI_3ch, 1), (WhatSoftware_Generic_4ch, 78)],
+        port="none",
+    )
+    assert ctrl.slots == 81
+    port = FakePort()
+    ctrl.serial._serial = port
+    ctrl.send_frame()
+    assert len(port.written[0]) == 82
+    small = DMX([(Prolights_LumiPar7UTRI_3ch, 1)], port="none")
+    assert small.slots == MIN_SLOTS
+
+
+def test_fps_is_capped_at_what_the_link_carries(caplog):
+    sender = DmxSerial("none")
+    # 513 slots of 44 us plus break and MAB
+    assert sender.max_fps(512) == pytest.approx(44.1, abs=0.1)
+    assert sender.max_fps(81) > 250
+    with caplog.at_level("WARNING"):
+        full = DMX([(WhatSoftware_Generic_4ch, 509)], port="none", fps=60)
+    assert full.fps == pytest.approx(full.max_fps)
+    assert full.interval == pytest.approx(1 / full.max_fps)
+    assert "at most" in caplog.text
+    caplog.clear()
+    with caplog.at_level("WARNING"):
+        short = DMX([(WhatSoftware_Generic_4ch, 78)], port="none", fps=60)
+    assert short.fps == 60
+    assert caplog.text == ""
+
+
+def test_frame_stats_summary_is_a_consistent_snapshot():
+    import threading
+
+    stats = FrameStats(0.001, window=64)
+    stop = threading.Event()
+
+    def sender():
+        t = 0.0
+        while not stop.is_set():
+            t += 0.001
+            stats.record(t)
+            stats.overrun(1)
+
+    thread = threading.Thread(target=sender)
+    thread.start()
+    try:
+        for _ in range(200):
+            summary = stats.summary()
+            assert summary["skipped"] == summary["overruns"]
+            assert summary["frames"] >= summary["overruns"]
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,101 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.audio.features import SpectralFrame
+
+
+def _sine(freq, amp=0.5, n=512, sr=44100):
+    t = np.arange(n) / sr
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_rms_and_centroid_from_shared_spectrum():
+    frame = SpectralFrame(512, 44100)
+    frame.analyze(_sine(1033.6))
+    assert abs(frame.rms - 0.5 / np.sqrt(2)) < 0.02
+    assert abs(frame.centroid() - 1033.6) < 150
+
+
+def test_flatness_separates_noise_from_tone():
+    frame = SpectralFrame(512, 44100)
+    frame.analyze(_sine(2000.0))
+    tone = frame.flatness
+    noise = np.random.default_rng(1).standard_normal(512).astype(np.float32)
+    frame.analyze(noise)
+    assert frame.flatness > 10 * tone
+
+
+def test_tone_is_mostly_harmonic():
+    frame = SpectralFrame(512, 44100)
+    frame.analyze(_sine(440.0))
+    assert frame.harmonic_energy > frame.percussive_energy
+
+
+def test_silence_and_block_size_change():
+    frame = SpectralFrame(512, 44100)
+    frame.analyze(np.zeros(256, dtype=np.float32))
+    assert frame.n_fft == 256
+    assert frame.rms == 0.0
+    assert frame.centroid() == 0.0
+
+
+def test_empty_batch_returns_empty_features():
+    frame = SpectralFrame(512, 44100)
+    frame.analyze(_sine(440.0))
+    rms = frame.rms
+    features = frame.analyze_blocks(np.zeros((0, 512), dtype=np.float32))
+    assert len(features.rms) == 0
+    assert features.power.shape == (0, 257)
+    assert frame.rms == rms
+
+
+def test_streaming_median_matches_window():
+    from src.audio.hpss import StreamingHPSS
+
+    rng = np.random.default_rng(2)
+    hpss = StreamingHPSS(n_bins=16, n_frames=7, percussive_kernel=3)
+    columns = rng.random((40, 16))
+    # duplicates exercise removal of equal values
+    columns[::5] = columns[1::5]
+    for i, col in enumerate(columns):
+        hpss.update(col)
+        window = columns[max(0, i - 6) : i + 1]
+        if i < 6:
+            window = np.vstack([np.repeat(columns[:1], 6 - i, axis=0), window])
+        assert np.allclose(hpss.harmonic, np.median(window, axis=0))
+
+
+def test_clicks_are_percussive_and_tones_harmonic():
+    frame = SpectralFrame(512, 44100)
+    tone = _sine(440.0)
+    for _ in range(40):
+        frame.analyze(tone)
+    assert frame.harmonic_energy > frame.percussive_energy
+
+    frame = SpectralFrame(512, 44100)
+    click = np.zeros(512, dtype=np.float32)
+    click[256] = 1.0
+    quiet = np.random.default_rng(3).standard_normal(512).astype(np.float32) * 1e-4
+    for i in range(40):
+        frame.analyze(click if i % 8 == 7 else quiet)
+    assert frame.percussive_energy > frame.harmonic_energy
+
+
+def test_batch_hpss_mask_matches_skipped_separate():
+    rng = np.random.default_rng(3)
+    blocks = rng.standard_normal((40, 512)).astype(np.float32)
+    blocks[::5] *= 4.0
+    mask = np.arange(len(blocks)) % 3 == 1
+    live = SpectralFrame(512, 44100)
+    expected = []
+    for block, run in zip(blocks, mask):
+        live.transform(block)
+        if run:
+            live.separate()
+        expected.append((live.harmonic_energy, live.percussive_energy))
+    batch = SpectralFrame(512, 44100).analyze_blocks(blocks, mask)
+    assert np.allclose(batch.harmonic_energy, [h for h, _ in expected])
+    assert np.allclose(batch.percussive_energy, [p for _, p in expected])
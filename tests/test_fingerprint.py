@@ -0,0 +1,131 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.audio.fingerprint import FingerprintCache, fingerprint
+
+
+def _song(seed, seconds=8, sr=16000):
+    rng = np.random.default_rng(seed)
+    n = seconds * sr
+    t = np.arange(n) / sr
+    x = np.zeros(n)
+    for i, freq in enumerate(rng.uniform(100, 3000, 40)):
+        start = i * n // 40
+        end = min(n, start + sr // 2)
+        x[start:end] += np.sin(2 * np.pi * freq * t[start:end]) * np.exp(
+            -np.arange(end - start) / 4000
+        )
+    x += rng.standard_normal(n) * 0.3 * (np.arange(n) % 8000 < 400)
+    return x.astype(np.float32)
+
+
+def test_shifted_clip_hits_and_other_song_misses(tmp_path):
+    cache = FingerprintCache(tmp_path / "cache.npz", capacity=10)
+    songs = [_song(i) for i in range(5)]
+    for i, song in enumerate(songs):
+        cache.store(fingerprint(song[: 5 * 16000]), f"genre{i}", 0.9)
+    later = songs[3][3000 : 3000 + 5 * 16000]
+    assert cache.lookup(fingerprint(later))[:2] == ("genre3", 0.9)
+    assert cache.lookup(fingerprint(_song(99)[: 5 * 16000])) is None
+    assert cache.hits == 1 and cache.misses == 1 and cache.hit_rate == 0.5
+    assert cache.lookup_time.count == 2
+
+    cache.flush()
+    reloaded = FingerprintCache(tmp_path / "cache.npz", capacity=10)
+    assert len(reloaded) == 5
+    assert reloaded.lookup(fingerprint(later))[0] == "genre3"
+
+
+def test_lru_eviction_and_confidence_floor():
+    cache = FingerprintCache(capacity=2, min_confidence=0.5)
+    a, b, c = (fingerprint(_song(i)[: 5 * 16000]) for i in range(3))
+    cache.store(a, "rock", 0.9)
+    cache.store(b, "jazz", 0.2)
+    assert cache.lookup(a)[0] == "rock"  # refreshes "rock"
+    assert cache.lookup(b) is None  # below min_confidence
+    cache.store(c, "pop", 0.9)  # evicts "jazz", the least recently used
+    assert [e.label for e in cache.entries.values()] == ["rock", "pop"]
+
+
+def test_show_skips_model_for_cached_song():
+    from replay import ReplayShow
+
+    class CountingModel:
+        calls = 0
+        last_score = 0.8
+
+        def classify(self, samples, samplerate):
+            CountingModel.calls += 1
+            return "metal"
+
+    model = CountingModel()
+    show = ReplayShow(
+        dashboard=False,
+        genre_model=model,
+        genre_cache=FingerprintCache(),
+        debug_log_path=os.devnull,
+    )
+    clip = _song(7)
+    show.pre_song_buffer.write(clip[: 5 * 16000])
+    show._launch_genre_classifier_immediately()
+    assert model.calls == 1 and len(show.genre_cache) == 1
+
+    show.song_id += 1
+    show.last_genre = None
+    show.pre_song_buffer.clear()
+    show.pre_song_buffer.write(clip[2000 : 2000 + 5 * 16000])
+    show._launch_genre_classifier_immediately()
+    assert model.calls == 1
+    assert show.genre_label == "metal"
+    assert show.genre_cache.hits == 1
+
+
+def test_live_show_looks_up_the_cache_off_the_audio_thread():
+    import threading
+
+    from main import BeatDMXShow
+
+    class ThreadModel:
+        last_score = 0.8
+
+        def __init__(self):
+            self.threads = []
+
+        def classify(self, samples, samplerate):
+            self.threads.append(threading.current_thread())
+            return "metal"
+
+    model = ThreadModel()
+    cache = FingerprintCache()
+    show = BeatDMXShow(
+        dashboard=False, genre_model=model, genre_cache=cache, debug_log_path=os.devnull
+    )
+    lookups = []
+    lookup = show._cache_lookup
+
+    def tracked_lookup(samples):
+        lookups.append(threading.current_thread())
+        return lookup(samples)
+
+    show._cache_lookup = tracked_lookup
+    show.pre_song_buffer.write(_song(3)[: 5 * 16000])
+    show._launch_genre_classifier_immediately()
+    assert show.cache_jobs.join(30) and show.classifier_jobs.join(30)
+    assert lookups[0] is not threading.current_thread()
+    assert len(model.threads) == 1 and show.genre_label == "metal"
+    assert len(cache) == 1
+
+
+def test_store_merges_into_the_index_and_saves_in_background(tmp_path):
+    cache = FingerprintCache(tmp_path / "cache.npz", capacity=2)
+    prints = [fingerprint(_song(i)[: 5 * 16000]) for i in range(3)]
+    for i, hashes in enumerate(prints):
+        cache.store(hashes, f"genre{i}")
+    expected = np.sort(np.concatenate(prints[1:]))
+    assert np.array_equal(cache._hashes, expected)
+    assert set(cache._owners.tolist()) == {1, 2}
+    cache.flush()
+    assert len(FingerprintCache(tmp_path / "cache.npz")) == 2
@@ -0,0 +1,112 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import numpy as np
+import pytest
+
+from src.audio.genre_backends import (
+    InferenceBackend,
+    OnnxBackend,
+    _LogitsBackend,
+    load_backend,
+)
+
+
+class FakeSession:
+    def __init__(self):
+        self.inputs = None
+
+    def run(self, outputs, feeds):
+        (self.inputs,) = feeds.values()
+        return [np.array([[0.0, 3.0, 1.0]], dtype=np.float32)]
+
+
+def test_onnx_backend_normalises_and_ranks_labels():
+    backend = OnnxBackend("unused")
+    backend._session = FakeSession()
+    backend._input = "input_values"
+    backend.labels = {0: "disco", 1: "metal", 2: "reggae"}
+    result = backend.predict(np.linspace(1.0, 3.0, 100, dtype=np.float32))
+    assert [r["label"] for r in result] == ["metal", "reggae", "disco"]
+    assert sum(r["score"] for r in result) == pytest.approx(1.0)
+    fed = backend._session.inputs
+    assert fed.shape == (1, 100)
+    assert abs(fed.mean()) < 1e-5 and fed.std() == pytest.approx(1.0, rel=1e-3)
+
+
+class SevenLabelBackend(_LogitsBackend):
+    def probabilities(self, batch):
+        return np.tile(np.linspace(0.01, 0.27, 7), (len(batch), 1))
+
+
+def test_logits_backend_returns_every_label():
+    backend = SevenLabelBackend("unused")
+    backend.labels = {i: f"genre{i}" for i in range(7)}
+    result = backend.predict(np.zeros(100, dtype=np.float32))
+    assert len(result) == len(backend.labels)
+    assert [r["label"] for r in result] == [f"genre{i}" for i in range(6, -1, -1)]
+    assert len(InferenceBackend.predict_batch(backend, np.zeros((2, 100)))[1]) == 7
+
+
+def test_onnx_backend_requires_exported_graph(tmp_path):
+    pytest.importorskip("onnxruntime")
+    (tmp_path / "config.json").write_text(json.dumps({"id2label": {"0": "rock"}}))
+    with pytest.raises(FileNotFoundError):
+        load_backend("onnx", tmp_path)
+
+
+def test_backends_must_implement_inference():
+    class NoPredict(InferenceBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoPredict("unused")
+
+
+def test_auto_falls_back_when_a_graph_fails_to_load(tmp_path, monkeypatch, caplog):
+    from src.audio import genre_backends
+
+    def corrupt(self):
+        raise RuntimeError("invalid protobuf")
+
+    monkeypatch.setattr(genre_backends.OnnxBackend, "load", corrupt)
+    monkeypatch.setattr(genre_backends.TorchBackend, "load", lambda self: None)
+    with caplog.at_level("WARNING"):
+        backend = load_backend("auto", tmp_path)
+    assert isinstance(backend, genre_backends.TorchBackend)
+    assert "invalid protobuf" in caplog.text
+    with pytest.raises(RuntimeError):
+        load_backend("onnx", tmp_path)
+
+
+def test_unknown_backend_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        load_backend("tensorrt", tmp_path)
+
+
+def test_torch_backend_reuses_its_input_buffer():
+    torch = pytest.importorskip("torch")
+    from types import SimpleNamespace
+
+    from src.audio.genre_backends import TorchBackend
+
+    class FakeModel(torch.nn.Module):
+        def forward(self, x):
+            self.seen = x
+            return SimpleNamespace(logits=torch.stack([x.mean(1), x.std(1) * 2], 1))
+
+    backend = TorchBackend("unused", capacity=400)
+    backend._torch = torch
+    backend._model = FakeModel()
+    backend.labels = {0: "jazz", 1: "rock"}
+    backend._reserve(backend._capacity)
+    buffer = backend._buffer
+    scores = backend.predict_batch(np.random.default_rng(0).normal(size=(2, 150)))
+    assert backend._buffer is buffer
+    assert backend._model.seen.data_ptr() == torch.from_numpy(buffer).data_ptr()
+    assert scores[0]["rock"] > scores[0]["jazz"]
+    assert sum(scores[1].values()) == pytest.approx(1.0)
+    assert backend.forward_time.count == 1 and backend.overhead.count == 1
@@ -0,0 +1,149 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from concurrent.futures import Future
+from types import MethodType
+
+import numpy as np
+import pytest
+
+import parameters
+from src.audio.beat_detection import SongState
+from src.audio.genre_vote import GenreVote
+
+
+def test_vote_waits_for_margin_and_settles_at_max_windows():
+    vote = GenreVote(margin=0.3, min_windows=2, max_windows=3)
+    vote.add({"rock": 0.9, "pop": 0.1})
+    assert vote.decision() is None  # one window is never enough
+    vote.add({"rock": 0.8, "pop": 0.2})
+    assert vote.decision() == "rock"
+
+    close = GenreVote(margin=0.3, min_windows=2, max_windows=3)
+    for probs in ({"jazz": 0.5, "blues": 0.5}, {"jazz": 0.6, "blues": 0.4}):
+        close.add(probs)
+    assert close.decision() is None and not close.done
+    close.add({"jazz": 0.55, "blues": 0.45})
+    assert close.done and close.best() == "jazz"
+    assert close.posterior()["jazz"] == pytest.approx(0.55)
+
+
+class WindowModel:
+    def __init__(self, probs):
+        self.probs = probs
+        self.batches = []
+
+    def classify(self, samples, samplerate):
+        raise AssertionError("windowed voting should not use classify")
+
+    def score_windows(self, windows, samplerate):
+        self.batches.append(len(windows))
+        return [dict(self.probs) for _ in windows]
+
+
+def _run_song(model, seconds=5.0, genre_cache=None):
+    from main import DMX
+    from replay import ReplayShow, VirtualClock
+
+    clock = VirtualClock()
+    show = ReplayShow(
+        dashboard=False,
+        genre_model=model,
+        genre_cache=genre_cache,
+        clock=clock,
+        debug_log_path=os.devnull,
+    )
+    show._attach_controller(DMX(parameters.DEVICES, port=parameters.COM_PORT))
+    show._handle_state_change(SongState.STARTING)
+    step = 4000  # 0.25 s at 16 kHz
+    chunk = np.random.default_rng(0).standard_normal(step).astype(np.float32) * 0.1
+    for i in range(int(seconds * 16000 / step)):
+        clock.set((i + 1) * 0.25)
+        show.pre_song_buffer.write(chunk)
+        if show.vote is not None:
+            show._advance_vote()
+        if show.last_genre is not None:
+            return show, clock.now
+    return show, None
+
+
+def test_confident_song_commits_before_five_seconds():
+    model = WindowModel({"metal": 0.9, "rock": 0.1})
+    show, committed = _run_song(model)
+    assert show.genre_label == "metal"
+    assert show.current_state is SongState.ONGOING
+    assert committed == 2.25  # two 1.5 s windows with a 0.75 s hop
+    assert model.batches == [1, 1]
+
+
+def test_ambiguous_song_uses_all_windows():
+    model = WindowModel({"jazz": 0.55, "blues": 0.45})
+    show, committed = _run_song(model)
+    assert show.genre_label == "jazz"
+    assert committed is not None and committed <= 5.0
+    assert sum(model.batches) == 5
+
+
+def test_voted_label_is_cached_with_its_vote_probability():
+    from src.audio.fingerprint import FingerprintCache
+
+    model = WindowModel({"metal": 0.9, "rock": 0.1})
+    model.last_score = 0.01  # stale: score_windows never updates it
+    cache = FingerprintCache()
+    show, committed = _run_song(model, genre_cache=cache)
+    assert committed is not None
+    (entry,) = cache.entries.values()
+    assert entry.label == "metal"
+    assert entry.confidence == pytest.approx(0.9)
+
+
+class SlowWindowModel:
+    """Hold every batch until the test resolves it."""
+
+    def __init__(self):
+        self.batches = []
+
+    def classify(self, samples, samplerate):
+        raise AssertionError("windowed voting should not use classify")
+
+    def submit_scores(self, windows, samplerate):
+        future = Future()
+        self.batches.append((windows.copy(), future))
+        return future
+
+
+def test_lagging_vote_cuts_windows_at_song_offsets_after_the_buffer_wraps():
+    from main import DMX, BeatDMXShow
+    from replay import ReplayShow, VirtualClock
+
+    model = SlowWindowModel()
+    clock = VirtualClock()
+    show = ReplayShow(
+        dashboard=False,
+        genre_model=model,
+        genre_cache=None,
+        clock=clock,
+        debug_log_path=os.devnull,
+    )
+    show._attach_controller(DMX(parameters.DEVICES, port=parameters.COM_PORT))
+    # score through the model's futures instead of replay's inline call
+    show._submit_windows = MethodType(BeatDMXShow._submit_windows, show)
+    show._handle_state_change(SongState.STARTING)
+    step = 4000  # 0.25 s at 16 kHz; every sample holds its chunk index
+    for i in range(28):
+        clock.set((i + 1) * 0.25)
+        show.pre_song_buffer.write(np.full(step, i, dtype=np.float32))
+        if show.vote is not None:
+            show._advance_vote()
+    # only the first window went out; 7 s of audio overflowed the 5 s ring
+    ((first, pending),) = model.batches
+    assert first[0, 0] == 0
+    pending.set_result([{"metal": 0.6, "rock": 0.4}])
+    show._advance_vote()
+    # windows 1 and 2 started in overwritten audio; 3 and 4 keep their offsets
+    assert show.vote.max_windows == 3
+    windows, pending = model.batches[1]
+    assert [row[0] for row in windows] == [9, 12]  # 2.25 s and 3.0 s in
+    pending.set_result([{"metal": 0.6, "rock": 0.4}] * 2)
+    assert show.genre_label == "metal"
@@ -0,0 +1,108 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import functools
+import threading
+
+import numpy as np
+import pytest
+
+from src.audio.genre_worker import GenreWorker
+
+
+class LoudnessClassifier:
+    """Picklable stand-in model: labels clips by their peak level."""
+
+    def __init__(self, fail_warmup=False):
+        self.fail_warmup = fail_warmup
+
+    def classify(self, samples, samplerate):
+        if self.fail_warmup:
+            raise RuntimeError("no model")
+        peak = float(np.abs(samples).max()) if len(samples) else 0.0
+        return f"{'metal' if peak > 0.5 else 'jazz'}@{samplerate}:{len(samples)}"
+
+
+def test_worker_warms_up_and_returns_labels_in_order():
+    worker = GenreWorker(capacity=1000, factory=LoudnessClassifier)
+    with worker:
+        assert worker.ready.wait(30)
+        assert worker.warmup_seconds is not None
+        loud = worker.submit(np.full(200, 0.9, dtype=np.float32), 44100)
+        quiet = worker.submit(np.zeros(5000, dtype=np.float32), 16000)
+        assert loud.result(timeout=30) == "metal@44100:200"
+        # longer clips keep their most recent ``capacity`` samples
+        assert quiet.result(timeout=30) == "jazz@16000:1000"
+        assert worker.classify(np.ones(10, dtype=np.float32), 8000) == "metal@8000:10"
+    assert not worker.running
+
+
+def test_failed_warmup_fails_futures():
+    worker = GenreWorker(
+        capacity=100, factory=functools.partial(LoudnessClassifier, fail_warmup=True)
+    )
+    with worker:
+        with pytest.raises(RuntimeError, match="no model"):
+            worker.wait_ready(30)
+        assert worker.failed
+        assert not worker.ready.is_set()
+        with pytest.raises(RuntimeError):
+            worker.submit(np.zeros(10, dtype=np.float32), 16000).result(timeout=30)
+
+
+def test_cancelled_job_is_skipped():
+    worker = GenreWorker(capacity=1000, factory=LoudnessClassifier)
+    with worker:
+        assert worker.ready.wait(30)
+        with worker._lock:  # keep the slot busy so both jobs queue up
+            worker._busy = True
+        stale = worker.submit(np.zeros(10, dtype=np.float32), 16000)
+        assert stale.cancel()
+        with worker._lock:
+            worker._busy = False
+        fresh = worker.submit(np.ones(10, dtype=np.float32), 16000)
+        assert fresh.result(timeout=30) == "metal@16000:10"
+        assert worker.cancelled == 1
+
+
+def test_done_callback_can_submit_again():
+    worker = GenreWorker(capacity=1000, factory=LoudnessClassifier)
+    with worker:
+        assert worker.wait_ready(30)
+        second = []
+        chained = threading.Event()
+
+        def resubmit(_done):
+            future = worker.submit(np.ones(10, dtype=np.float32), 16000)
+            second.append(future)
+            future.add_done_callback(lambda _: chained.set())
+
+        worker.submit(np.zeros(10, dtype=np.float32), 16000).add_done_callback(resubmit)
+        assert chained.wait(30)
+        assert second[0].result() == "metal@16000:10"
+
+
+def test_oversized_window_batch_is_rejected():
+    worker = GenreWorker(capacity=1000, factory=LoudnessClassifier)
+    with pytest.raises(ValueError, match="capacity"):
+        worker.submit_scores(np.zeros((3, 400), dtype=np.float32), 16000)
+    assert not worker.running
+
+
+def test_waiting_job_is_replaced_and_timed():
+    worker = GenreWorker(capacity=1000, factory=LoudnessClassifier)
+    with worker:
+        assert worker.wait_ready(30)
+        with worker._lock:  # keep the slot busy so the jobs have to wait
+            worker._busy = True
+        old = worker.submit(np.zeros(10, dtype=np.float32), 16000)
+        new = worker.submit(np.ones(10, dtype=np.float32), 16000)
+        assert old.cancelled()
+        with worker._lock:
+            worker._busy = False
+        worker._dispatch()
+        assert new.result(timeout=30) == "metal@16000:10"
+        stats = worker.stats()
+    assert stats["replaced"] == 1 and stats["completed"] == 1
+    assert worker.wait_time.count == 1 and worker.run_time.count == 1
@@ -0,0 +1,35 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio.governor import CpuGovernor
+
+
+def test_governor_sheds_in_priority_order_and_recovers():
+    gov = CpuGovernor(0.01, raise_after=4, lower_after=20)
+    shed = []
+    while gov.level < gov.max_level:
+        gov.update(0.009)
+        shed.append(set(gov.decimated()))
+    # HPSS goes first; timbre statistics only at the last level
+    assert {"hpss"} in shed
+    assert shed.index({"hpss", "timbre"}) == len(shed) - 1
+    assert gov.interval("hpss") > 1 and gov.interval("timbre") == 2
+    # snare/kick hits are always judged on the current block's centroid
+    assert gov.interval("centroid") == gov.interval("tempo") == 1
+
+    runs = sum(gov.should_run("hpss") for _ in range(80))
+    assert runs == 80 // gov.interval("hpss")
+
+    for _ in range(500):
+        gov.update(0.0005)
+    assert gov.level == 0
+    assert gov.decimated() == {}
+    assert all(gov.should_run("hpss") for _ in range(5))
+
+
+def test_governor_ignores_short_spikes():
+    gov = CpuGovernor(0.01, raise_after=8)
+    for i in range(200):
+        gov.update(0.02 if i % 50 == 0 else 0.001)
+    assert gov.level == 0
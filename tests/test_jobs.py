@@ -0,0 +1,78 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+
+from src.audio.jobs import LatestJobExecutor
+
+
+def _blocked(executor):
+    """Occupy the worker so later submits stay pending."""
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait(5)
+        return "held"
+
+    future = executor.submit(hold)
+    assert started.wait(5)
+    return gate, future
+
+
+def test_latest_pending_job_wins():
+    jobs = LatestJobExecutor()
+    gate, first = _blocked(jobs)
+    older = jobs.submit(lambda: "older")
+    newer = jobs.submit(lambda: "newer")
+    gate.set()
+    assert newer.result(5) == "newer"
+    assert first.result(5) == "held"
+    assert older.cancelled()
+    assert jobs.join(5)
+    stats = jobs.stats()
+    assert stats["completed"] == 2
+    assert stats["replaced"] == 1
+    assert jobs.run_time.count == 2
+
+
+def test_job_for_old_key_never_starts():
+    current = {"song": 1}
+    ran = []
+    jobs = LatestJobExecutor(current_key=lambda: current["song"])
+    gate, _ = _blocked(jobs)
+    stale = jobs.submit(ran.append, 1, key=1)
+    current["song"] = 2
+    gate.set()
+    assert jobs.join(5)
+    assert stale.cancelled()
+    assert ran == []
+    assert jobs.cancelled == 1
+
+
+def test_cancel_stale_drops_pending_job():
+    jobs = LatestJobExecutor()
+    gate, _ = _blocked(jobs)
+    keep = jobs.submit(lambda: "same song", key=3)
+    assert jobs.cancel_stale(3) == 0
+    stale = jobs.submit(lambda: "old song", key=3)
+    assert keep.cancelled()
+    assert jobs.cancel_stale(4) == 1
+    assert stale.cancelled()
+    gate.set()
+    assert jobs.join(5)
+    assert jobs.stats()["cancelled"] == 1
+
+
+def test_failures_reach_the_future():
+    jobs = LatestJobExecutor()
+
+    def boom():
+        raise ValueError("model error")
+
+    future = jobs.submit(boom)
+    assert isinstance(future.exception(5), ValueError)
+    assert jobs.join(5)
+    assert jobs.failed == 1
@@ -0,0 +1,42 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from src.audio.beat_detection import STAGES, BeatDetector
+from src.audio.metrics import LatencyHistogram
+
+
+def test_histogram_percentiles_within_bucket_resolution():
+    hist = LatencyHistogram()
+    for _ in range(98):
+        hist.record(0.001)
+    hist.record(0.010, count=2)
+    assert hist.count == 100
+    assert hist.percentile(50) == pytest.approx(0.001, rel=0.13)
+    assert hist.percentile(99) == pytest.approx(0.010, rel=0.13)
+    assert hist.max == pytest.approx(0.010)
+    assert hist.mean == pytest.approx((98 * 0.001 + 2 * 0.010) / 100)
+    hist.record(5.0)  # overflow bucket
+    assert hist.percentile(100) == pytest.approx(5.0)
+    hist.reset()
+    assert hist.count == 0 and hist.percentile(99) == 0.0
+
+
+def test_detector_reports_stage_latencies():
+    # without the governor every stage runs on every block, whatever the load
+    detector = BeatDetector(
+        tuning_file=None, persist_tuning=False, start_time=0.0, governor=False
+    )
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        block = (rng.standard_normal(512) * 0.1).astype(np.float32)
+        detector.process(block, i * 512 / 44100)
+    report = detector.latency_report()
+    assert set(report) == set(STAGES) | {"tuning_write"}
+    for stage in ("spectrum", "hpss", "onset", "tempo", "state", "tuning", "total"):
+        assert report[stage]["count"] == 20
+    assert report["total"]["p99_ms"] >= report["hpss"]["p50_ms"]
+    assert detector.block_period == pytest.approx(512 / 44100)
@@ -0,0 +1,122 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from src.audio.beat_detection import BeatDetector
+
+
+def _track(seconds=3.0, sr=44100):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    track = 0.2 * np.sin(2 * np.pi * 220 * t)
+    for start in range(0, len(t) - 2000, sr // 2):
+        track[start : start + 2000] += rng.standard_normal(2000) * 0.5
+    return track.astype(np.float32)
+
+
+def _detector():
+    return BeatDetector(
+        amplitude_threshold=0.05,
+        start_duration=0.5,
+        tuning_file=None,
+        persist_tuning=False,
+        start_time=0.0,
+        governor=False,
+    )
+
+
+def test_batch_matches_streaming_process():
+    blocks = _track()[: 250 * 512].reshape(-1, 512)
+    times = np.arange(len(blocks)) * 512 / 44100
+
+    live = _detector()
+    expected = []
+    for block, now in zip(blocks, times):
+        result = live.process(block, now)
+        expected.append((result, live.state, live.is_drum_solo, live.is_chorus))
+
+    batch = _detector()
+    got = []
+    for i in range(0, len(blocks), 64):
+        for result in batch.iter_blocks(blocks[i : i + 64], times[i : i + 64]):
+            got.append((result, batch.state, batch.is_drum_solo, batch.is_chorus))
+
+    assert len(got) == len(expected)
+    for (r1, s1, d1, c1), (r2, s2, d2, c2) in zip(expected, got):
+        assert r1[0] == r2[0] and r1[2] == r2[2]
+        assert r1[1] == pytest.approx(r2[1])
+        assert r1[3] == pytest.approx(r2[3], rel=1e-5)
+        assert (s1, d1, c1) == (s2, d2, c2)
+
+
+def test_batch_follows_the_governor():
+    blocks = _track()[: 200 * 512].reshape(-1, 512)
+    times = np.arange(len(blocks)) * 512 / 44100
+    runs = []
+    for batched in (False, True):
+        det = BeatDetector(
+            amplitude_threshold=0.05,
+            start_duration=0.5,
+            tuning_file=None,
+            persist_tuning=False,
+            start_time=0.0,
+        )
+        # pin HPSS to every other block so both paths decimate alike
+        det.governor.level = 1
+        det.governor.raise_after = det.governor.lower_after = 10**9
+        if batched:
+            drums = [det.is_drum_solo for _ in det.iter_blocks(blocks, times)]
+        else:
+            drums = [det.process(b, t) and det.is_drum_solo for b, t in zip(blocks, times)]
+        runs.append(drums)
+        assert det.governor.load > 0
+    assert runs[0] == runs[1]
+
+
+def test_warm_up_leaves_no_state_behind():
+    blocks = _track()[: 120 * 512].reshape(-1, 512)
+    times = np.arange(len(blocks)) * 512 / 44100
+    cold, warm = _detector(), _detector()
+    warm.warm_up()
+    assert warm.timings["total"].count == 0
+    for block, now in zip(blocks, times):
+        assert warm.process(block, now) == cold.process(block, now)
+        assert warm.features.harmonic_energy == cold.features.harmonic_energy
+        assert (warm.is_chorus, warm.is_crescendo) == (cold.is_chorus, cold.is_crescendo)
+
+
+def test_analyze_file_writes_columns(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    from src.audio.offline import COLUMNS, analyze_file, diff_columns, load_columns
+
+    path = tmp_path / "song.wav"
+    sf.write(str(path), _track(), 44100)
+    out = tmp_path / "song.npz"
+    columns = analyze_file(path, out, chunk_seconds=1.0, amplitude_threshold=0.05)
+    assert len(columns["time"]) == len(_track()) // 512
+    loaded, meta = load_columns(out)
+    assert set(COLUMNS) <= set(loaded)
+    assert meta["samplerate"] == 44100
+    report = diff_columns(columns, loaded)
+    assert all(entry["differing"] == 0 for entry in report.values())
+
+
+def test_analyze_file_runs_without_the_governor(tmp_path, monkeypatch):
+    sf = pytest.importorskip("soundfile")
+    from src.audio import offline
+
+    made = []
+
+    class Recording(BeatDetector):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            made.append(self)
+
+    monkeypatch.setattr(offline, "BeatDetector", Recording)
+    path = tmp_path / "song.wav"
+    sf.write(str(path), _track(1.0), 44100)
+    offline.analyze_file(path, chunk_seconds=1.0)
+    assert made[0].governor is None
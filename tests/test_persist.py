@@ -0,0 +1,68 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import numpy as np
+
+from src.audio.beat_detection import BeatDetector
+from src.audio.persist import AsyncWriter
+
+
+def test_writer_coalesces_and_replaces_atomically(tmp_path):
+    target = tmp_path / "state.json"
+    target.write_text("old")
+    writer = AsyncWriter()
+    with writer._cond:  # hold the thread back so both submits are pending
+        writer._pending[target] = b"first"
+    writer.submit(target, "second")
+    assert writer.flush()
+    assert target.read_text() == "second"
+    assert writer.coalesced == 1
+    assert writer.writes == 1
+    assert writer.latency.count == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_writer_serialises_callable_payloads_on_its_thread(tmp_path):
+    import threading
+
+    target = tmp_path / "state.bin"
+    threads = []
+
+    def payload():
+        threads.append(threading.current_thread())
+        return b"lazy"
+
+    writer = AsyncWriter()
+    writer.submit(target, payload)
+    assert writer.flush()
+    assert target.read_bytes() == b"lazy"
+    assert threads[0] is not threading.current_thread()
+
+
+def test_detector_saves_tuning_in_background(tmp_path):
+    tuning = tmp_path / "tuning.json"
+    det = BeatDetector(tuning_file=tuning, start_time=0.0, governor=False)
+    block = np.zeros(512, dtype=np.float32)
+    det.process(block, now=31.0)
+    assert det.tuning_writer.flush()
+    saved = json.loads(tuning.read_text())
+    assert saved["snare_centroid"] == det.snare_centroid
+    assert det.latency_report()["tuning_write"]["count"] == 1
+
+
+def test_string_paths_coalesce_and_close_stops_the_thread(tmp_path):
+    from src.audio import persist
+
+    target = tmp_path / "state.json"
+    writer = AsyncWriter()
+    with writer._cond:  # hold the thread back so both submits are pending
+        writer.submit(str(target), "first")
+        writer.submit(str(target), "second")
+    assert writer.coalesced == 1
+    assert writer in persist._writers
+    assert writer.close()
+    assert target.read_text() == "second"
+    assert writer._thread is None and writer not in persist._writers
@@ -0,0 +1,116 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import parameters
+from src.audio.beat_detection import SongState
+from src.audio.quick_genre import QuickGenreModel, clip_features
+from src.audio.timbre import TimbreStats
+
+SR = 44100
+
+
+def _clip(kind, rng, seconds=1.0):
+    t = np.arange(int(seconds * SR)) / SR
+    if kind == "classical":
+        tone = np.sin(2 * np.pi * rng.uniform(200, 400) * t)
+        return (0.3 * tone + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+    return (0.3 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def _model(rng):
+    labels = ["classical", "metal"] * 10
+    features = np.array([clip_features(_clip(k, rng), SR) for k in labels])
+    return QuickGenreModel.fit(features, labels, samplerate=SR)
+
+
+def test_fit_separates_tonal_from_noisy_clips(tmp_path):
+    rng = np.random.default_rng(0)
+    model = _model(rng)
+    label, confidence = model.predict(clip_features(_clip("metal", rng), SR))
+    assert label == "metal" and confidence > 0.9
+    path = tmp_path / "quick.npz"
+    model.save(path)
+    loaded = QuickGenreModel.load(path)
+    row = clip_features(_clip("classical", rng), SR)
+    assert loaded.predict(row)[0] == "classical"
+    np.testing.assert_allclose(loaded.predict_proba(row), model.predict_proba(row))
+    assert loaded.window_seconds == model.window_seconds == 0.05
+    assert loaded.window_blocks == 4
+
+
+class LabelModel:
+    def __init__(self, label):
+        self.label = label
+
+    def classify(self, samples, samplerate):
+        return self.label
+
+
+def _show(rng, clock):
+    from main import DMX
+    from replay import ReplayShow
+
+    show = ReplayShow(
+        dashboard=False,
+        genre_model=LabelModel("jazz"),
+        clock=clock,
+        debug_log_path=os.devnull,
+        quick_genre=_model(rng),
+        genre_cache=None,
+    )
+    show._attach_controller(DMX(parameters.DEVICES, port=parameters.COM_PORT))
+    show.detector = SimpleNamespace(timbre=TimbreStats(512, SR))
+    show._handle_state_change(SongState.STARTING)
+    return show
+
+
+def _play_until_guess(show, clock, audio, limit):
+    """Feed blocks after STARTING; return how many it took to get a label."""
+    timbre = show.detector.timbre
+    for i in range(limit):
+        block = audio[i * 512 : (i + 1) * 512]
+        timbre.update(np.abs(np.fft.rfft(block * np.hanning(512))) ** 2)
+        clock.set((i + 1) * 512 / SR)
+        show._quick_classify(clock.now)
+        if show.quick_label:
+            return i + 1
+    return None
+
+
+def test_provisional_genre_arrives_within_50ms_of_song_start():
+    from replay import VirtualClock
+
+    rng = np.random.default_rng(1)
+    clock = VirtualClock()
+    show = _show(rng, clock)
+    blocks = _play_until_guess(show, clock, _clip("classical", rng), 5)
+    assert blocks == show.quick_genre.window_blocks == 4
+    assert show.quick_label == "classical"
+    assert clock.now <= 0.05
+
+
+def test_provisional_genre_is_set_at_song_start_and_overridden():
+    from replay import VirtualClock
+
+    rng = np.random.default_rng(0)
+    clock = VirtualClock()
+    show = _show(rng, clock)
+    # first guess once the song has played as long as a training window
+    blocks = _play_until_guess(show, clock, _clip("metal", rng), 100)
+    assert blocks == show.quick_genre.window_blocks
+    assert show.quick_label == "metal"
+    assert clock.now == pytest.approx(0.05, abs=0.01)
+    assert show.scenario.name == "SONG_ONGOING_METAL"
+    assert show.current_state is SongState.STARTING
+
+    show.pre_song_buffer.write(np.zeros(16000, dtype=np.float32))
+    show._launch_genre_classifier_immediately()
+    assert show.genre_label == "jazz"
+    assert show.scenario.name == "SONG_ONGOING_JAZZ"
+    assert show.current_state is SongState.ONGOING
@@ -0,0 +1,44 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+from scipy.signal import firwin, upfirdn
+
+from src.audio.resample import StreamingResampler
+
+
+def test_blockwise_output_matches_upfirdn():
+    x = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+    res = StreamingResampler(44100, 16000)
+    rng = np.random.default_rng(1)
+    parts, pos = [], 0
+    while pos < len(x):
+        size = int(rng.integers(1, 1500))
+        parts.append(res.process(x[pos : pos + size]))
+        pos += size
+    y = np.concatenate(parts)
+    h = firwin(2 * 4410 + 1, 1 / 441, window=("kaiser", 5.0)) * 160
+    ref = upfirdn(h, x.astype(np.float64), 160, 441)
+    assert len(y) == 16000
+    assert np.allclose(y, ref[: len(y)], atol=1e-5)
+
+
+def test_tone_keeps_level_and_identity_rate():
+    t = np.arange(44100 * 2) / 44100
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    res = StreamingResampler(44100, 16000)
+    y = np.concatenate([res.process(b) for b in tone.reshape(-1, 490)])
+    assert np.sqrt(np.mean(y[1000:] ** 2)) == pytest.approx(0.5 / np.sqrt(2), rel=1e-3)
+    same = StreamingResampler(16000, 16000)
+    assert np.array_equal(same.process(tone[:512]), tone[:512])
+
+
+def test_kaiser_lowpass_matches_firwin():
+    from src.audio.resample import kaiser_lowpass
+
+    np.testing.assert_allclose(
+        kaiser_lowpass(8821, 1 / 441), firwin(8821, 1 / 441, window=("kaiser", 5.0)),
+        atol=1e-15,
+    )
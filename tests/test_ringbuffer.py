@@ -0,0 +1,40 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.audio.ringbuffer import AudioRingBuffer
+
+
+def test_ring_matches_deque_across_wraps():
+    ring = AudioRingBuffer(1000)
+    ref = deque(maxlen=1000)
+    rng = np.random.default_rng(1)
+    for size in (300, 512, 512, 7, 1200, 0, 999, 1):
+        block = rng.standard_normal(size).astype(np.float32)
+        ring.write(block)
+        ref.extend(block)
+        assert len(ring) == len(ref)
+        assert np.array_equal(ring.snapshot(), np.array(ref, dtype=np.float32))
+    assert ring.full
+    assert ring.written == 300 + 512 + 512 + 7 + 1200 + 999 + 1
+    ring.clear()
+    assert len(ring) == 0 and not ring and ring.written == 0
+    assert ring.snapshot().size == 0
+
+
+def test_snapshot_view_and_copy():
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(5, dtype=np.float32))
+    view = ring.snapshot()
+    assert np.shares_memory(view, ring._data)
+    copy = ring.snapshot(copy=True)
+    assert not np.shares_memory(copy, ring._data)
+    ring.write(np.arange(5, 10, dtype=np.float32))  # wraps
+    assert np.array_equal(ring.snapshot(), np.arange(2, 10, dtype=np.float32))
+    with pytest.raises(ValueError):
+        AudioRingBuffer(0)
@@ -0,0 +1,73 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import subprocess
+import threading
+
+import numpy as np
+
+from main import BeatDMXShow
+from src.audio import SongState
+from src.audio.metrics import StartupProfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY = ("aubio", "librosa", "scipy.ndimage", "scipy.signal", "sounddevice")
+
+
+def test_importing_main_defers_heavy_modules_and_logging(tmp_path):
+    code = (
+        f"import sys; sys.path.insert(0, {ROOT!r}); import main; "
+        f"print(sorted(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "[]"
+    assert not (tmp_path / "logs").exists()
+
+
+def test_profile_reports_steps_background_and_marks():
+    profile = StartupProfile()
+    with profile.step("dmx"):
+        pass
+    gate = threading.Event()
+    slow = profile.start_background("classifier", gate.wait)
+    quick = profile.start_background("detector", lambda: "ok")
+    assert quick.result(5) == "ok"
+    assert "classifier running" in profile.report()
+    gate.set()
+    slow.result(5)
+    first = profile.mark("first block")
+    report = profile.report()
+    assert report.startswith("Startup: dmx ")
+    assert "classifier " in report and "running" not in report
+    assert f"first block at {first:.2f}s" in report
+
+
+class SilentDetector:
+    state = SongState.INTERMISSION
+    snare_hit = kick_hit = is_chorus = is_drum_solo = is_crescendo = False
+
+    def __init__(self):
+        self.warmed = False
+
+    def warm_up(self):
+        self.warmed = True
+
+    def process(self, samples, now):
+        return False, 0.0, False, 0.0
+
+
+def test_first_processed_block_is_timed(capsys):
+    show = BeatDMXShow(dashboard=False, genre_model=None, debug_log_path=os.devnull)
+    show.detector = SilentDetector()
+    show.startup = StartupProfile()
+    show._start_warm_ups(show.startup).result(5)
+    assert show.detector.warmed
+    show.audio_ring.push(np.zeros(512, dtype=np.float32))
+    show.running = False
+    show._process_audio_queue()
+    assert show.first_block_seconds is not None
+    assert "first block at" in capsys.readouterr().out
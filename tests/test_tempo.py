@@ -0,0 +1,41 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from src.audio.tempo import TempoTracker
+
+
+def test_steady_beats_give_bpm_and_phase():
+    tracker = TempoTracker(window=60.0, recent=8)
+    for i in range(16):
+        tracker.add_beat(i * 0.5)
+    assert tracker.bpm == pytest.approx(120.0)
+    assert tracker.mean_bpm == pytest.approx(120.0)
+    assert tracker.stability == pytest.approx(1.0)
+    assert tracker.confidence == pytest.approx(1.0)
+    assert tracker.phase(7.5 + 0.125) == pytest.approx(0.25)
+
+
+def test_expiry_updates_running_mean():
+    tracker = TempoTracker(window=10.0)
+    for i in range(10):
+        tracker.add_beat(i * 1.0)  # 60 BPM
+    for i in range(10):
+        tracker.add_beat(10.0 + i * 0.5)  # 120 BPM
+    tracker.expire(20.0)
+    assert tracker.mean_bpm == pytest.approx(120.0)
+    assert tracker.interval_std == pytest.approx(0.0, abs=1e-6)
+
+
+def test_capacity_wraps_and_irregular_beats_lower_stability():
+    tracker = TempoTracker(window=1e9, capacity=4, recent=8)
+    for t in (0.0, 0.5, 1.0, 1.4, 2.2, 2.5):
+        tracker.add_beat(t)
+    assert len(tracker) == 4
+    assert tracker.last_beat == 2.5
+    median, std = tracker.interval_stats()
+    assert median == pytest.approx(0.4)
+    assert std > 0
+    assert tracker.stability < 0.8
@@ -0,0 +1,59 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from src.audio.timbre import TimbreStats, mel_filterbank
+
+
+def _power(rng, n=10):
+    return rng.random((n, 257)) ** 2
+
+
+def test_filterbank_covers_spectrum_in_order():
+    bank = mel_filterbank(512, 44100, 40)
+    assert bank.shape == (40, 257)
+    peaks = bank.argmax(axis=1)
+    assert np.all(np.diff(peaks) >= 0)
+    assert (bank > 0).any(axis=0)[1:-1].all()
+
+
+def test_batched_update_matches_block_by_block():
+    rng = np.random.default_rng(1)
+    power = _power(rng, 300)  # wraps the ~3 s history
+    one = TimbreStats(seconds=3.0)
+    for row in power:
+        one.update(row)
+    many = TimbreStats(seconds=3.0)
+    many.update_many(power[:100])
+    many.update_many(power[100:])
+    assert many.frames == one.frames == 300
+    np.testing.assert_allclose(many.vector(), one.vector())
+
+
+def test_vector_over_recent_blocks_matches_a_shorter_history():
+    rng = np.random.default_rng(2)
+    power = _power(rng, 300)
+    full = TimbreStats(seconds=3.0)
+    recent = TimbreStats(seconds=1.0)
+    for row in power:
+        full.update(row)
+        recent.update(row)
+    np.testing.assert_allclose(full.vector(recent.capacity), recent.vector())
+    np.testing.assert_allclose(full.vector(10 ** 6), full.vector())
+
+
+def test_shape_features_follow_the_spectrum():
+    stats = TimbreStats()
+    low = np.zeros(257)
+    low[5] = 1.0
+    high = np.zeros(257)
+    high[200] = 1.0
+    centroid = stats.block_features(np.stack([low, high]))[:, stats.n_mfcc]
+    assert centroid[0] == pytest.approx(5 * 44100 / 512 / 1000)
+    assert centroid[1] > 10 * centroid[0]
+    stats.update(low)
+    stats.reset()
+    assert stats.frames == 0 and not stats.vector().any()